@@ -113,3 +113,88 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # CORS_ALLOW_METHODS = ["GET", "POST", "OPTIONS"]
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Edgar
+
+# Number of records stored in each row group of a sheet's typed snapshot. Pages are read one
+# row group at a time, so smaller groups make page reads cheaper at the cost of a larger file.
+EDGAR_SNAPSHOT_ROW_GROUP_SIZE = 8192
+
+# Number of records between two checkpoints of the byte-offset index built for CSV uploads
+# read without a snapshot.
+EDGAR_ROW_INDEX_STRIDE = 1024
+
+# Whether types of uploaded sheets are proposed from a sample of each column and then verified
+# against the whole column, rather than tried against the whole column one by one. Uploads can
+# override this with the `sampled_inference` parameter.
+EDGAR_SAMPLED_INFERENCE = False
+
+# Number of values sampled from each column when sampled inference is on. Uploads can override
+# this with the `sample_size` parameter.
+EDGAR_INFERENCE_SAMPLE_SIZE = 10000
+
+# Size in bytes above which CSV uploads are ingested chunk by chunk instead of being loaded
+# whole, and the number of records in each chunk. Peak memory of an upload is bounded by the
+# chunk size rather than by the size of the file.
+EDGAR_STREAMING_INGESTION_THRESHOLD = 256 * 1024 * 1024
+EDGAR_INGESTION_CHUNK_SIZE = 65536
+
+# Whether uploads are processed in the background. When on, uploads are stored and queued, and
+# processed by the workers started with `python manage.py run_workers`. When off, uploads are
+# processed within the request.
+EDGAR_BACKGROUND_INGESTION = True
+
+# Number of worker processes started by `run_workers`, and the number of seconds they wait
+# before polling an empty queue again.
+EDGAR_WORKERS = 2
+EDGAR_WORKER_POLL_INTERVAL = 1.0
+
+# Seconds between two heartbeats of a worker running a job. A running job whose last heartbeat
+# is older than the timeout is queued again, or failed once it was claimed the maximum number
+# of times.
+EDGAR_JOB_HEARTBEAT_INTERVAL = 10.0
+EDGAR_JOB_LEASE_TIMEOUT = 60.0
+EDGAR_JOB_MAX_ATTEMPTS = 3
+
+# Number of processes the type inference of an upload's columns is spread over. 1 infers the
+# columns one after another in the processing process.
+EDGAR_INFERENCE_WORKERS = 1
+
+# Number of values a batch of retyped columns must hold for the columns to be converted over
+# `EDGAR_INFERENCE_WORKERS` processes. Smaller batches convert faster than processes start.
+EDGAR_PARALLEL_RETYPE_VALUES = 1_000_000
+
+# Size in bytes of the in-process cache of typed sheets that pages are served from. Sheets are
+# evicted least recently used first, and sheets larger than this are read a page at a time.
+EDGAR_FRAME_CACHE_BYTES = 256 * 1024 * 1024
+
+# Size in bytes of the in-process cache of the matching records of filtered and sorted sheets,
+# in order, so paging through the results does not query the sheet again.
+EDGAR_QUERY_CACHE_BYTES = 64 * 1024 * 1024
+
+# Number of sheets whose serialized columns are kept in memory, so reading a sheet does not
+# query its columns again until the type of one of them changes.
+EDGAR_METADATA_CACHE_SIZE = 1024
+
+# Memory DuckDB may use for a SQL query over a sheet before spilling to disk, the number of
+# threads it runs a query on, the number of seconds after which a query is interrupted, and the
+# number of records a query returns at most. Only used when the optional duckdb package is
+# installed.
+EDGAR_SQL_MEMORY_LIMIT = "1GB"
+EDGAR_SQL_THREADS = 2
+EDGAR_SQL_TIMEOUT = 30.0
+EDGAR_SQL_MAX_ROWS = 10000
+
+# Number of values sampled from each column to estimate its quantiles and histogram when it is
+# profiled at upload, the number of bins of the histogram, and the number of most frequent values
+# kept for columns that are not numbers or dates.
+EDGAR_PROFILE_SAMPLE_SIZE = 10000
+EDGAR_PROFILE_HISTOGRAM_BINS = 20
+EDGAR_PROFILE_TOP_K = 10
+
+# Uploads are hashed while they are received, so repeated uploads of the same content reuse the
+# stored upload, snapshot and columns of the first one instead of being processed again.
+FILE_UPLOAD_HANDLERS = [
+    "edgar.uploads.HashingMemoryFileUploadHandler",
+    "edgar.uploads.HashingTemporaryFileUploadHandler",
+]
@@ -1,8 +1,17 @@
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
 from re import compile
+from threading import local
 
+import numpy
 import pandas
+import pyarrow
+import pyarrow.compute
 from pandas import Series
+from pandas.api.types import infer_dtype, is_scalar
+from pandas.tseries.api import guess_datetime_format
+
+if TYPE_CHECKING:
+    from edgar.type_evidence import TypeEvidence
 
 """
 Functions for coercing types in a pandas DataFrame.
@@ -17,6 +26,7 @@ successfully convert the pandas Series.
 
 FUNCTIONS = []
 FUNCTION_LOOKUP = {}
+CHECK_LOOKUP = {}
 SUPPORTED_TYPES = []
 
 ALLOWED_NONE_TYPES = [
@@ -32,6 +42,48 @@ ALLOWED_NONE_TYPES = [
     "-999",
     "not available",
 ]
+NONE_TYPES = frozenset(ALLOWED_NONE_TYPES)
+
+BOOL_VARIABLE_MAP = {
+    "true": True,
+    "false": False,
+    "1": True,
+    "0": False,
+    "yes": True,
+    "no": False,
+    "t": True,
+    "f": False,
+    "on": True,
+    "off": False,
+    "none": None,
+}
+
+COMPLEX_PATTERN = compile(r"^\s*([-+]?\d*\.?\d+)\s*([-+])\s*([-+]?\d*\.?\d*)j?\s*$")
+# The values of COMPLEX_PATTERN that `complex()` also parses, for pyarrow's regular expressions: no
+# spaces around the sign, an unsigned imaginary part and a trailing j. Digits and spaces are those
+# of Python's `\d` and `str.isspace`.
+COMPLEX_SPACE = r"[\s\p{Z}\x0b\x1c-\x1f\x85]*"
+COMPLEX_VALUE_PATTERN = (
+    rf"^{COMPLEX_SPACE}(?P<real>[-+]?\p{{Nd}}*\.?\p{{Nd}}+)(?P<sign>[-+])"
+    rf"(?P<imaginary>\p{{Nd}}+\.?\p{{Nd}}*|\.\p{{Nd}}+)?j{COMPLEX_SPACE}$"
+)
+
+# The smallest number of values read at a time when counting distinct values.
+DISTINCT_BLOCK_SIZE = 65536
+
+# The types whose conversion takes a format, detected when the type is first inferred.
+FORMATTED_TYPES = {"datetime64[ns]"}
+# The key of `Series.attrs` under which a conversion records the format it used.
+FORMAT = "format"
+# The number of values a detected datetime format is checked against before the whole column.
+DATETIME_FORMAT_SAMPLE_SIZE = 100
+# The strings pandas skips when looking for the value to guess a datetime format from.
+SKIPPED_DATETIME_STRINGS = frozenset(
+    {"", "NaT", "nat", "NAT", "nan", "NaN", "NAN", "now", "today"}
+)
+
+_NONE_VALUE_CACHE = local()
+_NUMBER_CACHE = local()
 
 
 def register_conversion(order: int, type_name: str) -> Callable:
@@ -56,7 +108,7 @@ def register_conversion(order: int, type_name: str) -> Callable:
         Returns:
         - func: The registered conversion function.
         """
-        FUNCTIONS.append((order, func))
+        FUNCTIONS.append((order, func, type_name))
         FUNCTION_LOOKUP[type_name] = func
         SUPPORTED_TYPES.append(type_name)
         FUNCTIONS.sort(key=lambda x: x[0])
@@ -65,6 +117,75 @@ def register_conversion(order: int, type_name: str) -> Callable:
     return decorator
 
 
+def register_check(type_name: str) -> Callable:
+    """
+    Register a check that rules out a conversion from the evidence gathered about a column.
+
+    A check receives the `TypeEvidence` of a column and returns False only when the conversion
+    registered for `type_name` is certain to fail, in which case inference skips it. Types without
+    a check are always attempted.
+
+    Parameters:
+    - type_name: The type that the check is being registered for.
+
+    Returns:
+    - decorator: The actual decorator function.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        """
+        Decorator function to register a check.
+
+        Parameters:
+        - func: The check to register.
+
+        Returns:
+        - func: The registered check.
+        """
+        CHECK_LOOKUP[type_name] = func
+        return func
+
+    return decorator
+
+
+def supported_none_mask(series: Series) -> numpy.ndarray:
+    """
+    Finds the values of a pandas Series that are one of the supported None types.
+
+    The mask is computed with vectorized operations and cached for the most recently masked
+    Series, so every conversion function tried on a column shares a single computation.
+
+    Parameters:
+    - series (pandas.Series): The pandas Series to check.
+
+    Returns:
+    - numpy.ndarray: A boolean array, True where the value is a supported None type.
+    """
+    cached = getattr(_NONE_VALUE_CACHE, "entry", None)
+    if cached is not None and cached[0] is series:
+        return cached[1]
+
+    if series.dtype.kind in "iu":
+        mask = series.to_numpy() == -999
+    elif series.dtype.kind == "f":
+        mask = numpy.isnan(series.to_numpy())
+    elif series.dtype.kind in "bcmM":
+        mask = numpy.zeros(len(series), dtype="bool")
+    elif infer_dtype(series, skipna=True) == "string":
+        lowered = pyarrow.compute.utf8_lower(pyarrow.array(series, from_pandas=True))
+        matches = pyarrow.compute.is_in(
+            lowered, value_set=pyarrow.array(ALLOWED_NONE_TYPES)
+        )
+        mask = matches.to_numpy(zero_copy_only=False) | series.isna().to_numpy()
+    else:
+        codes, uniques = pandas.factorize(series, use_na_sentinel=False)
+        unique_mask = Series(uniques).astype(str).str.lower().isin(NONE_TYPES)
+        mask = unique_mask.to_numpy()[codes]
+
+    _NONE_VALUE_CACHE.entry = (series, mask, None)
+    return mask
+
+
 def parse_supported_none_values(series: Series) -> Series:
     """
     Parses a pandas Series to replace specific string representations with None.
@@ -76,13 +197,424 @@ def parse_supported_none_values(series: Series) -> Series:
     - pandas.Series: A new pandas Series with values replaced by None where applicable.
 
     """
-    return Series(
-        [
-            None if str(value).lower() in ALLOWED_NONE_TYPES else value
-            for value in series
-        ]
+    mask = supported_none_mask(series)
+    _, _, parsed = _NONE_VALUE_CACHE.entry
+    if parsed is not None:
+        return parsed
+
+    if series.dtype.name in ("int64", "float64", "bool") and not mask.any():
+        parsed = Series(series.to_numpy())
+    else:
+        values = series.to_numpy(dtype="object", copy=True)
+        values[mask] = None
+        if infer_dtype(values, skipna=True) == "string":
+            parsed = Series(values, dtype="object")
+        else:
+            parsed = Series(values.tolist())
+
+    _NONE_VALUE_CACHE.entry = (series, mask, parsed)
+    return parsed
+
+
+def clear_conversion_cache() -> None:
+    """
+    Releases the Series held by the caches shared by the conversion functions tried on a column.
+    """
+    _NONE_VALUE_CACHE.entry = None
+    _NUMBER_CACHE.entry = None
+
+
+def _to_integers(parsed: Series) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Parses the values of a column as 64-bit integers, truncating fractions toward zero.
+
+    Parameters:
+    - parsed (pandas.Series): The column, with None types parsed.
+
+    Returns:
+    - tuple[numpy.ndarray, numpy.ndarray]: The values as int64, with zero for missing values, and
+        the mask of missing values. Datetimes and timedeltas are returned as nanoseconds.
+
+    Raises:
+    - ValueError: If a value is not a number or out of the range of int64.
+    """
+    values = parsed.to_numpy()
+    if values.dtype.kind in "mM":
+        return values.view("int64"), numpy.zeros(len(values), dtype="bool")
+
+    missing = parsed.isna().to_numpy()
+    present = values[~missing] if missing.any() else values
+    if present.dtype.kind == "c":
+        present = present.real
+    if present.dtype.kind == "O":
+        present = present.astype("int64")
+
+    if present.dtype.kind == "f":
+        if not numpy.isfinite(present).all():
+            raise ValueError("infinite values cannot be integers")
+        present = numpy.trunc(present)
+
+    limits = numpy.iinfo("int64")
+    if len(present) and (present.min() < limits.min or present.max() > limits.max):
+        raise ValueError("values are out of the range of int64")
+
+    if not missing.any():
+        return present.astype("int64"), missing
+    integers = numpy.zeros(len(values), dtype="int64")
+    integers[~missing] = present
+    return integers, missing
+
+
+def _to_floats(parsed: Series) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Parses the values of a column as 64-bit floats.
+
+    Parameters:
+    - parsed (pandas.Series): The column, with None types parsed.
+
+    Returns:
+    - tuple[numpy.ndarray, numpy.ndarray]: The values as float64, with NaN for missing values,
+        and the mask of missing values.
+
+    Raises:
+    - ValueError: If a value is not a number.
+    """
+    values = parsed.to_numpy()
+    if values.dtype.kind in "mM":
+        raise ValueError(f"{values.dtype} values cannot be floats")
+    if values.dtype.kind == "c":
+        values = values.real
+    values = values.astype("float64")
+    return values, numpy.isnan(values)
+
+
+def parse_numbers(
+    column: Series, kind: str
+) -> tuple[Series, numpy.ndarray, numpy.ndarray]:
+    """
+    Parses the values of a column as integers or floats.
+
+    The result is cached for the most recently parsed Series, so every integer conversion tried
+    on a column, nullable or not, shares a single parse, as does every float conversion.
+
+    Parameters:
+    - column (pandas.Series): The column to parse.
+    - kind (str): "integer" to parse int64 values, or "float" to parse float64 values.
+
+    Returns:
+    - tuple[pandas.Series, numpy.ndarray, numpy.ndarray]: The column with None types parsed, its
+        values and the mask of its missing values.
+
+    Raises:
+    - ValueError: If the values cannot be parsed.
+    """
+    cached = getattr(_NUMBER_CACHE, "entry", None)
+    if cached is None or cached[0] is not column:
+        cached = (column, {})
+        _NUMBER_CACHE.entry = cached
+
+    results = cached[1]
+    if kind not in results:
+        parsed = parse_supported_none_values(column)
+        try:
+            parse = _to_integers if kind == "integer" else _to_floats
+            results[kind] = (parsed, *parse(parsed))
+        except (TypeError, ValueError, OverflowError) as e:
+            results[kind] = e
+
+    if isinstance(results[kind], Exception):
+        raise ValueError(str(results[kind]))
+    return results[kind]
+
+
+def _integer_conversion(column: Series, type_name: str, force: bool) -> Series:
+    """
+    Converts a column to an integer type, if its values lie within the range of the type.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+    - type_name (str): The name of the integer type. Nullable types, such as "Int8", hold missing
+        values as `pandas.NA`.
+    - force (bool): Whether to convert values out of range, wrapping them around.
+
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - ValueError: If a value is not an integer, is missing and the type is not nullable, or is out
+        of range when not forced. Unlike the other integer types, nullable types do not truncate
+        fractions.
+    """
+    parsed, values, missing = parse_numbers(column, "integer")
+    numpy_type = type_name.lower()
+    if parsed.dtype.kind in "mM" and numpy_type != "int64":
+        raise ValueError(f"{parsed.dtype} values can only be converted to int64")
+    if numpy_type == type_name and missing.any():
+        raise ValueError(f"missing values cannot be held by {type_name}")
+    if numpy_type != type_name and parsed.dtype.kind not in "mM":
+        _, floats, _ = parse_numbers(column, "float")
+        if not numpy.array_equal(floats[~missing], values[~missing]):
+            raise ValueError(f"fractions cannot be held by {type_name}")
+
+    if not force and len(values):
+        limits = numpy.iinfo(numpy_type)
+        if values.min() < limits.min or values.max() > limits.max:
+            raise ValueError(f"values are out of the range of {type_name}")
+
+    converted = values.astype(numpy_type)
+    if numpy_type != type_name:
+        converted = pandas.arrays.IntegerArray(converted, missing)
+    return Series(converted, index=parsed.index, name=parsed.name)
+
+
+def _float_conversion(column: Series, type_name: str, force: bool) -> Series:
+    """
+    Converts a column to a float type, if it holds its values exactly.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+    - type_name (str): The name of the float type. Nullable types, such as "Float32", hold
+        missing values as `pandas.NA`.
+    - force (bool): Whether to convert values that are missing or cannot be held exactly.
+
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - ValueError: If a value is not a number, or when not forced, if a value cannot be held
+        exactly. Missing values never compare equal to themselves, so they fail the types that
+        are not nullable.
+    """
+    parsed, values, missing = parse_numbers(column, "float")
+    numpy_type = type_name.lower()
+    with numpy.errstate(over="ignore"):
+        converted = values.astype(numpy_type)
+
+    nullable = numpy_type != type_name
+    if not force and not numpy.array_equal(converted, values, equal_nan=nullable):
+        raise ValueError(f"values cannot be held exactly by {type_name}")
+
+    if nullable:
+        converted = pandas.arrays.FloatingArray(converted, missing)
+    return Series(converted, index=parsed.index, name=parsed.name)
+
+
+def count_distinct(column: Series, limit: int) -> int:
+    """
+    Counts the distinct values of a column, stopping once there are more than `limit` of them.
+
+    Values are read a block at a time, and each block is as long as the number of distinct values
+    still needed to pass the limit, so a column of mostly distinct values is given up on after
+    reading little more than `limit` of them, without hashing the rest.
+
+    Parameters:
+    - column (pandas.Series): The column to count the distinct values of.
+    - limit (int): The number of distinct values beyond which the exact count is not needed.
+
+    Returns:
+    - int: The number of distinct values if there are at most `limit` of them, and otherwise the
+        number found before stopping, which is greater than `limit`.
+    """
+    values = column.to_numpy()
+    distinct = values[:0]
+    position = 0
+    while position < len(values) and len(distinct) <= limit:
+        block_size = max(limit - len(distinct) + 1, DISTINCT_BLOCK_SIZE)
+        block = pandas.unique(values[position : position + block_size])
+        distinct = pandas.unique(numpy.concatenate([distinct, block]))
+        position += block_size
+
+    return len(distinct)
+
+
+def _bool_values(parsed: Series) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Maps the values of a column to booleans through `BOOL_VARIABLE_MAP`.
+
+    Values are compared by their lowercased string, as `str(value).lower()`. Each distinct string
+    is looked up once and the results are spread back over the column.
+
+    Parameters:
+    - parsed (pandas.Series): The column, with None types parsed.
+
+    Returns:
+    - tuple[numpy.ndarray, numpy.ndarray]: The boolean values, False where missing, and the mask
+        of missing values.
+
+    Raises:
+    - KeyError: If a value is not a boolean token.
+    """
+    codes, uniques = pandas.factorize(parsed.astype(str))
+    lowered = Series(uniques, dtype="object").str.lower()
+    unknown = ~lowered.isin(BOOL_VARIABLE_MAP.keys())
+    if unknown.any():
+        raise KeyError(lowered[unknown].iloc[0])
+
+    mapped = [BOOL_VARIABLE_MAP[key] for key in lowered]
+    truth = numpy.array([value is True for value in mapped], dtype="bool")
+    missing = numpy.array([value is None for value in mapped], dtype="bool")
+    return truth[codes], missing[codes]
+
+
+def _parse_floats(strings: pyarrow.Array) -> numpy.ndarray:
+    """
+    Parses an array of number strings as 64-bit floats.
+
+    Parameters:
+    - strings (pyarrow.Array): The strings to parse.
+
+    Returns:
+    - numpy.ndarray: The parsed values.
+    """
+    try:
+        return pyarrow.compute.cast(strings, pyarrow.float64()).to_numpy()
+    except pyarrow.ArrowInvalid:
+        # Arrow only parses ASCII digits, while `float()` parses every decimal digit.
+        return numpy.array(strings.to_pylist(), dtype="object").astype("float64")
+
+
+def _complex_values(parsed: Series) -> numpy.ndarray:
+    """
+    Parses the values of a column as complex numbers written as "a+bj".
+
+    Parameters:
+    - parsed (pandas.Series): The column, with None types parsed.
+
+    Returns:
+    - numpy.ndarray: The values as complex128, with NaN parts for missing values.
+
+    Raises:
+    - ValueError: If a value is not a complex number.
+    """
+    text = parsed.astype(str)
+    missing = (text == "None").to_numpy()
+    parts = pyarrow.compute.extract_regex(
+        pyarrow.array(text, type=pyarrow.string()), COMPLEX_VALUE_PATTERN
+    )
+    valid = parts.is_valid()
+    invalid = ~valid.to_numpy(zero_copy_only=False) & ~missing
+    if invalid.any():
+        raise ValueError(f"Invalid value: {text[invalid].iloc[0]}")
+
+    real = pyarrow.compute.if_else(valid, parts.field("real"), "nan")
+    # A missing imaginary part, as in "1+j", is one.
+    imaginary = parts.field("imaginary")
+    magnitude = pyarrow.compute.if_else(
+        pyarrow.compute.equal(imaginary, ""), "1", imaginary
+    )
+    sign = numpy.where(
+        parts.field("sign").to_numpy(zero_copy_only=False) == "-", -1.0, 1.0
     )
 
+    values = numpy.empty(len(parsed), dtype="complex128")
+    values.real = _parse_floats(real)
+    values.imag = numpy.where(missing, numpy.nan, sign * _parse_floats(magnitude))
+    return values
+
+
+def convert_column(
+    column: Series, type_name: str, force: bool = False, format: str = ""
+) -> Series:
+    """
+    Converts a column with the conversion function registered for a type.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+    - type_name (str): The type to convert to.
+    - force (bool): Whether to force the conversion.
+    - format (str): The format the values are written in, for the types in `FORMATTED_TYPES`.
+        Detected from the column when empty.
+
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - KeyError: If the type is not supported.
+    - ValueError: If the conversion fails.
+    """
+    conversion_function = FUNCTION_LOOKUP[type_name]
+    if format and type_name in FORMATTED_TYPES:
+        return conversion_function(column, force=force, format=format)
+    return conversion_function(column, force=force)
+
+
+def detect_datetime_format(column: Series) -> str | None:
+    """
+    Guesses the datetime format of a column of strings.
+
+    As in `pandas.to_datetime`, the format is guessed from the first value that is not missing.
+
+    Parameters:
+    - column (pandas.Series): The column to detect the format of.
+
+    Returns:
+    - Optional[str]: The format, or None if the first value is not a string or its format cannot
+        be guessed.
+    """
+    if column.dtype != "object":
+        return None
+
+    for value in column:
+        if isinstance(value, str) and value in SKIPPED_DATETIME_STRINGS:
+            continue
+        if is_scalar(value) and pandas.isna(value):
+            continue
+        if type(value) is str:
+            return guess_datetime_format(value)
+        return None
+    return None
+
+
+def integer_check(evidence: "TypeEvidence", type_name: str) -> bool:
+    """
+    Rule out the conversion to an integer type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+    - type_name (str): The name of the integer type. Nullable types, such as "Int8", accept
+        missing values.
+
+    Returns:
+    - bool: False if the column is certain to hold a missing value the type cannot hold, a value
+        that is not an integer, or a value outside of the range of the integer type.
+    """
+    nullable = type_name != type_name.lower()
+    if evidence.length == 0:
+        return True
+    if evidence.kind not in ("integer", "float", "string"):
+        return nullable or evidence.kind != "empty"
+    if (evidence.null_count and not nullable) or (
+        evidence.kind == "string" and not evidence.integer_tokens
+    ):
+        return False
+
+    limits = numpy.iinfo(type_name.lower())
+    return evidence.fits(limits.min, limits.max)
+
+
+def float_check(evidence: "TypeEvidence", nullable: bool = False) -> bool:
+    """
+    Rule out the conversion to a float type.
+
+    Missing values fail the conversion unless the type is nullable, as NaN does not compare equal
+    to itself when the converted values are checked.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+    - nullable (bool): Whether the float type holds missing values.
+
+    Returns:
+    - bool: False if the column is certain to hold a missing value the type cannot hold or a value
+        that is not a number.
+    """
+    if evidence.length == 0:
+        return True
+    if not nullable and (evidence.null_count or evidence.kind == "empty"):
+        return False
+    if evidence.kind == "string":
+        return evidence.float_tokens
+    return True
+
 
 @register_conversion(order=0, type_name="bool")
 def bool(column: Series, force: bool = False) -> Series:
@@ -91,37 +623,81 @@ def bool(column: Series, force: bool = False) -> Series:
 
     Parameters:
     - column (pandas.Series): The column to convert.
+    - force (bool): Whether to convert missing values, as False.
 
     Returns:
     - pandas.Series: The converted column.
 
     Raises:
-    - ValueError: If unable to convert any value to boolean.
+    - ValueError: If unable to convert any value to boolean, or if a value is missing when not
+        forced.
     """
-    bool_variable_map = {
-        "true": True,
-        "false": False,
-        "1": True,
-        "0": False,
-        "yes": True,
-        "no": False,
-        "t": True,
-        "f": False,
-        "on": True,
-        "off": False,
-        "none": None,
-    }
+    try:
+        column = parse_supported_none_values(column)
+        values, missing = _bool_values(column)
+        if not force and missing.any():
+            raise ValueError("missing values cannot be held by bool")
+        return Series(values, dtype="bool")
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Unable to convert column '{column.name}' to bool: {e}")
+
+
+@register_check("bool")
+def bool_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to boolean type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a missing value or a value that is not a
+        boolean token.
+    """
+    return not evidence.null_count and boolean_check(evidence)
+
+
+@register_conversion(order=1, type_name="boolean")
+def boolean(column: Series, force: bool = False) -> Series:
+    """
+    Convert a column to the nullable boolean type, which holds missing values.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
 
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - ValueError: If unable to convert any value to boolean.
+    """
     try:
         column = parse_supported_none_values(column)
-        return Series(
-            [bool_variable_map[str(val).lower()] for val in column], dtype="bool"
-        )
+        values, missing = _bool_values(column)
+        return Series(pandas.arrays.BooleanArray(values, missing))
     except KeyError as e:
-        raise ValueError(f"Unable to convert column '{column.name}' to bool: {e}")
+        raise ValueError(f"Unable to convert column '{column.name}' to boolean: {e}")
+
 
+@register_check("boolean")
+def boolean_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to the nullable boolean type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
 
-@register_conversion(order=1, type_name="category")
+    Returns:
+    - bool: False if the column is certain to hold a value that is not a boolean token.
+    """
+    if evidence.kind == "integer":
+        return evidence.fits(0, 1)
+    if evidence.kind == "string":
+        return evidence.bool_tokens
+    return evidence.kind in ("bool", "empty", "mixed")
+
+
+@register_conversion(order=2, type_name="category")
 def category(column: Series, force: bool = False, threshold: float = 0.5) -> Series:
     """
     Convert a column to categorical type if the uniqueness ratio is less than a specified threshold.
@@ -140,7 +716,8 @@ def category(column: Series, force: bool = False, threshold: float = 0.5) -> Ser
     if force:
         unique_ratio = 0.0
     else:
-        unique_ratio = len(column.unique()) / len(column)
+        limit = int(threshold * len(column))
+        unique_ratio = count_distinct(column, limit) / len(column)
 
     if unique_ratio <= threshold:
         column = parse_supported_none_values(column)
@@ -149,7 +726,7 @@ def category(column: Series, force: bool = False, threshold: float = 0.5) -> Ser
         raise ValueError(f"Unable to convert column '{column.name}' to categorical")
 
 
-@register_conversion(order=2, type_name="int8")
+@register_conversion(order=3, type_name="int8")
 def int8(column: Series, force: bool = False) -> Series:
     """
     Convert a column to int8 type.
@@ -164,22 +741,62 @@ def int8(column: Series, force: bool = False) -> Series:
     - ValueError: If unable to convert any value to int8.
     """
     try:
-        column = parse_supported_none_values(column)
-        converted_column = column.astype("int8", errors="raise")
-        if not force:
-            if (
-                not column.values.astype(int).tolist()
-                == converted_column.values.tolist()
-            ):
-                raise ValueError("Conversion to int8 resulted in different values.")
-
-        return converted_column
+        return _integer_conversion(column, "int8", force)
 
     except Exception as e:
         raise ValueError(f"Unable to convert column '{column.name}' to int8: {e}")
 
 
-@register_conversion(order=3, type_name="int16")
+@register_check("int8")
+def int8_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to int8 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by int8.
+    """
+    return integer_check(evidence, "int8")
+
+
+@register_conversion(order=4, type_name="Int8")
+def nullable_int8(column: Series, force: bool = False) -> Series:
+    """
+    Convert a column to the nullable Int8 type, which holds missing values.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - ValueError: If unable to convert any value to Int8.
+    """
+    try:
+        return _integer_conversion(column, "Int8", force)
+
+    except Exception as e:
+        raise ValueError(f"Unable to convert column '{column.name}' to Int8: {e}")
+
+
+@register_check("Int8")
+def nullable_int8_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to the nullable Int8 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by Int8.
+    """
+    return integer_check(evidence, "Int8")
+
+
+@register_conversion(order=5, type_name="int16")
 def int16(column: Series, force: bool = False) -> Series:
     """
     Convert a column to int16 type.
@@ -194,23 +811,62 @@ def int16(column: Series, force: bool = False) -> Series:
     - ValueError: If unable to convert any value to int16.
     """
     try:
-        column = parse_supported_none_values(column)
-        converted_column = column.astype("int16", errors="raise")
+        return _integer_conversion(column, "int16", force)
 
-        if not force:
-            if (
-                not column.values.astype(int).tolist()
-                == converted_column.values.tolist()
-            ):
-                raise ValueError("Conversion to int16 resulted in different values.")
+    except Exception as e:
+        raise ValueError(f"Unable to convert column '{column.name}' to int16: {e}")
 
-        return converted_column
+
+@register_check("int16")
+def int16_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to int16 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by int16.
+    """
+    return integer_check(evidence, "int16")
+
+
+@register_conversion(order=6, type_name="Int16")
+def nullable_int16(column: Series, force: bool = False) -> Series:
+    """
+    Convert a column to the nullable Int16 type, which holds missing values.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - ValueError: If unable to convert any value to Int16.
+    """
+    try:
+        return _integer_conversion(column, "Int16", force)
 
     except Exception as e:
-        raise ValueError(f"Unable to convert column '{column.name}' to int16: {e}")
+        raise ValueError(f"Unable to convert column '{column.name}' to Int16: {e}")
+
 
+@register_check("Int16")
+def nullable_int16_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to the nullable Int16 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by Int16.
+    """
+    return integer_check(evidence, "Int16")
 
-@register_conversion(order=4, type_name="int32")
+
+@register_conversion(order=7, type_name="int32")
 def int32(column: Series, force: bool = False) -> Series:
     """
     Convert a column to int32 type.
@@ -225,22 +881,62 @@ def int32(column: Series, force: bool = False) -> Series:
     - ValueError: If unable to convert any value to int32.
     """
     try:
-        column = parse_supported_none_values(column)
-        converted_column = column.astype("int32", errors="raise")
-        if not force:
-            if (
-                not column.values.astype(int).tolist()
-                == converted_column.values.tolist()
-            ):
-                raise ValueError("Conversion to int32 resulted in different values.")
-
-        return converted_column
+        return _integer_conversion(column, "int32", force)
 
     except Exception as e:
         raise ValueError(f"Unable to convert column '{column.name}' to int32: {e}")
 
 
-@register_conversion(order=5, type_name="int64")
+@register_check("int32")
+def int32_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to int32 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by int32.
+    """
+    return integer_check(evidence, "int32")
+
+
+@register_conversion(order=8, type_name="Int32")
+def nullable_int32(column: Series, force: bool = False) -> Series:
+    """
+    Convert a column to the nullable Int32 type, which holds missing values.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - ValueError: If unable to convert any value to Int32.
+    """
+    try:
+        return _integer_conversion(column, "Int32", force)
+
+    except Exception as e:
+        raise ValueError(f"Unable to convert column '{column.name}' to Int32: {e}")
+
+
+@register_check("Int32")
+def nullable_int32_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to the nullable Int32 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by Int32.
+    """
+    return integer_check(evidence, "Int32")
+
+
+@register_conversion(order=9, type_name="int64")
 def int64(column: Series, force: bool = False) -> Series:
     """
     Convert a column to int64 type.
@@ -255,22 +951,62 @@ def int64(column: Series, force: bool = False) -> Series:
     - ValueError: If unable to convert any value to int64.
     """
     try:
-        column = parse_supported_none_values(column)
-        converted_column = column.astype("int64", errors="raise")
-        if not force:
-            if (
-                not column.values.astype(int).tolist()
-                == converted_column.values.tolist()
-            ):
-                raise ValueError("Conversion to int64 resulted in different values.")
-
-        return converted_column
+        return _integer_conversion(column, "int64", force)
 
     except Exception as e:
         raise ValueError(f"Unable to convert column '{column.name}' to int64: {e}")
 
 
-@register_conversion(order=6, type_name="float32")
+@register_check("int64")
+def int64_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to int64 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by int64.
+    """
+    return integer_check(evidence, "int64")
+
+
+@register_conversion(order=10, type_name="Int64")
+def nullable_int64(column: Series, force: bool = False) -> Series:
+    """
+    Convert a column to the nullable Int64 type, which holds missing values.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - ValueError: If unable to convert any value to Int64.
+    """
+    try:
+        return _integer_conversion(column, "Int64", force)
+
+    except Exception as e:
+        raise ValueError(f"Unable to convert column '{column.name}' to Int64: {e}")
+
+
+@register_check("Int64")
+def nullable_int64_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to the nullable Int64 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by Int64.
+    """
+    return integer_check(evidence, "Int64")
+
+
+@register_conversion(order=11, type_name="float32")
 def float32(column: Series, force: bool = False) -> Series:
     """
     Convert a column to float32 type.
@@ -285,22 +1021,62 @@ def float32(column: Series, force: bool = False) -> Series:
     - ValueError: If unable to convert any value to float32.
     """
     try:
-        column = parse_supported_none_values(column)
-        converted_column = column.astype("float32", errors="raise")
-        if not force:
-            if (
-                not column.values.astype(float).tolist()
-                == converted_column.values.tolist()
-            ):
-                raise ValueError("Conversion to float32 resulted in different values.")
-
-        return converted_column
+        return _float_conversion(column, "float32", force)
 
     except Exception as e:
         raise ValueError(f"Unable to convert column '{column.name}' to float32: {e}")
 
 
-@register_conversion(order=7, type_name="float64")
+@register_check("float32")
+def float32_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to float32 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by float32.
+    """
+    return float_check(evidence)
+
+
+@register_conversion(order=12, type_name="Float32")
+def nullable_float32(column: Series, force: bool = False) -> Series:
+    """
+    Convert a column to the nullable Float32 type, which holds missing values.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - ValueError: If unable to convert any value to Float32.
+    """
+    try:
+        return _float_conversion(column, "Float32", force)
+
+    except Exception as e:
+        raise ValueError(f"Unable to convert column '{column.name}' to Float32: {e}")
+
+
+@register_check("Float32")
+def nullable_float32_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to the nullable Float32 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by Float32.
+    """
+    return float_check(evidence, nullable=True)
+
+
+@register_conversion(order=13, type_name="float64")
 def float64(column: Series, force: bool = False) -> Series:
     """
     Convert a column to float64 type.
@@ -315,25 +1091,30 @@ def float64(column: Series, force: bool = False) -> Series:
     - ValueError: If unable to convert any value to float64.
     """
     try:
-        column = parse_supported_none_values(column)
-        converted_column = column.astype("float64", errors="raise")
-        if not force:
-            if (
-                not column.values.astype(float).tolist()
-                == converted_column.values.tolist()
-            ):
-                raise ValueError("Conversion to float64 resulted in different values.")
-
-        return converted_column
+        return _float_conversion(column, "float64", force)
 
     except Exception as e:
         raise ValueError(f"Unable to convert column '{column.name}' to float64: {e}")
 
 
-@register_conversion(order=8, type_name="complex128")
-def complex128(column: Series, force: bool = False) -> Series:
+@register_check("float64")
+def float64_check(evidence: "TypeEvidence") -> bool:
     """
-    Convert a column to complex numbers.
+    Rule out the conversion to float64 type.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by float64.
+    """
+    return float_check(evidence)
+
+
+@register_conversion(order=14, type_name="Float64")
+def nullable_float64(column: Series, force: bool = False) -> Series:
+    """
+    Convert a column to the nullable Float64 type, which holds missing values.
 
     Parameters:
     - column (pandas.Series): The column to convert.
@@ -342,22 +1123,46 @@ def complex128(column: Series, force: bool = False) -> Series:
     - pandas.Series: The converted column.
 
     Raises:
-    - ValueError: If unable to convert any value to complex number.
+    - ValueError: If unable to convert any value to Float64.
     """
+    try:
+        return _float_conversion(column, "Float64", force)
+
+    except Exception as e:
+        raise ValueError(f"Unable to convert column '{column.name}' to Float64: {e}")
 
-    pattern = compile(r"^\s*([-+]?\d*\.?\d+)\s*([-+])\s*([-+]?\d*\.?\d*)j?\s*$")
 
-    def function_complex(x):
-        if x is None:
-            return None
-        elif pattern.match(str(x)):
-            return complex(x)
-        else:
-            raise ValueError(f"Invalid value: {x}")
+@register_check("Float64")
+def nullable_float64_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to the nullable Float64 type.
 
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that cannot be held by Float64.
+    """
+    return float_check(evidence, nullable=True)
+
+
+@register_conversion(order=15, type_name="complex128")
+def complex128(column: Series, force: bool = False) -> Series:
+    """
+    Convert a column to complex numbers.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+
+    Returns:
+    - pandas.Series: The converted column.
+
+    Raises:
+    - ValueError: If unable to convert any value to complex number.
+    """
     try:
         column = parse_supported_none_values(column)
-        return Series([function_complex(x) for x in column], dtype=complex)
+        return Series(_complex_values(column))
 
     except Exception as e:
         raise ValueError(
@@ -365,7 +1170,23 @@ def complex128(column: Series, force: bool = False) -> Series:
         )
 
 
-@register_conversion(order=9, type_name="timedelta64[ns]")
+@register_check("complex128")
+def complex128_check(evidence: "TypeEvidence") -> bool:
+    """
+    Rule out the conversion to complex numbers.
+
+    Parameters:
+    - evidence (TypeEvidence): The evidence gathered about the column.
+
+    Returns:
+    - bool: False if the column is certain to hold a value that is not a complex number.
+    """
+    if evidence.kind == "string":
+        return evidence.complex_tokens
+    return evidence.length == 0 or evidence.kind in ("complex", "empty", "mixed")
+
+
+@register_conversion(order=16, type_name="timedelta64[ns]")
 def timedelta(column: Series, force: bool = False) -> Series:
     """
     Convert a column to timedelta type.
@@ -387,29 +1208,43 @@ def timedelta(column: Series, force: bool = False) -> Series:
         raise ValueError(f"Unable to convert column '{column.name}' to timedelta: {e}")
 
 
-@register_conversion(order=10, type_name="datetime64[ns]")
-def datetime(column: Series, force: bool = False) -> Series:
+@register_conversion(order=17, type_name="datetime64[ns]")
+def datetime(column: Series, force: bool = False, format: str | None = None) -> Series:
     """
     Convert a column to datetime type.
 
+    Strings are parsed strictly with a single format, detected from the column unless given, after
+    checking it against a sample of the column. Columns whose format cannot be detected are
+    parsed value by value.
+
     Parameters:
     - column (pandas.Series): The column to convert.
+    - format (Optional[str]): The format the values are written in. Defaults to detecting it.
 
     Returns:
-    - pandas.Series: The converted column.
+    - pandas.Series: The converted column, with the format used in its `attrs` under `FORMAT`.
 
     Raises:
     - ValueError: If unable to convert any value to datetime.
     """
 
     try:
-        return pandas.to_datetime(column)
+        if format is None:
+            format = detect_datetime_format(column)
+        if format is None:
+            return pandas.to_datetime(column)
+
+        stride = max(len(column) // DATETIME_FORMAT_SAMPLE_SIZE, 1)
+        pandas.to_datetime(column.iloc[::stride], format=format)
+        converted = pandas.to_datetime(column, format=format)
+        converted.attrs[FORMAT] = format
+        return converted
 
     except Exception as e:
         raise ValueError(f"Unable to convert column '{column.name}' to datetime: {e}")
 
 
-@register_conversion(order=11, type_name="object")
+@register_conversion(order=18, type_name="object")
 def object(column: Series, force: bool = False) -> Series:
     """
     Convert the values in the column to object type.
@@ -428,3 +1263,24 @@ def object(column: Series, force: bool = False) -> Series:
         return column.astype("object")
     except Exception:
         raise ValueError("Conversion to object type failed.")
+
+
+@register_conversion(order=19, type_name="string")
+def string(column: Series, force: bool = False) -> Series:
+    """
+    Convert the values in the column to strings, stored in Arrow memory.
+
+    Parameters:
+    - column (pandas.Series): The column to convert.
+
+    Returns:
+    - pandas.Series: The converted column, of the `string[pyarrow]` dtype.
+
+    Raises:
+    - ValueError: If unable to convert any value to a string.
+    """
+    try:
+        column = parse_supported_none_values(column)
+        return column.astype("string[pyarrow]")
+    except Exception as e:
+        raise ValueError(f"Unable to convert column '{column.name}' to string: {e}")
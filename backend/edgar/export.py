@@ -0,0 +1,175 @@
+from typing import Generator, Iterable
+
+import pyarrow
+import pyarrow.parquet as parquet
+from pandas import DataFrame, Series
+
+from edgar.models import File
+from edgar.query import iter_records
+from edgar.renderers import dumps, records
+from edgar.serializers import column_metadata
+from edgar.snapshots import storable_column, writable_type
+
+"""
+Streaming exports of whole typed sheets.
+
+A sheet is exported one chunk of records at a time: a row group of its snapshot, or a chunk of
+`EDGAR_INGESTION_CHUNK_SIZE` records of its uploaded CSV file when it has no snapshot. Each
+chunk is typed as its columns and encoded before the next one is read, so the memory used by an
+export does not grow with the size of the sheet, and the first chunk is sent as soon as it is
+encoded. Headers and schemas are built from the types of the columns rather than from the first
+chunk, so empty sheets are exported with their columns, and Parquet columns hold every chunk.
+"""
+
+CSV = "csv"
+NDJSON = "ndjson"
+PARQUET = "parquet"
+
+CONTENT_TYPES = {
+    CSV: "text/csv",
+    NDJSON: "application/x-ndjson",
+    PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _csv(
+    chunks: Iterable[DataFrame], column_types: dict[str, str]
+) -> Generator[bytes, None, None]:
+    """
+    Encodes chunks of records as CSV, after a header.
+
+    Parameters:
+    - chunks (Iterable[DataFrame]): The typed chunks.
+    - column_types (dict[str, str]): The names of the columns mapped to their types.
+
+    Yields:
+    - bytes: The header, then the CSV lines of each chunk.
+    """
+    yield DataFrame(columns=list(column_types)).to_csv(index=False).encode()
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=False).encode()
+
+
+def _ndjson(
+    chunks: Iterable[DataFrame], column_types: dict[str, str]
+) -> Generator[bytes, None, None]:
+    """
+    Encodes chunks of records as newline delimited JSON, with one object per record.
+
+    Parameters:
+    - chunks (Iterable[DataFrame]): The typed chunks.
+    - column_types (dict[str, str]): The names of the columns mapped to their types.
+
+    Yields:
+    - bytes: The JSON lines of each chunk, with values encoded as in sheet pages.
+    """
+    for chunk in chunks:
+        yield b"".join(dumps(record) + b"\n" for record in records(chunk))
+
+
+class _ChunkSink:
+    """
+    A write-only file that hands out what has been written to it since it was last drained.
+    """
+
+    def __init__(self) -> None:
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def _parquet_schema(column_types: dict[str, str]) -> pyarrow.Schema:
+    """
+    Builds the schema of the Parquet export of a sheet from the types of its columns.
+
+    Objects and complex numbers are written as strings, and categories as strings with 32-bit
+    indices, so every chunk can hold its own values whatever they are.
+
+    Parameters:
+    - column_types (dict[str, str]): The names of the columns mapped to their types.
+
+    Returns:
+    - pyarrow.Schema: The schema every chunk of the export is written with.
+    """
+    columns = {}
+    for name, data_type in column_types.items():
+        column = Series(dtype=data_type)
+        columns[name] = column.astype(object) if column.dtype.kind == "c" else column
+    schema = pyarrow.Schema.from_pandas(DataFrame(columns), preserve_index=False)
+    return pyarrow.schema(
+        [field.with_type(writable_type(field.type)) for field in schema],
+        metadata=schema.metadata,
+    )
+
+
+def _parquet(
+    chunks: Iterable[DataFrame], column_types: dict[str, str]
+) -> Generator[bytes, None, None]:
+    """
+    Encodes chunks of records as a Parquet file, one row group per chunk.
+
+    Parameters:
+    - chunks (Iterable[DataFrame]): The typed chunks.
+    - column_types (dict[str, str]): The names of the columns mapped to their types.
+
+    Yields:
+    - bytes: The bytes of the Parquet file written for each chunk, then its footer. A sheet
+        without records is written as a file with its schema and no row groups.
+    """
+    schema = _parquet_schema(column_types)
+    sink = _ChunkSink()
+    writer = parquet.ParquetWriter(sink, schema)
+    for chunk in chunks:
+        table = pyarrow.Table.from_pandas(
+            DataFrame({name: storable_column(chunk[name]) for name in chunk.columns}),
+            preserve_index=False,
+        )
+        writer.write_table(table.cast(schema))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {CSV: _csv, NDJSON: _ndjson, PARQUET: _parquet}
+
+
+def export_sheet(
+    file_instance: File, export_format: str
+) -> Generator[bytes, None, None]:
+    """
+    Streams a whole typed sheet in an export format.
+
+    Parameters:
+    - file_instance (File): The sheet to export.
+    - export_format (str): One of `CSV`, `NDJSON` or `PARQUET`.
+
+    Yields:
+    - bytes: The encoded sheet, one chunk of records at a time.
+    """
+    columns = column_metadata(file_instance)
+    column_types = {column["name"]: column["data_type"] for column in columns}
+    column_formats = {column["name"]: column["datetime_format"] for column in columns}
+
+    return ENCODERS[export_format](
+        iter_records(file_instance, column_types, column_formats), column_types
+    )
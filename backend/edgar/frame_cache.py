@@ -0,0 +1,196 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable
+
+from django.conf import settings
+from pandas import DataFrame
+
+from edgar.models import File
+from edgar.snapshots import read_snapshot, typed_size
+
+"""
+An in-process cache of the typed DataFrames of sheets, bounded by their size in memory.
+
+Paging through a sheet reads and converts the same records over and over. Instead, the whole
+typed sheet is read from its snapshot once and kept in memory, keyed by the id of the file and
+its `types_version`, which is bumped whenever the type of one of its columns changes. Pages are
+then sliced from the cached frame. Frames are evicted least recently used first, once the
+frames held take more than `EDGAR_FRAME_CACHE_BYTES` bytes, and sheets larger than that are
+never cached and read a page at a time.
+
+Whether a sheet fits is first estimated from the uncompressed size of its snapshot, which
+undercounts strings several times over. Frames read on that estimate that turn out too large
+once in memory are remembered, so they are not read whole again on every page.
+"""
+
+# The number of frames too large for the cache that are remembered.
+OVERSIZED_KEYS = 1024
+
+
+class FrameCache:
+    """
+    A least recently used cache of DataFrames, bounded by their size in memory.
+
+    Attributes:
+    - hits (int): The number of lookups that found a frame.
+    - misses (int): The number of lookups that did not.
+    - evictions (int): The number of frames evicted to make room for others.
+    """
+
+    def __init__(
+        self, max_bytes: int | None = None, setting: str = "EDGAR_FRAME_CACHE_BYTES"
+    ) -> None:
+        """
+        Parameters:
+        - max_bytes (Optional[int]): The size in bytes the frames held must not exceed.
+            Defaults to the value of `setting`, read on every use.
+        - setting (str): The name of the setting holding the size, if `max_bytes` is not
+            given.
+        """
+        self._max_bytes = max_bytes
+        self._setting = setting
+        self._frames = OrderedDict()
+        self._oversized = OrderedDict()
+        self._lock = Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        The size in bytes the frames held must not exceed.
+        """
+        if self._max_bytes is None:
+            return getattr(settings, self._setting)
+        return self._max_bytes
+
+    def get(self, key: Hashable) -> DataFrame | None:
+        """
+        Looks up a frame, marking it as the most recently used.
+
+        Parameters:
+        - key (Hashable): The key the frame was stored under.
+
+        Returns:
+        - Optional[DataFrame]: The frame, or None if it is not held.
+        """
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, frame: DataFrame) -> bool:
+        """
+        Stores a frame, evicting the least recently used frames until it fits.
+
+        Parameters:
+        - key (Hashable): The key to store the frame under.
+        - frame (DataFrame): The frame to store. It must not be modified afterwards.
+
+        Returns:
+        - bool: False if the frame alone is larger than the cache, in which case it is not
+            stored, and its key is remembered as too large.
+        """
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            if size > self.max_bytes:
+                self._oversized[key] = size
+                self._oversized.move_to_end(key)
+                if len(self._oversized) > OVERSIZED_KEYS:
+                    self._oversized.popitem(last=False)
+                return False
+            if key in self._frames:
+                self.current_bytes -= self._frames.pop(key)[1]
+            while self._frames and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._frames.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            self._frames[key] = (frame, size)
+            self.current_bytes += size
+            return True
+
+    def is_oversized(self, key: Hashable) -> bool:
+        """
+        Checks whether a frame was rejected for being larger than the cache.
+
+        Parameters:
+        - key (Hashable): The key the frame was offered under.
+
+        Returns:
+        - bool: Whether the frame was rejected, and is still larger than the cache.
+        """
+        with self._lock:
+            size = self._oversized.get(key)
+            return size is not None and size > self.max_bytes
+
+    def clear(self) -> None:
+        """
+        Drops every frame, forgets the frames too large to hold and resets the counters.
+        """
+        with self._lock:
+            self._frames.clear()
+            self._oversized.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Reports the state of the cache.
+
+        Returns:
+        - dict[str, int]: The hits, misses and evictions so far, along with the number of frames
+            held, their size in bytes and the size they must not exceed.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "frames": len(self._frames),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+FRAME_CACHE = FrameCache()
+
+
+def read_cached_sheet(
+    file_instance: File,
+    column_types: dict[str, str],
+    column_formats: dict[str, str] = {},
+) -> DataFrame | None:
+    """
+    Reads the whole typed sheet of a file through the frame cache.
+
+    Parameters:
+    - file_instance (File): The file to read, which must have a snapshot.
+    - column_types (dict[str, str]): The columns of the file mapped to their data type.
+    - column_formats (dict[str, str]): The formats stored for the columns, if any.
+
+    Returns:
+    - Optional[DataFrame]: Every record of the sheet with its columns typed, or None if it is
+        too large to be cached.
+    """
+    key = (file_instance.pk, file_instance.types_version)
+    dataframe = FRAME_CACHE.get(key)
+    if dataframe is not None:
+        return dataframe
+
+    if (
+        FRAME_CACHE.is_oversized(key)
+        or typed_size(file_instance) > FRAME_CACHE.max_bytes
+    ):
+        return None
+
+    dataframe = read_snapshot(
+        file_instance, column_types, column_formats=column_formats
+    )
+    FRAME_CACHE.put(key, dataframe)
+    return dataframe
@@ -1,10 +1,34 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Generator
-from pandas import DataFrame
-from edgar.conversions import FUNCTIONS, FUNCTION_LOOKUP
+import numpy
+from pandas import DataFrame, Series
+from edgar.conversions import (
+    CHECK_LOOKUP,
+    FORMAT,
+    FUNCTIONS,
+    clear_conversion_cache,
+    convert_column,
+)
+from edgar.type_evidence import TypeEvidence
+
+TYPE_SOURCES = "type_sources"
+FORMATS = "formats"
+FULL_COLUMN = "full"
+SAMPLE = "sample"
+SUPPLIED = "supplied"
+
+# Types whose conversion depends on the column as a whole rather than on each value, so a sample
+# can neither propose nor rule them out.
+FULL_COLUMN_TYPES = {"category"}
 
 
 def infer_and_convert_data_types(
-    dataframe: DataFrame, supplied_types: dict[str, str] = {}
+    dataframe: DataFrame,
+    supplied_types: dict[str, str] = {},
+    sample_size: int | None = None,
+    workers: int = 1,
+    supplied_formats: dict[str, str] = {},
 ) -> DataFrame:
     """
     Infer and convert data types of columns in a pandas DataFrame based on supplied types or inferred types.
@@ -14,36 +38,130 @@ def infer_and_convert_data_types(
     - supplied_types (Optional[dict[str, str]]): A dictionary containing column names as keys and their
         respective desired data types as values. If provided, these types will be used for conversion.
         Defaults to None.
+    - sample_size (Optional[int]): When given, types of columns longer than this are proposed from a
+        sample of this many values and then verified against the whole column. Defaults to None,
+        inferring types from whole columns.
+    - workers (int): The number of processes the columns whose types are inferred are spread
+        over. Each process only receives the columns it infers. Defaults to 1, inferring the
+        types in this process.
+    - supplied_formats (Optional[dict[str, str]]): The formats of the columns with supplied types
+        that take one, such as datetimes, as detected when their type was first inferred.
 
     Returns:
-    - DataFrame: The pandas DataFrame with inferred and converted data types.
+    - DataFrame: The pandas DataFrame with inferred and converted data types. Its `attrs` hold,
+        under `TYPE_SOURCES`, whether each column's type came from a sample, the full column or
+        the supplied types, and under `FORMATS`, the formats detected for the inferred columns
+        whose conversion takes one.
 
     Raises:
     - TypeError: Raises a type error if the data type is not supported.
 
 
     """
+    dataframe.attrs[TYPE_SOURCES] = {}
+    dataframe.attrs[FORMATS] = {}
+    inferred_columns = []
     for column_name in dataframe.columns:
         if column_name in supplied_types.keys():
             try:
                 type_name = supplied_types[column_name]
-                conversion_function = FUNCTION_LOOKUP[type_name]
-                dataframe[column_name] = conversion_function(
-                    dataframe[column_name], force=True
+                dataframe[column_name] = convert_column(
+                    dataframe[column_name],
+                    type_name,
+                    force=True,
+                    format=supplied_formats.get(column_name, ""),
                 )
+                dataframe.attrs[TYPE_SOURCES][column_name] = SUPPLIED
 
             except AttributeError as e:
                 raise TypeError(
                     f"Invalid type conversion: '{type_name}' is not a supported data type."
                 )
-        elif any(apply_type_checkers(dataframe, column_name)):
+        elif workers > 1:
+            inferred_columns.append(column_name)
+        elif any(apply_type_checkers(dataframe, column_name, sample_size)):
             continue
 
+    if len(inferred_columns) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                infer_column,
+                (dataframe[column_name] for column_name in inferred_columns),
+                repeat(sample_size),
+            )
+            for column_name, (column, type_source, format) in zip(
+                inferred_columns, results
+            ):
+                dataframe[column_name] = column
+                dataframe.attrs[TYPE_SOURCES][column_name] = type_source
+                if format:
+                    dataframe.attrs[FORMATS][column_name] = format
+    elif inferred_columns:
+        any(apply_type_checkers(dataframe, inferred_columns[0], sample_size))
+
+    clear_conversion_cache()
     return dataframe
 
 
+def infer_column(
+    column: Series, sample_size: int | None = None
+) -> tuple[Series, str, str | None]:
+    """
+    Infers the type of a single column and converts it.
+
+    This is the unit of work of parallel inference, so it only takes the column itself.
+
+    Parameters:
+    - column (pandas.Series): The column to infer the type of.
+    - sample_size (Optional[int]): The size of the sample the type is proposed from, if any.
+
+    Returns:
+    - tuple[pandas.Series, str, Optional[str]]: The converted column, whether its type came from
+        a sample or the full column, and the format detected for it, if any.
+    """
+    dataframe = column.to_frame()
+    any(apply_type_checkers(dataframe, column.name, sample_size))
+    clear_conversion_cache()
+    return (
+        dataframe[column.name],
+        dataframe.attrs[TYPE_SOURCES].get(column.name, FULL_COLUMN),
+        dataframe.attrs.get(FORMATS, {}).get(column.name),
+    )
+
+
+def sample_column(column: Series, sample_size: int) -> Series:
+    """
+    Draws a stratified sample of a column: its first and last values, and values drawn at random
+    from the rest.
+
+    Parameters:
+    - column (pandas.Series): The column to sample.
+    - sample_size (int): The number of values to draw.
+
+    Returns:
+    - pandas.Series: The sampled values, in the order they appear in the column.
+    """
+    if len(column) <= sample_size:
+        return column
+
+    edge = max(sample_size // 3, 1)
+    middle = numpy.random.default_rng(0).choice(
+        numpy.arange(edge, len(column) - edge),
+        size=sample_size - 2 * edge,
+        replace=False,
+    )
+    positions = numpy.concatenate(
+        [
+            numpy.arange(edge),
+            numpy.sort(middle),
+            numpy.arange(len(column) - edge, len(column)),
+        ]
+    )
+    return column.iloc[positions]
+
+
 def apply_type_checkers(
-    dataframe: DataFrame, column_name: str
+    dataframe: DataFrame, column_name: str, sample_size: int | None = None
 ) -> Generator[bool, None, None]:
     """
     A generator function that applies type checkers on a DataFrame series to infer its type.
@@ -51,6 +169,8 @@ def apply_type_checkers(
     Parameters:
     - dataframe (DataFrame): The pandas DataFrame to apply data checks on.
     - column_name (str): The name of the column in the DataFrame to perform data checks on.
+    - sample_size (Optional[int]): The size of the sample types are proposed from. Defaults to None,
+        trying every conversion against the whole column.
 
     Yields:
     - bool: A boolean value indicating whether the data checks were successfully applied (`True`)
@@ -60,10 +180,37 @@ def apply_type_checkers(
         This generator iterates through a list of conversion functions, attempting to apply each one to
         the specified column of the DataFrame. If a conversion is successful, it yields `True` and stops
         further iterations. If none of the conversion functions are successful, it yields `False`.
+
+        The evidence about the column is gathered once, up front. Conversions whose registered check
+        rules them out from that evidence are skipped without being attempted.
+
+        With a sample size, the evidence is gathered from a sample of the column and conversions are
+        attempted on the sample first. A value that fails a conversion in the sample fails it in the
+        whole column too, so only the conversion proposed by the sample is verified against the whole
+        column, falling back to the next one if verification fails. The resulting type is the one
+        inferred from the whole column.
     """
-    for conversion in FUNCTIONS:
+    column = dataframe[column_name]
+    sample = sample_column(column, sample_size) if sample_size else column
+    evidence = TypeEvidence.from_series(sample)
+    for _, conversion_function, type_name in FUNCTIONS:
+        check = CHECK_LOOKUP.get(type_name)
+        if check is not None and not check(evidence):
+            continue
+
         try:
-            dataframe[column_name] = conversion[1](dataframe[column_name])
+            type_source = FULL_COLUMN
+            if sample is not column and type_name not in FULL_COLUMN_TYPES:
+                conversion_function(sample)
+                type_source = SAMPLE
+
+            converted = conversion_function(column)
+            dataframe[column_name] = converted
+            dataframe.attrs.setdefault(TYPE_SOURCES, {})[column_name] = type_source
+            if FORMAT in converted.attrs:
+                dataframe.attrs.setdefault(FORMATS, {})[column_name] = converted.attrs[
+                    FORMAT
+                ]
             yield True
 
         except Exception as e:
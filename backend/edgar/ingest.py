@@ -0,0 +1,402 @@
+from typing import BinaryIO, Callable, Generator
+
+import numpy
+import pandas
+from django.conf import settings
+from django.db import transaction
+from pandas import DataFrame, Series
+
+from edgar.conversions import (
+    CHECK_LOOKUP,
+    FORMAT,
+    FORMATTED_TYPES,
+    FUNCTIONS,
+    clear_conversion_cache,
+    convert_column,
+)
+from edgar.infer_data_types import (
+    FORMATS,
+    FULL_COLUMN,
+    TYPE_SOURCES,
+    infer_and_convert_data_types,
+)
+from edgar.models import Column, File, validate_data_type
+from edgar.profiles import (
+    ColumnProfiler,
+    estimate_distinct,
+    merge_distinct,
+    profile_columns,
+)
+from edgar.snapshots import save_snapshot, save_snapshot_chunks
+from edgar.type_evidence import TypeEvidence
+
+"""
+Ingestion of uploaded files: type inference, columns, their profiles and snapshot.
+
+Files are loaded whole and converted in memory, except CSV files larger than
+`EDGAR_STREAMING_INGESTION_THRESHOLD` bytes, which are ingested in chunks.
+
+A chunked file is read twice, `chunk_size` records at a time, so at most one chunk is held in memory:
+
+1. The first pass merges the evidence of every chunk into a running type per column. Each column
+   keeps the types every chunk seen so far converts to, in the order they are tried. A chunk
+   that fails a type removes it, widening the column: a value out of range widens int8 to
+   int16, a fraction widens an integer column to float, and anything widens to object. The
+   records are counted along the way.
+2. The second pass converts every chunk to the merged types, so it can be written out one chunk
+   at a time.
+
+Categories depend on the ratio of distinct values to values in the whole column rather than on
+each value. The distinct values are counted across chunks from a sketch of the smallest hashes
+of the values, as in profiles, so the count is exact up to `DISTINCT_SKETCH_SIZE` distinct
+values and estimated beyond, and memory does not grow with the column. Columns with fewer
+distinct values are typed as by whole-file inference; for the others the ratio is estimated,
+so a column whose ratio is close to `CATEGORY_THRESHOLD` may be typed differently.
+"""
+
+CATEGORY = "category"
+OBJECT = "object"
+
+# The uniqueness ratio below which a column is a category, as in the category conversion.
+CATEGORY_THRESHOLD = 0.5
+
+
+class StreamedColumn:
+    """
+    The running type of a column, merged from the chunks of a file read so far.
+
+    Attributes:
+    - name (str): The name of the column.
+    - candidates (list[str]): The types every chunk read so far converts to, in the order they
+        are tried.
+    - source_dtype (Optional[numpy.dtype]): The widest dtype the column was parsed as.
+    - length (int): The number of values read.
+    - hashes (numpy.ndarray): The smallest hashes of the distinct values read.
+    - has_nulls (bool): Whether a missing value was read.
+    - datetime_format (str): The datetime format detected in the first chunk tried as datetimes,
+        which every later chunk must be written in.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.candidates = [type_name for _, _, type_name in FUNCTIONS]
+        self.source_dtype = None
+        self.length = 0
+        self.hashes = numpy.empty(0, dtype="uint64")
+        self.has_nulls = False
+        self.datetime_format = ""
+
+    def update(self, column: Series) -> None:
+        """
+        Merges a chunk of the column into its running type.
+
+        Parameters:
+        - column (pandas.Series): The chunk of the column.
+        """
+        self.length += len(column)
+        self.source_dtype = widen_dtype(self.source_dtype, column.dtype)
+        self._update_distinct(column)
+
+        evidence = TypeEvidence.from_series(column)
+        for type_name in list(self.candidates):
+            if type_name in (CATEGORY, OBJECT):
+                continue
+
+            check = CHECK_LOOKUP.get(type_name)
+            if check is not None and not check(evidence):
+                self.candidates.remove(type_name)
+                continue
+
+            try:
+                converted = convert_column(
+                    column, type_name, format=self.datetime_format
+                )
+            except Exception:
+                self.candidates.remove(type_name)
+                continue
+
+            if type_name in FORMATTED_TYPES and not self.datetime_format:
+                self.datetime_format = converted.attrs.get(FORMAT, "")
+
+    def _update_distinct(self, column: Series) -> None:
+        """
+        Merges the distinct values of a chunk of the column into those read so far.
+
+        Parameters:
+        - column (pandas.Series): The chunk of the column.
+        """
+        self.has_nulls = self.has_nulls or column.isna().any()
+        values = column.dropna()
+        if values.dtype.kind in "iub":
+            # Chunks with missing values are parsed as floats, so the same numbers hash alike.
+            values = values.astype("float64")
+        self.hashes = merge_distinct(self.hashes, values)
+
+    @property
+    def data_type(self) -> str:
+        """
+        The type of the column, given the chunks read so far.
+
+        Returns:
+        - str: The first type every chunk converts to.
+        """
+        for type_name in self.candidates:
+            if type_name != CATEGORY:
+                return type_name
+            unique_count = estimate_distinct(self.hashes) + self.has_nulls
+            if self.length and unique_count / self.length <= CATEGORY_THRESHOLD:
+                return type_name
+        return OBJECT
+
+    def convert(self, column: Series) -> Series:
+        """
+        Converts a chunk of the column to its type.
+
+        Parameters:
+        - column (pandas.Series): The chunk of the column.
+
+        Returns:
+        - pandas.Series: The converted chunk.
+        """
+        return convert_column(
+            column, self.data_type, force=True, format=self.datetime_format
+        )
+
+
+def widen_dtype(current: numpy.dtype | None, dtype: numpy.dtype) -> numpy.dtype:
+    """
+    Finds the narrowest dtype that holds the values of two dtypes a column was parsed as.
+
+    Parameters:
+    - current (Optional[numpy.dtype]): The dtype of the chunks read so far, if any.
+    - dtype (numpy.dtype): The dtype of the next chunk.
+
+    Returns:
+    - numpy.dtype: Either dtype when they are the same, the promoted dtype of two numeric
+        dtypes, and the object dtype otherwise.
+    """
+    if current is None or current == dtype:
+        return dtype
+    if current.kind in "iuf" and dtype.kind in "iuf":
+        return numpy.promote_types(current, dtype)
+    return numpy.dtype("O")
+
+
+def _read_chunks(
+    handle: BinaryIO, chunk_size: int, **kwargs
+) -> Generator[DataFrame, None, None]:
+    """
+    Reads a CSV file from its start, one chunk of records at a time.
+
+    Parameters:
+    - handle (BinaryIO): The CSV file.
+    - chunk_size (int): The number of records in each chunk.
+    - **kwargs: Passed on to `pandas.read_csv`.
+
+    Yields:
+    - DataFrame: The chunks, each indexed from zero.
+    """
+    handle.seek(0)
+    with pandas.read_csv(handle, chunksize=chunk_size, **kwargs) as reader:
+        for chunk in reader:
+            yield chunk.reset_index(drop=True)
+
+
+def scan_csv(
+    handle: BinaryIO, chunk_size: int
+) -> tuple[dict[str, StreamedColumn], int]:
+    """
+    Infers the types of the columns of a CSV file, reading one chunk at a time.
+
+    Parameters:
+    - handle (BinaryIO): The CSV file.
+    - chunk_size (int): The number of records in each chunk.
+
+    Returns:
+    - tuple[dict[str, StreamedColumn], int]: The columns with their merged types, and the number
+        of records in the file.
+    """
+    columns = {}
+    number_of_records = 0
+    for chunk in _read_chunks(handle, chunk_size):
+        for name in chunk.columns:
+            if name not in columns:
+                columns[name] = StreamedColumn(name)
+            columns[name].update(chunk[name])
+        number_of_records += len(chunk)
+        clear_conversion_cache()
+
+    return columns, number_of_records
+
+
+def convert_csv(
+    handle: BinaryIO, columns: dict[str, StreamedColumn], chunk_size: int
+) -> Generator[tuple[DataFrame, DataFrame], None, None]:
+    """
+    Converts a CSV file to the types found by `scan_csv`, reading one chunk at a time.
+
+    Parameters:
+    - handle (BinaryIO): The CSV file.
+    - columns (dict[str, StreamedColumn]): The columns returned by `scan_csv`.
+    - chunk_size (int): The number of records in each chunk.
+
+    Yields:
+    - tuple[DataFrame, DataFrame]: Each chunk converted to the inferred types, along with the
+        chunk as parsed from the file.
+    """
+    source_dtypes = {name: column.source_dtype for name, column in columns.items()}
+    for source in _read_chunks(handle, chunk_size, dtype=source_dtypes):
+        typed = DataFrame(
+            {name: column.convert(source[name]) for name, column in columns.items()}
+        )
+        clear_conversion_cache()
+        yield typed, source
+
+
+def ingest_file(
+    file_instance: File,
+    sample_size: int | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> None:
+    """
+    Infers the types of a stored upload, records its columns and writes its snapshot.
+
+    The file is left processing, for the caller to mark it ready once it is done with it.
+
+    Parameters:
+    - file_instance (File): The uploaded file, without columns yet.
+    - sample_size (Optional[int]): The size of the sample types are proposed from, if any.
+    - progress (Optional[Callable[[int], None]]): Called with the number of records processed
+        so far, as records are converted.
+    """
+    is_csv = file_instance.file.name.endswith(".csv")
+    chunk_size = settings.EDGAR_INGESTION_CHUNK_SIZE
+    streaming = (
+        is_csv
+        and file_instance.file.size > settings.EDGAR_STREAMING_INGESTION_THRESHOLD
+    )
+
+    with file_instance.file.open("rb") as handle:
+        if streaming:
+            streamed_columns, number_of_records = scan_csv(handle, chunk_size)
+            column_types = {
+                name: column.data_type for name, column in streamed_columns.items()
+            }
+            type_sources = {}
+            formats = {
+                name: column.datetime_format
+                for name, column in streamed_columns.items()
+                if column.data_type in FORMATTED_TYPES
+            }
+        else:
+            dataframe = pandas.read_csv(handle) if is_csv else pandas.read_excel(handle)
+            source = dataframe.copy(deep=False)
+            dataframe = infer_and_convert_data_types(
+                dataframe,
+                sample_size=sample_size,
+                workers=settings.EDGAR_INFERENCE_WORKERS,
+            )
+            column_types = {
+                name: data_type.name for name, data_type in dataframe.dtypes.items()
+            }
+            type_sources = dataframe.attrs[TYPE_SOURCES]
+            formats = dataframe.attrs[FORMATS]
+            number_of_records = len(dataframe)
+            profiles = profile_columns(dataframe)
+
+        file_instance.number_of_records = number_of_records
+        file_instance.save(update_fields=["number_of_records"])
+
+        columns = [
+            Column(
+                file=file_instance,
+                name=name,
+                data_type=data_type,
+                type_source=type_sources.get(name, FULL_COLUMN),
+                datetime_format=formats.get(name) or "",
+                profile=None if streaming else profiles[name],
+            )
+            for name, data_type in column_types.items()
+        ]
+        create_columns(columns)
+
+        if streaming:
+            profilers = {}
+            chunks = convert_csv(handle, streamed_columns, chunk_size)
+            save_snapshot_chunks(
+                file_instance, _profiling(_reporting(chunks, progress), profilers)
+            )
+            for column in columns:
+                if column.name in profilers:
+                    column.profile = profilers[column.name].profile()
+            Column.objects.bulk_update(columns, ["profile"])
+        else:
+            save_snapshot(file_instance, dataframe, source)
+            if progress is not None:
+                progress(number_of_records)
+
+
+def create_columns(columns: list[Column]) -> None:
+    """
+    Inserts the columns of a file at once.
+
+    The types are validated in memory, and the columns are inserted with a single query rather
+    than saved one by one, so the number of queries does not grow with the number of columns.
+    Names are kept unique by the constraint on the file and name.
+
+    Parameters:
+    - columns (list[Column]): The unsaved columns.
+
+    Raises:
+    - ValidationError: If a column has an unsupported data type.
+    - IntegrityError: If two columns of the same file have the same name.
+    """
+    for column in columns:
+        validate_data_type(column.data_type)
+    with transaction.atomic():
+        Column.objects.bulk_create(columns)
+
+
+def _reporting(
+    chunks: Generator[tuple[DataFrame, DataFrame], None, None],
+    progress: Callable[[int], None] | None,
+) -> Generator[tuple[DataFrame, DataFrame], None, None]:
+    """
+    Passes chunks on, reporting the number of records converted after each one.
+
+    Parameters:
+    - chunks (Generator[tuple[DataFrame, DataFrame], None, None]): The chunks from `convert_csv`.
+    - progress (Optional[Callable[[int], None]]): Called with the number of records converted.
+
+    Yields:
+    - tuple[DataFrame, DataFrame]: The chunks, unchanged.
+    """
+    records = 0
+    for typed, source in chunks:
+        yield typed, source
+        records += len(typed)
+        if progress is not None:
+            progress(records)
+
+
+def _profiling(
+    chunks: Generator[tuple[DataFrame, DataFrame], None, None],
+    profilers: dict[str, ColumnProfiler],
+) -> Generator[tuple[DataFrame, DataFrame], None, None]:
+    """
+    Passes chunks on, profiling their typed columns along the way.
+
+    Parameters:
+    - chunks (Generator[tuple[DataFrame, DataFrame], None, None]): The chunks from `convert_csv`.
+    - profilers (dict[str, ColumnProfiler]): The profiles of the columns, filled in as chunks
+        are read.
+
+    Yields:
+    - tuple[DataFrame, DataFrame]: The chunks, unchanged.
+    """
+    for typed, source in chunks:
+        for name in typed.columns:
+            if name not in profilers:
+                profilers[name] = ColumnProfiler(typed[name].dtype)
+            profilers[name].update(typed[name])
+        yield typed, source
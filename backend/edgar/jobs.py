@@ -0,0 +1,232 @@
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from threading import Event, Thread
+from typing import Generator
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from edgar.ingest import ingest_file
+from edgar.models import DONE, FAILED, QUEUED, READY, RUNNING, Column, File, Job
+
+"""
+A database-backed queue for processing uploads in the background.
+
+`post_sheet` stores the upload and queues a `Job` for it. Worker processes, started with the
+`run_workers` management command, poll the queue and claim the oldest queued job. A job is
+claimed with a conditional update from queued to running, so when several workers race for
+the same job exactly one of them wins and the others move on.
+
+A claimed job is leased to its worker, which renews the lease with a heartbeat every
+`EDGAR_JOB_HEARTBEAT_INTERVAL` seconds while it runs the job. When a worker crashes or is killed,
+its job stops beating: once its last heartbeat is older than `EDGAR_JOB_LEASE_TIMEOUT` seconds,
+the next worker polling the queue puts it back in the queue, or fails it and its file once it
+was claimed `EDGAR_JOB_MAX_ATTEMPTS` times. Heartbeats and progress reports only renew the lease
+of the attempt that holds it, so a worker that only stalled stops at its next progress report
+once its job was claimed again, leaving the file to the new worker.
+
+A failed job leaves nothing of its file behind but the upload: its columns and snapshot are
+deleted along with the failure.
+"""
+
+STALE_JOB_ERROR = "The worker processing the file stopped responding."
+
+
+class LeaseLost(Exception):
+    """
+    Raised when the job a worker is running was claimed again by another worker.
+    """
+
+
+def _discard_outputs(file_id: int) -> None:
+    """
+    Deletes the columns and snapshot an attempt at processing a file left behind.
+
+    The snapshot is deleted once the current transaction commits, if any.
+
+    Parameters:
+    - file_id (int): The id of the file.
+    """
+    Column.objects.filter(file_id=file_id).delete()
+    file_instance = File.objects.get(pk=file_id)
+    File.objects.filter(pk=file_id).update(snapshot="", number_of_records=0)
+    if file_instance.snapshot:
+        storage, name = file_instance.snapshot.storage, file_instance.snapshot.name
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+def reclaim_stale_jobs() -> None:
+    """
+    Queues running jobs whose worker stopped responding again, or fails them once they were
+    claimed the maximum number of times.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.EDGAR_JOB_LEASE_TIMEOUT)
+    stale_jobs = Job.objects.filter(
+        Q(heartbeat_at__lt=cutoff)
+        | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        state=RUNNING,
+    )
+
+    for job in stale_jobs:
+        # Only the worker whose update wins handles the job, should several notice it.
+        lease = Job.objects.filter(
+            pk=job.pk, state=RUNNING, heartbeat_at=job.heartbeat_at
+        )
+        if job.attempts < settings.EDGAR_JOB_MAX_ATTEMPTS:
+            lease.update(state=QUEUED)
+        elif lease.update(state=FAILED, error=STALE_JOB_ERROR, finished_at=now):
+            _discard_outputs(job.file_id)
+            File.objects.filter(pk=job.file_id).update(state=FAILED)
+
+
+def claim_job() -> Job | None:
+    """
+    Claims the oldest queued job, after queuing the jobs of workers that stopped responding
+    again.
+
+    Returns:
+    - Optional[Job]: The claimed job, now running, or None if the queue is empty.
+    """
+    reclaim_stale_jobs()
+    while True:
+        job = Job.objects.filter(state=QUEUED).order_by("created_at", "pk").first()
+        if job is None:
+            return None
+
+        now = timezone.now()
+        claimed = Job.objects.filter(pk=job.pk, state=QUEUED).update(
+            state=RUNNING,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def _renew_lease(job: Job, **fields) -> bool:
+    """
+    Renews the lease of a running job, unless it was claimed again since.
+
+    Parameters:
+    - job (Job): The claimed job.
+    - **fields: Other fields of the job to update along with the lease.
+
+    Returns:
+    - bool: Whether the attempt still holds the lease.
+    """
+    return bool(
+        Job.objects.filter(pk=job.pk, state=RUNNING, attempts=job.attempts).update(
+            heartbeat_at=timezone.now(), **fields
+        )
+    )
+
+
+@contextmanager
+def _heartbeat(job: Job, lost: Event) -> Generator[None, None, None]:
+    """
+    Renews the lease of a running job from a background thread, until the block exits.
+
+    Parameters:
+    - job (Job): The claimed job.
+    - lost (Event): Set once the lease was lost to another worker.
+    """
+    stopped = Event()
+
+    def beat() -> None:
+        try:
+            while not stopped.wait(settings.EDGAR_JOB_HEARTBEAT_INTERVAL):
+                if not _renew_lease(job):
+                    lost.set()
+                    return
+        finally:
+            # The thread has its own connection, which is not closed for it otherwise.
+            connection.close()
+
+    thread = Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def _reset_file(file_instance: File) -> None:
+    """
+    Discards what an interrupted attempt at processing a file left behind.
+
+    Parameters:
+    - file_instance (File): The file of a job claimed again.
+    """
+    _discard_outputs(file_instance.pk)
+    file_instance.refresh_from_db(fields=["snapshot", "number_of_records"])
+
+
+def run_job(job: Job) -> None:
+    """
+    Processes the upload of a claimed job, recording its progress and outcome.
+
+    A worker whose job was claimed again since stops at its next progress report, and leaves
+    the job and its file to the new worker.
+
+    Parameters:
+    - job (Job): The claimed job.
+    """
+    lost = Event()
+
+    def progress(rows_processed: int) -> None:
+        if lost.is_set() or not _renew_lease(job, rows_processed=rows_processed):
+            raise LeaseLost(f"Job {job.pk} was claimed by another worker.")
+
+    try:
+        with _heartbeat(job, lost):
+            if job.attempts > 1:
+                _reset_file(job.file)
+            ingest_file(job.file, job.sample_size, progress)
+        job_state, file_state, error = DONE, READY, ""
+
+    except LeaseLost:
+        # The snapshot this attempt wrote, if any, is replaced by the new worker's.
+        if job.file.snapshot:
+            name = job.file.snapshot.name
+            File.objects.filter(pk=job.file_id, snapshot=name).update(snapshot="")
+            job.file.snapshot.storage.delete(name)
+        return
+
+    except Exception as e:
+        job_state, file_state, error = FAILED, FAILED, str(e)
+
+    with transaction.atomic():
+        # A job claimed again since, after this worker stopped responding, is left to its
+        # new worker.
+        finished = Job.objects.filter(pk=job.pk, attempts=job.attempts).update(
+            state=job_state, error=error, finished_at=timezone.now()
+        )
+        if finished and file_state == FAILED:
+            _discard_outputs(job.file_id)
+        if finished:
+            File.objects.filter(pk=job.file_id).update(state=file_state)
+
+
+def work(poll_interval: float, burst: bool = False) -> None:
+    """
+    Runs queued jobs one after another.
+
+    Parameters:
+    - poll_interval (float): The number of seconds to wait before polling an empty queue again.
+    - burst (bool): Whether to return once the queue is empty instead of polling it.
+    """
+    while True:
+        job = claim_job()
+        if job is not None:
+            run_job(job)
+        elif burst:
+            return
+        else:
+            time.sleep(poll_interval)
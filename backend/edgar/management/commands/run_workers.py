@@ -0,0 +1,64 @@
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from edgar.jobs import work
+
+
+class Command(BaseCommand):
+    """
+    Starts the worker processes that process queued uploads.
+    """
+
+    help = "Starts worker processes that process queued uploads in the background."
+
+    def add_arguments(self, parser) -> None:
+        """
+        Adds the command line arguments of the command.
+
+        Args:
+            parser (ArgumentParser): The parser of the command line arguments.
+        """
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.EDGAR_WORKERS,
+            help="The number of worker processes to start.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.EDGAR_WORKER_POLL_INTERVAL,
+            help="The number of seconds to wait before polling an empty queue again.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling it.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Runs the workers until they are interrupted, or until the queue is empty with --burst.
+        """
+        workers = options["workers"]
+        poll_interval = options["poll_interval"]
+        burst = options["burst"]
+
+        if workers <= 1:
+            work(poll_interval, burst)
+            return
+
+        # Forked workers must not share the database connection of this process.
+        connections.close_all()
+        context = get_context("fork")
+        processes = [
+            context.Process(target=work, args=(poll_interval, burst))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+
+"""
+An in-process cache of the serialized columns of sheets.
+
+Every read of a sheet needs its columns, with their names, types and formats. They are
+serialized once by `edgar.serializers.column_metadata` and kept, keyed by the id of the file
+and its `types_version`, so reading a sheet whose columns are cached only queries the `File`
+itself. Changing the type of a column bumps the version of its file, so its columns are
+serialized again on the next read, in every process. At most `EDGAR_METADATA_CACHE_SIZE` sheets
+are kept, least recently used first.
+"""
+
+
+class ColumnCache:
+    """
+    A least recently used cache of the serialized columns of sheets.
+    """
+
+    def __init__(self) -> None:
+        self._columns = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: tuple[int, int]) -> list[dict] | None:
+        """
+        Looks up the columns of a sheet, marking them as the most recently used.
+
+        Parameters:
+        - key (tuple[int, int]): The id of the file and its version.
+
+        Returns:
+        - Optional[list[dict]]: The serialized columns, or None if they are not held.
+        """
+        with self._lock:
+            columns = self._columns.get(key)
+            if columns is not None:
+                self._columns.move_to_end(key)
+            return columns
+
+    def put(self, key: tuple[int, int], columns: list[dict]) -> None:
+        """
+        Stores the columns of a sheet, evicting the least recently used sheets beyond the size
+        of the cache.
+
+        Parameters:
+        - key (tuple[int, int]): The id of the file and its version.
+        - columns (list[dict]): The serialized columns.
+        """
+        with self._lock:
+            self._columns[key] = columns
+            self._columns.move_to_end(key)
+            while len(self._columns) > settings.EDGAR_METADATA_CACHE_SIZE:
+                self._columns.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drops the columns of every sheet.
+        """
+        with self._lock:
+            self._columns.clear()
+
+
+COLUMN_CACHE = ColumnCache()
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-17 06:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edgar', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='snapshot',
+            field=models.FileField(blank=True, upload_to='snapshots/'),
+        ),
+    ]
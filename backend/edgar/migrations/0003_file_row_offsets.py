@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-17 06:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("edgar", "0002_file_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="row_offsets",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
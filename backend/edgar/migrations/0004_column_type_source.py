@@ -0,0 +1,26 @@
+# Generated by Django 5.0.3 on 2026-10-17 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("edgar", "0003_file_row_offsets"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="column",
+            name="type_source",
+            field=models.CharField(
+                choices=[
+                    ("full", "Inferred from the full column"),
+                    ("sample", "Inferred from a sample"),
+                    ("supplied", "Supplied"),
+                ],
+                default="full",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-17 06:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("edgar", "0005_file_state_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="column",
+            name="datetime_format",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+    ]
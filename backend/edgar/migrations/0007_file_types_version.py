@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-17 06:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("edgar", "0006_column_datetime_format"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="types_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-17 06:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("edgar", "0007_file_types_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="column",
+            name="profile",
+            field=models.JSONField(blank=True, default=None, null=True),
+        ),
+    ]
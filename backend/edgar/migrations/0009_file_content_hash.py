@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-17 06:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("edgar", "0008_column_profile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.3 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+def clear_row_offsets(apps, schema_editor):
+    # Offsets built before the stride was stored are rebuilt, with it, when next read.
+    File = apps.get_model("edgar", "File")
+    File.objects.update(row_offsets=[])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("edgar", "0009_file_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="row_index_stride",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(clear_row_offsets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-17 07:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("edgar", "0010_file_row_index_stride"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
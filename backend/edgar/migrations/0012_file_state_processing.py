@@ -0,0 +1,26 @@
+# Generated by Django 5.0.3 on 2026-10-17 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("edgar", "0011_job_lease"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="file",
+            name="state",
+            field=models.CharField(
+                choices=[
+                    ("processing", "Processing"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="processing",
+                max_length=10,
+            ),
+        ),
+    ]
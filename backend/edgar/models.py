@@ -1,6 +1,14 @@
 from django.core.exceptions import ValidationError
 from django.db import models
 from edgar.conversions import SUPPORTED_TYPES
+from edgar.infer_data_types import FULL_COLUMN, SAMPLE, SUPPLIED
+
+PROCESSING = "processing"
+READY = "ready"
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
 
 
 class File(models.Model):
@@ -9,9 +17,25 @@ class File(models.Model):
     """
 
     file = models.FileField(upload_to="uploads/")
+    snapshot = models.FileField(upload_to="snapshots/", blank=True)
+    # The SHA-256 hash of the upload, which later uploads with the same content are matched on.
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    # The byte offsets of every `row_index_stride`-th record of a CSV upload without a snapshot,
+    # built the first time a page of it is read. A stride of 0 means no index was built.
+    row_offsets = models.JSONField(default=list, blank=True)
+    row_index_stride = models.PositiveIntegerField(default=0)
     file_name = models.CharField(max_length=255)
     number_of_records = models.IntegerField(default=0)
+    # Bumped whenever the type of one of the columns changes, invalidating cached typed frames.
+    types_version = models.PositiveIntegerField(default=0)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    # Files are processing until their columns and snapshot are stored, so they are never
+    # served without them.
+    state = models.CharField(
+        max_length=10,
+        choices=[(PROCESSING, "Processing"), (READY, "Ready"), (FAILED, "Failed")],
+        default=PROCESSING,
+    )
 
 
 def validate_data_type(value: str) -> None:
@@ -38,6 +62,17 @@ class Column(models.Model):
     file = models.ForeignKey(File, related_name="columns", on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
     data_type = models.CharField(max_length=50)
+    type_source = models.CharField(
+        max_length=10,
+        choices=[
+            (FULL_COLUMN, "Inferred from the full column"),
+            (SAMPLE, "Inferred from a sample"),
+            (SUPPLIED, "Supplied"),
+        ],
+        default=FULL_COLUMN,
+    )
+    datetime_format = models.CharField(max_length=100, blank=True, default="")
+    profile = models.JSONField(null=True, blank=True, default=None)
 
     class Meta:
         unique_together = ("file", "name")
@@ -45,11 +80,45 @@ class Column(models.Model):
     def save(self, *args, **kwargs):
         """
         Override the save method to ensure data_type validation and uniqueness check.
+
+        The uniqueness check is skipped when `update_fields` leaves the file and name as they are.
         """
         validate_data_type(self.data_type)
-        existing_columns = Column.objects.filter(file=self.file, name=self.name)
-        if self.pk:
-            existing_columns = existing_columns.exclude(pk=self.pk)
-        if existing_columns.exists():
-            raise ValidationError("Column with this name already exists for the file.")
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"file", "name"} & set(update_fields):
+            existing_columns = Column.objects.filter(file=self.file, name=self.name)
+            if self.pk:
+                existing_columns = existing_columns.exclude(pk=self.pk)
+            if existing_columns.exists():
+                raise ValidationError(
+                    "Column with this name already exists for the file."
+                )
         super().save(*args, **kwargs)
+
+
+class Job(models.Model):
+    """
+    Model to queue the processing of uploaded files for the background workers.
+    """
+
+    file = models.OneToOneField(File, related_name="job", on_delete=models.CASCADE)
+    state = models.CharField(
+        max_length=10,
+        choices=[
+            (QUEUED, "Queued"),
+            (RUNNING, "Running"),
+            (DONE, "Done"),
+            (FAILED, "Failed"),
+        ],
+        default=QUEUED,
+    )
+    sample_size = models.IntegerField(null=True, blank=True)
+    rows_processed = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    # The number of times a worker claimed the job, including after a worker stopped responding.
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Renewed by the worker running the job, which is presumed gone once it is too old.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
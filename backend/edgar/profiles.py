@@ -0,0 +1,364 @@
+import numpy
+import pandas
+from django.conf import settings
+from pandas import DataFrame, Series
+from pandas.util import hash_array, hash_pandas_object
+
+from edgar.renderers import column_values
+
+"""
+Profiles of the columns of sheets, computed while they are ingested.
+
+A profile summarises a typed column: its number of values and missing values, an estimate of
+its number of distinct values, and according to its type
+
+- for numbers: its minimum, maximum, mean, standard deviation, quantiles and a histogram.
+- for datetimes and timedeltas: its minimum, maximum, quantiles and a histogram.
+- for categories, booleans, objects, strings and complex numbers: its most frequent values.
+
+Profiles are built one chunk of the column at a time, so streamed uploads are profiled as they
+are converted, without holding the column. Counts, missing values, minimums, maximums, means and
+standard deviations are exact. The rest come from bounded summaries that are exact for small
+columns and estimates for large ones:
+
+- distinct values are counted from the `DISTINCT_SKETCH_SIZE` smallest hashes of the values.
+- quantiles and histograms are taken from a uniform sample of `EDGAR_PROFILE_SAMPLE_SIZE` values,
+  picked by hashing the position of each record.
+- the most frequent values are counted exactly up to `EDGAR_PROFILE_SAMPLE_SIZE` distinct
+  values, beyond which the least frequent are dropped as new values come in.
+"""
+
+DISTINCT_SKETCH_SIZE = 4096
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+NUMERIC = "numeric"
+TEMPORAL = "temporal"
+FREQUENCY = "frequency"
+
+
+def _kind(dtype: object) -> str:
+    """
+    Finds how a column of a dtype is profiled.
+
+    Parameters:
+    - dtype (object): The dtype of the column.
+
+    Returns:
+    - str: `NUMERIC` for integers and floats, `TEMPORAL` for datetimes and timedeltas, and
+        `FREQUENCY` for everything else.
+    """
+    kind = getattr(dtype, "kind", "O")
+    if dtype.name == "category" or kind in "bcO":
+        return FREQUENCY
+    if kind in "iuf":
+        return NUMERIC
+    if kind in "mM":
+        return TEMPORAL
+    return FREQUENCY
+
+
+def merge_distinct(hashes: numpy.ndarray, values: Series) -> numpy.ndarray:
+    """
+    Merges the hashes of values into a sketch of the smallest hashes of the values read so far.
+
+    Parameters:
+    - hashes (numpy.ndarray): The sketch of the values read so far, sorted.
+    - values (pandas.Series): The next values, without missing values.
+
+    Returns:
+    - numpy.ndarray: The `DISTINCT_SKETCH_SIZE` smallest distinct hashes, sorted.
+    """
+    new_hashes = hash_pandas_object(values, index=False).to_numpy()
+    return numpy.unique(numpy.concatenate([hashes, new_hashes]))[:DISTINCT_SKETCH_SIZE]
+
+
+def estimate_distinct(hashes: numpy.ndarray) -> int:
+    """
+    Counts the distinct values of a sketch built by `merge_distinct`, estimating the count once
+    it exceeds `DISTINCT_SKETCH_SIZE`.
+
+    Parameters:
+    - hashes (numpy.ndarray): The sketch.
+
+    Returns:
+    - int: The number of distinct values.
+    """
+    if len(hashes) < DISTINCT_SKETCH_SIZE:
+        return len(hashes)
+    fraction = (float(hashes[-1]) + 1) / 2.0**64
+    return int(round((DISTINCT_SKETCH_SIZE - 1) / fraction))
+
+
+def _json_values(values: Series) -> list:
+    """
+    Converts values to JSON values, as in sheet pages.
+
+    Parameters:
+    - values (pandas.Series): The values.
+
+    Returns:
+    - list: The values, with those JSON has no type for as strings.
+    """
+    converted = []
+    for value in column_values(values):
+        if isinstance(value, numpy.generic):
+            value = value.item()
+        if value is not None and not isinstance(value, (str, bool, int, float)):
+            value = str(value)
+        converted.append(value)
+    return converted
+
+
+class ColumnProfiler:
+    """
+    The running profile of a column, merged from the chunks of it read so far.
+
+    Attributes:
+    - dtype (object): The dtype of the column.
+    - kind (str): How the column is profiled: `NUMERIC`, `TEMPORAL` or `FREQUENCY`.
+    - count (int): The number of values read, missing or not.
+    - nulls (int): The number of missing values read.
+    - minimum, maximum (object): The smallest and largest values read, for numbers and
+        temporal columns.
+    - mean (float): The mean of the values read, for numbers.
+    - m2 (float): The sum of squared differences from the mean, for numbers.
+    - hashes (numpy.ndarray): The smallest hashes of the values read.
+    - priorities (numpy.ndarray): The hashes of the positions of the sampled values.
+    - sample (numpy.ndarray): The sampled values, as floats, or nanoseconds for temporal columns.
+    - frequencies (pandas.Series): The number of times values were read, indexed by the values,
+        for other columns.
+    """
+
+    def __init__(self, dtype: object) -> None:
+        self.dtype = dtype
+        self.kind = _kind(dtype)
+        self.count = 0
+        self.nulls = 0
+        self.minimum = None
+        self.maximum = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.hashes = numpy.empty(0, dtype="uint64")
+        self.priorities = numpy.empty(0, dtype="uint64")
+        self.sample = numpy.empty(0, dtype="float64")
+        self.frequencies = Series(dtype="int64", index=pandas.Index([], dtype=object))
+
+    def update(self, column: Series) -> None:
+        """
+        Merges a chunk of the column into its profile.
+
+        Parameters:
+        - column (pandas.Series): The next chunk of the column, converted to its type.
+        """
+        offset = self.count
+        self.count += len(column)
+        missing = column.isna().to_numpy()
+        self.nulls += int(missing.sum())
+        values = column[~missing]
+        if values.empty:
+            return
+
+        self.hashes = merge_distinct(self.hashes, values)
+        if self.kind == FREQUENCY:
+            self._update_frequencies(values)
+            return
+
+        self.minimum = (
+            values.min() if self.minimum is None else min(self.minimum, values.min())
+        )
+        self.maximum = (
+            values.max() if self.maximum is None else max(self.maximum, values.max())
+        )
+        numbers = (
+            values.to_numpy(dtype="float64")
+            if self.kind == NUMERIC
+            else values.astype("int64").to_numpy(dtype="float64")
+        )
+        if self.kind == NUMERIC:
+            self._update_moments(numbers)
+        positions = numpy.arange(offset, offset + len(column), dtype="uint64")[~missing]
+        self._update_sample(hash_array(positions), numbers)
+
+    def _update_frequencies(self, values: Series) -> None:
+        """
+        Counts the values of a chunk, dropping the least frequent values beyond the number of
+        values tracked.
+
+        Parameters:
+        - values (pandas.Series): The values of a chunk, without missing values.
+        """
+        counts = values.value_counts(sort=False)
+        # Categories that do not occur in the chunk are counted as 0.
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(object)
+        if len(self.frequencies):
+            # Grouping rather than aligning keeps values that cannot be ordered, and the order
+            # in which values were first read, which ties are broken by.
+            counts = (
+                pandas.concat([self.frequencies, counts])
+                .groupby(level=0, sort=False)
+                .sum()
+            )
+        self.frequencies = counts
+        if len(self.frequencies) > settings.EDGAR_PROFILE_SAMPLE_SIZE:
+            self.frequencies = self.frequencies.nlargest(
+                settings.EDGAR_PROFILE_SAMPLE_SIZE // 2, keep="first"
+            )
+
+    def _update_moments(self, numbers: numpy.ndarray) -> None:
+        """
+        Merges the mean and squared differences of a chunk into those read so far.
+
+        Parameters:
+        - numbers (numpy.ndarray): The values of a chunk, without missing values.
+        """
+        size = len(numbers)
+        seen = self.count - self.nulls - size
+        total = seen + size
+        mean = numbers.mean()
+        delta = mean - self.mean
+        self.m2 += ((numbers - mean) ** 2).sum() + delta**2 * seen * size / total
+        self.mean += delta * size / total
+
+    def _update_sample(self, priorities: numpy.ndarray, numbers: numpy.ndarray) -> None:
+        """
+        Keeps the values whose positions have the smallest hashes, a uniform sample of the
+        values read so far.
+
+        Parameters:
+        - priorities (numpy.ndarray): The hashes of the positions of the values.
+        - numbers (numpy.ndarray): The values of a chunk, without missing values.
+        """
+        priorities = numpy.concatenate([self.priorities, priorities])
+        sample = numpy.concatenate([self.sample, numbers])
+        size = settings.EDGAR_PROFILE_SAMPLE_SIZE
+        if len(priorities) > size:
+            kept = numpy.argpartition(priorities, size)[:size]
+            priorities, sample = priorities[kept], sample[kept]
+        self.priorities, self.sample = priorities, sample
+
+    def _values(self, numbers: list) -> list:
+        """
+        Converts numbers of the sample back to the type of the column, as JSON values.
+
+        Parameters:
+        - numbers (list): Numbers of the sample, or computed from it.
+
+        Returns:
+        - list: Floats for numbers, and ISO 8601 strings or timedeltas as strings for temporal
+            columns.
+        """
+        if self.kind == NUMERIC:
+            return [float(number) for number in numbers]
+        nanoseconds = numpy.rint(numpy.asarray(numbers, dtype="float64")).astype(
+            "int64"
+        )
+        if self.dtype.kind == "m":
+            return _json_values(Series(pandas.to_timedelta(nanoseconds, unit="ns")))
+        timestamps = pandas.to_datetime(nanoseconds, unit="ns", utc=True)
+        if getattr(self.dtype, "tz", None) is None:
+            timestamps = timestamps.tz_localize(None)
+        return _json_values(Series(timestamps))
+
+    @property
+    def distinct(self) -> int:
+        """
+        The number of distinct values read, estimated once it exceeds `DISTINCT_SKETCH_SIZE`.
+
+        Returns:
+        - int: The number of distinct values.
+        """
+        return estimate_distinct(self.hashes)
+
+    def profile(self) -> dict:
+        """
+        Summarises the column from the chunks read so far.
+
+        Returns:
+        - dict: The profile of the column, with None for the statistics that do not apply to
+            its type.
+        """
+        values = self.count - self.nulls
+        profile = {
+            "count": self.count,
+            "nulls": self.nulls,
+            "distinct": self.distinct,
+            "min": None,
+            "max": None,
+            "mean": None,
+            "std": None,
+            "quantiles": None,
+            "histogram": None,
+            "top": None,
+        }
+
+        if self.kind == FREQUENCY:
+            top = self.frequencies.nlargest(settings.EDGAR_PROFILE_TOP_K, keep="first")
+            profile["top"] = [
+                {"value": value, "count": int(count)}
+                for value, count in zip(
+                    _json_values(Series(top.index, dtype=object)), top.tolist()
+                )
+            ]
+            return profile
+        if not values:
+            return profile
+
+        profile["min"], profile["max"] = _json_values(
+            Series([self.minimum, self.maximum], dtype=self.dtype)
+        )
+        if self.kind == NUMERIC:
+            profile["mean"] = float(self.mean)
+            profile["std"] = (
+                float(numpy.sqrt(self.m2 / (values - 1))) if values > 1 else None
+            )
+
+        profile["quantiles"] = dict(
+            zip(
+                (str(quantile) for quantile in QUANTILES),
+                self._values(numpy.quantile(self.sample, QUANTILES).tolist()),
+            )
+        )
+        low, high = self.sample.min(), self.sample.max()
+        if low == high:
+            # A single value gets a single bin rather than bins around it.
+            counts, edges = numpy.array([len(self.sample)]), numpy.array([low, high])
+        else:
+            counts, edges = numpy.histogram(
+                self.sample, bins=settings.EDGAR_PROFILE_HISTOGRAM_BINS
+            )
+        # Counts of a sample are scaled to the whole column.
+        scale = values / len(self.sample)
+        profile["histogram"] = {
+            "edges": self._values(edges.tolist()),
+            "counts": [int(round(count * scale)) for count in counts.tolist()],
+        }
+        return profile
+
+
+def profile_columns(dataframe: DataFrame) -> dict[str, dict]:
+    """
+    Profiles every column of a typed DataFrame.
+
+    Parameters:
+    - dataframe (DataFrame): The typed records.
+
+    Returns:
+    - dict[str, dict]: The column names mapped to their profile.
+    """
+    return {name: profile_column(dataframe[name]) for name in dataframe.columns}
+
+
+def profile_column(column: Series) -> dict:
+    """
+    Profiles a whole typed column.
+
+    Parameters:
+    - column (pandas.Series): The column.
+
+    Returns:
+    - dict: The profile of the column.
+    """
+    profiler = ColumnProfiler(column.dtype)
+    profiler.update(column)
+    return profiler.profile()
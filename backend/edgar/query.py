@@ -0,0 +1,587 @@
+import operator
+from dataclasses import dataclass
+from typing import Callable, Generator, Iterable
+
+import pandas
+from django.conf import settings
+from pandas import DataFrame, Series
+
+from edgar.conversions import convert_column
+from edgar.frame_cache import FrameCache, read_cached_sheet
+from edgar.infer_data_types import infer_and_convert_data_types
+from edgar.models import File
+from edgar.snapshots import iter_snapshot, read_snapshot_rows, row_group_statistics
+
+"""
+Filtering and sorting of typed sheets.
+
+Filters are given as `column:operator:value`, and compare the typed values of a column: numbers
+and datetimes are compared as such, while categories, objects and strings are compared as text.
+Missing values never match a comparison, only `isnull`. Sorts are given as a column name, with
+a leading `-` to sort in descending order.
+
+Row groups of a snapshot are skipped without being read when the statistics Parquet records for
+each of them, the minimum, maximum and number of missing values of every column, show that none
+of their records can match a filter. Sheets small enough for the frame cache are queried from it
+instead, and sheets without a snapshot are read whole from their uploaded file.
+
+Only the columns compared or sorted by are read to find the matching records, and only the
+records of the requested page are read of the other columns. The matching records are cached in
+order, keyed by the sheet, its `types_version`, the filters and the sort, so paging through the
+results reads the sheet once.
+"""
+
+OPERATORS: dict[str, Callable] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+NULL_OPERATORS = {"isnull", "notnull"}
+EQUALITY_OPERATORS = {"eq", "ne"}
+
+# Records sorted by a single numeric or temporal column are only sorted as far as the page read,
+# for pages within this fraction of the matching records.
+PARTIAL_SORT_FRACTION = 0.1
+# The attribute of cached matching records telling whether they are in order.
+SORTED = "sorted"
+
+QUERY_CACHE = FrameCache(setting="EDGAR_QUERY_CACHE_BYTES")
+
+# The types values are compared as text, and the types whose values can only be told apart.
+TEXT_TYPES = {"category", "object", "string"}
+UNORDERED_TYPES = {"category", "complex128"}
+
+
+@dataclass(frozen=True)
+class Filter:
+    """
+    A condition records of a sheet must meet.
+
+    Attributes:
+    - column (str): The name of the column compared.
+    - operator (str): One of `OPERATORS`, `isnull` or `notnull`.
+    - value (object): The value compared against, typed as the column, if any.
+    """
+
+    column: str
+    operator: str
+    value: object = None
+
+    def mask(self, dataframe: DataFrame) -> Series:
+        """
+        Finds the records that meet the condition.
+
+        Parameters:
+        - dataframe (DataFrame): The typed records.
+
+        Returns:
+        - pandas.Series: True for each record that meets the condition.
+        """
+        column = dataframe[self.column]
+        if self.operator == "isnull":
+            return column.isna()
+        if self.operator == "notnull":
+            return column.notna()
+        if column.dtype.name in TEXT_TYPES or column.dtype == object:
+            column = column.astype("string")
+        matches = OPERATORS[self.operator](column, self.value)
+        return matches.fillna(False).astype(bool)
+
+    def may_match(
+        self, minimum: object, maximum: object, null_count: int, rows: int
+    ) -> bool:
+        """
+        Checks whether a chunk of records could hold records that meet the condition, given the
+        statistics of the column in the chunk.
+
+        Parameters:
+        - minimum (object): The smallest value of the column in the chunk, if known.
+        - maximum (object): The largest value of the column in the chunk, if known.
+        - null_count (int): The number of missing values of the column in the chunk.
+        - rows (int): The number of records in the chunk.
+
+        Returns:
+        - bool: False only when no record of the chunk can meet the condition.
+        """
+        if self.operator == "isnull":
+            return null_count > 0
+        if null_count == rows:
+            return False
+        if self.operator == "notnull" or minimum is None or maximum is None:
+            return True
+
+        try:
+            if self.operator == "eq":
+                return minimum <= self.value <= maximum
+            if self.operator == "ne":
+                return not minimum == maximum == self.value
+            if self.operator == "lt":
+                return minimum < self.value
+            if self.operator == "le":
+                return minimum <= self.value
+            if self.operator == "gt":
+                return maximum > self.value
+            return maximum >= self.value
+        except TypeError:
+            return True
+
+
+def _typed_value(value: str, data_type: str) -> object:
+    """
+    Converts the value of a filter to the type its column is compared as.
+
+    Parameters:
+    - value (str): The value as given.
+    - data_type (str): The type of the column.
+
+    Returns:
+    - object: The value as text for text types, as a 64-bit integer for integer types when it is
+        a whole number within range and as a float otherwise, as a float for float types, and
+        converted to the type of the column otherwise.
+
+    Raises:
+    - ValueError: If the value cannot be converted.
+    """
+    if data_type in TEXT_TYPES:
+        return value
+    if data_type.lower().startswith("int"):
+        # Parsed as an integer so values beyond 2**53 are compared exactly, and as a float
+        # for fractions and values out of range.
+        try:
+            converted = convert_column(Series([value]), "Int64")
+        except Exception:
+            converted = None
+        if converted is not None and converted.notna().all():
+            return converted.iloc[0]
+        data_type = "float64"
+    if data_type.lower().startswith("float"):
+        data_type = "float64"
+    try:
+        converted = convert_column(Series([value]), data_type)
+    except Exception:
+        raise ValueError(f"{value!r} is not a valid {data_type} value.")
+    if converted.isna().all():
+        raise ValueError(f"{value!r} is not a valid {data_type} value.")
+    return converted.iloc[0]
+
+
+def _split_column(expression: str, column_types: dict[str, str]) -> tuple[str, str]:
+    """
+    Splits the name of a column from the start of an expression, allowing for column names that
+    hold the separator.
+
+    Parameters:
+    - expression (str): The expression, as `column:rest`.
+    - column_types (dict[str, str]): The columns of the sheet mapped to their data type.
+
+    Returns:
+    - tuple[str, str]: The name of the column and the rest of the expression.
+
+    Raises:
+    - ValueError: If the expression does not start with the name of a column.
+    """
+    for name in sorted(column_types.keys(), key=len, reverse=True):
+        if expression.startswith(f"{name}:"):
+            return name, expression[len(name) + 1 :]
+    raise ValueError(f"{expression!r} does not start with the name of a column.")
+
+
+def parse_filters(
+    expressions: Iterable[str], column_types: dict[str, str]
+) -> list[Filter]:
+    """
+    Parses filters given as `column:operator:value`, or `column:isnull` and `column:notnull`.
+
+    Parameters:
+    - expressions (Iterable[str]): The filters.
+    - column_types (dict[str, str]): The columns of the sheet mapped to their data type.
+
+    Returns:
+    - list[Filter]: The filters, with their values typed as their columns.
+
+    Raises:
+    - ValueError: If a filter names an unknown column or operator, or its value cannot be
+        compared with its column.
+    """
+    filters = []
+    for expression in expressions:
+        column, rest = _split_column(expression, column_types)
+        name, _, value = rest.partition(":")
+        data_type = column_types[column]
+        if name in NULL_OPERATORS:
+            filters.append(Filter(column, name))
+        elif name not in OPERATORS:
+            raise ValueError(
+                f"{name!r} is not a supported operator. Please select from "
+                f"{list(OPERATORS.keys()) + sorted(NULL_OPERATORS)}"
+            )
+        elif data_type in UNORDERED_TYPES and name not in EQUALITY_OPERATORS:
+            raise ValueError(
+                f"{column} is {data_type}, which can only be compared with eq and ne."
+            )
+        else:
+            filters.append(Filter(column, name, _typed_value(value, data_type)))
+    return filters
+
+
+def parse_sort(
+    expressions: Iterable[str], column_types: dict[str, str]
+) -> list[tuple[str, bool]]:
+    """
+    Parses sorts given as a column name, with a leading `-` for descending order.
+
+    Parameters:
+    - expressions (Iterable[str]): The sorts, the first of which sorts first.
+    - column_types (dict[str, str]): The columns of the sheet mapped to their data type.
+
+    Returns:
+    - list[tuple[str, bool]]: The columns to sort by, each with whether it sorts ascending.
+
+    Raises:
+    - ValueError: If a sort names an unknown column.
+    """
+    sort = []
+    for expression in expressions:
+        ascending = not (expression.startswith("-") and expression not in column_types)
+        column = expression if ascending else expression[1:]
+        if column not in column_types:
+            raise ValueError(f"The sheet has no column named {column!r}.")
+        sort.append((column, ascending))
+    return sort
+
+
+def _sort_key(column: Series) -> Series:
+    """
+    Makes the values of a column comparable with one another, so mixed columns can be sorted.
+
+    Parameters:
+    - column (pandas.Series): The column.
+
+    Returns:
+    - pandas.Series: The column as text for objects, and the column itself otherwise.
+    """
+    return column.astype("string") if column.dtype == object else column
+
+
+def matching_row_groups(
+    file_instance: File, column_types: dict[str, str], filters: list[Filter]
+) -> list[int]:
+    """
+    Finds the row groups of a file's snapshot that may hold records meeting every filter.
+
+    Parameters:
+    - file_instance (File): The file to read, which must have a snapshot.
+    - column_types (dict[str, str]): The columns of the file mapped to their data type.
+    - filters (list[Filter]): The conditions records must all meet.
+
+    Returns:
+    - list[int]: The indices of the row groups that cannot be ruled out by their statistics.
+    """
+    row_groups = []
+    for index, (rows, columns) in enumerate(
+        row_group_statistics(file_instance, column_types)
+    ):
+        if all(
+            condition.may_match(*columns[condition.column], rows)
+            for condition in filters
+            if condition.column in columns
+        ):
+            row_groups.append(index)
+    return row_groups
+
+
+def iter_records(
+    file_instance: File,
+    column_types: dict[str, str],
+    column_formats: dict[str, str] = {},
+    filters: list[Filter] = [],
+) -> Generator[DataFrame, None, None]:
+    """
+    Reads the records of a sheet one chunk at a time, typed as its columns.
+
+    Parameters:
+    - file_instance (File): The sheet to read.
+    - column_types (dict[str, str]): The columns of the sheet mapped to their data type.
+    - column_formats (dict[str, str]): The formats stored for the columns, if any.
+    - filters (list[Filter]): Conditions used to skip the row groups of the snapshot that hold
+        no matching records. The records read are not filtered otherwise.
+
+    Yields:
+    - DataFrame: A row group of the snapshot at a time, or chunks of
+        `EDGAR_INGESTION_CHUNK_SIZE` records of the uploaded file when there is no snapshot,
+        indexed by the position of the records in the sheet.
+    """
+    if file_instance.snapshot:
+        row_groups = (
+            matching_row_groups(file_instance, column_types, filters)
+            if filters
+            else None
+        )
+        yield from iter_snapshot(
+            file_instance, column_types, column_formats, row_groups
+        )
+        return
+
+    with file_instance.file.open("rb") as handle:
+        if file_instance.file.name.endswith(".csv"):
+            chunks = pandas.read_csv(
+                handle,
+                chunksize=settings.EDGAR_INGESTION_CHUNK_SIZE,
+                names=list(column_types.keys()),
+                header=0,
+            )
+        else:
+            chunks = [pandas.read_excel(handle, names=list(column_types.keys()))]
+
+        start = 0
+        for chunk in chunks:
+            dataframe = infer_and_convert_data_types(
+                chunk.reset_index(drop=True),
+                column_types,
+                supplied_formats=column_formats,
+            )
+            dataframe.index = pandas.RangeIndex(start, start + len(dataframe))
+            start += len(dataframe)
+            yield dataframe
+
+
+def _key_columns(filters: list[Filter], sort: list[tuple[str, bool]]) -> list[str]:
+    """
+    Finds the columns a query compares or sorts by.
+
+    Parameters:
+    - filters (list[Filter]): The conditions records must all meet.
+    - sort (list[tuple[str, bool]]): The columns to sort by.
+
+    Returns:
+    - list[str]: The names of the columns, each once.
+    """
+    names = [condition.column for condition in filters] + [name for name, _ in sort]
+    return list(dict.fromkeys(names))
+
+
+def matching_keys(
+    file_instance: File,
+    column_types: dict[str, str],
+    column_formats: dict[str, str],
+    filters: list[Filter],
+    sort: list[tuple[str, bool]],
+) -> DataFrame:
+    """
+    Finds the records of a sheet that meet every filter, reading only the columns compared or
+    sorted by.
+
+    Parameters:
+    - file_instance (File): The sheet to query.
+    - column_types (dict[str, str]): The columns of the sheet mapped to their data type.
+    - column_formats (dict[str, str]): The formats stored for the columns, if any.
+    - filters (list[Filter]): The conditions records must all meet.
+    - sort (list[tuple[str, bool]]): The columns to sort by.
+
+    Returns:
+    - DataFrame: The columns sorted by of the matching records, in the order of the sheet and
+        indexed by their position in it.
+    """
+    key_types = {name: column_types[name] for name in _key_columns(filters, sort)}
+    cached = (
+        read_cached_sheet(file_instance, column_types, column_formats)
+        if file_instance.snapshot
+        else None
+    )
+    if cached is not None:
+        chunks = [cached[list(key_types.keys())]]
+    elif file_instance.snapshot:
+        chunks = iter_records(file_instance, key_types, column_formats, filters)
+    else:
+        # Uploaded files are read by the position of their columns, so all of them are read.
+        chunks = iter_records(file_instance, column_types, column_formats)
+
+    sort_columns = [name for name, _ in sort]
+    matches = []
+    for chunk in chunks:
+        for condition in filters:
+            chunk = chunk[condition.mask(chunk)]
+        matches.append(chunk[sort_columns])
+
+    if not matches:
+        return DataFrame(columns=sort_columns)
+    keys = pandas.concat(matches) if len(matches) > 1 else matches[0]
+    # Chunks hold their own categories, which concatenating them falls back to objects for.
+    for name, dtype in matches[0].dtypes.items():
+        if dtype.name == "category" and keys[name].dtype.name != "category":
+            keys[name] = keys[name].astype("category")
+    return keys
+
+
+def _sort(keys: DataFrame, sort: list[tuple[str, bool]]) -> DataFrame:
+    """
+    Sorts matching records by the columns sorted by, keeping ties in the order of the sheet.
+
+    Parameters:
+    - keys (DataFrame): The columns sorted by of the matching records.
+    - sort (list[tuple[str, bool]]): The columns to sort by, each with whether it sorts
+        ascending.
+
+    Returns:
+    - DataFrame: The records in order, with missing values last.
+    """
+    return keys.sort_values(
+        by=[column for column, _ in sort],
+        ascending=[ascending for _, ascending in sort],
+        kind="stable",
+        na_position="last",
+        key=_sort_key,
+    )
+
+
+def _top(keys: DataFrame, sort: list[tuple[str, bool]], stop: int) -> pandas.Index:
+    """
+    Finds the first records in order without sorting every matching record.
+
+    Parameters:
+    - keys (DataFrame): The columns sorted by of the matching records.
+    - sort (list[tuple[str, bool]]): A single numeric or temporal column to sort by, with
+        whether it sorts ascending.
+    - stop (int): The number of records to find.
+
+    Returns:
+    - pandas.Index: The positions of the first `stop` records in order, as `_sort` orders them.
+    """
+    column, ascending = sort[0]
+    values = keys[column]
+    present = values.dropna()
+    top = (present.nsmallest if ascending else present.nlargest)(stop, keep="first")
+    # Ties keep the order of the sheet, as in a stable sort.
+    top = top.sort_index().sort_values(ascending=ascending, kind="stable")
+    positions = top.index
+    if len(positions) < stop:
+        missing = values.index[values.isna()]
+        positions = positions.append(missing[: stop - len(positions)])
+    return positions
+
+
+def _can_select(keys: DataFrame, sort: list[tuple[str, bool]], stop: int) -> bool:
+    """
+    Checks whether the first records in order are better found by `_top` than by sorting.
+
+    Parameters:
+    - keys (DataFrame): The columns sorted by of the matching records.
+    - sort (list[tuple[str, bool]]): The columns to sort by.
+    - stop (int): The number of records to find.
+
+    Returns:
+    - bool: Whether the records are sorted by a single numeric or temporal column, and only
+        the first `PARTIAL_SORT_FRACTION` of them are wanted.
+    """
+    if len(sort) != 1 or stop > PARTIAL_SORT_FRACTION * len(keys):
+        return False
+    dtype = keys[sort[0][0]].dtype
+    return dtype.name != "category" and getattr(dtype, "kind", "O") in "iufmM"
+
+
+def read_rows(
+    file_instance: File,
+    column_types: dict[str, str],
+    column_formats: dict[str, str],
+    positions: pandas.Index,
+    projection: list[str],
+) -> DataFrame:
+    """
+    Reads records of a sheet by their position.
+
+    Parameters:
+    - file_instance (File): The sheet to read.
+    - column_types (dict[str, str]): The columns of the sheet mapped to their data type.
+    - column_formats (dict[str, str]): The formats stored for the columns, if any.
+    - positions (pandas.Index): The positions of the records, in the order they are wanted.
+    - projection (list[str]): The columns to read.
+
+    Returns:
+    - DataFrame: The records in the order of `positions`, indexed from zero.
+    """
+    cached = (
+        read_cached_sheet(file_instance, column_types, column_formats)
+        if file_instance.snapshot
+        else None
+    )
+    if cached is not None:
+        dataframe = cached.iloc[positions][projection]
+    elif file_instance.snapshot:
+        dataframe = read_snapshot_rows(
+            file_instance,
+            {name: column_types[name] for name in projection},
+            positions,
+            column_formats,
+        )
+    else:
+        chunks = [
+            chunk.loc[chunk.index.isin(positions), projection]
+            for chunk in iter_records(file_instance, column_types, column_formats)
+        ]
+        dataframe = pandas.concat(chunks).loc[positions]
+    return dataframe.reset_index(drop=True)
+
+
+def query_sheet(
+    file_instance: File,
+    column_types: dict[str, str],
+    column_formats: dict[str, str],
+    filters: list[Filter],
+    sort: list[tuple[str, bool]],
+    start_index: int = 0,
+    num_records: int | None = None,
+    projection: list[str] | None = None,
+) -> tuple[DataFrame, int]:
+    """
+    Filters and sorts the records of a sheet, reading a page of the matching records.
+
+    The matching records are found from the columns compared and sorted by alone, and kept in
+    `QUERY_CACHE` in order, so reading the next page does not query the sheet again. Records
+    sorted by a single numeric or temporal column are only sorted as far as the page, until a
+    page past `PARTIAL_SORT_FRACTION` of them is read. Only the records of the page are then
+    read, of the projected columns.
+
+    Parameters:
+    - file_instance (File): The sheet to query.
+    - column_types (dict[str, str]): The columns of the sheet mapped to their data type.
+    - column_formats (dict[str, str]): The formats stored for the columns, if any.
+    - filters (list[Filter]): The conditions records must all meet.
+    - sort (list[tuple[str, bool]]): The columns to sort by, each with whether it sorts
+        ascending.
+    - start_index (int): The index of the first matching record to read.
+    - num_records (Optional[int]): The number of records to read. Defaults to all of them.
+    - projection (Optional[list[str]]): The columns to read. Defaults to all of them.
+
+    Returns:
+    - tuple[DataFrame, int]: The page of matching records in order, indexed from zero, and the
+        number of matching records.
+    """
+    key = (file_instance.pk, file_instance.types_version, tuple(filters), tuple(sort))
+    keys = QUERY_CACHE.get(key)
+    if keys is None:
+        keys = matching_keys(file_instance, column_types, column_formats, filters, sort)
+        keys.attrs = {SORTED: not sort}
+        QUERY_CACHE.put(key, keys)
+
+    stop = len(keys) if num_records is None else start_index + num_records
+    if keys.attrs.get(SORTED):
+        positions = keys.index[start_index:stop]
+    elif _can_select(keys, sort, stop):
+        positions = _top(keys, sort, stop)[start_index:]
+    else:
+        keys = _sort(keys, sort)
+        keys.attrs = {SORTED: True}
+        QUERY_CACHE.put(key, keys)
+        positions = keys.index[start_index:stop]
+
+    projection = projection or list(column_types.keys())
+    if len(positions):
+        page = read_rows(
+            file_instance, column_types, column_formats, positions, projection
+        )
+    else:
+        page = DataFrame(columns=projection)
+    return page, len(keys)
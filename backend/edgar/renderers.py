@@ -0,0 +1,204 @@
+import datetime
+
+import numpy
+import orjson
+import pyarrow
+import pyarrow.ipc
+from django.conf import settings
+from pandas import DataFrame, Series
+from rest_framework.renderers import BaseRenderer
+
+from edgar.snapshots import storable_column
+
+"""
+Encodings of typed pages.
+
+Rather than turning every value of a page into a string, each column is converted to JSON
+values in one go, according to its type: numbers and booleans stay native, datetimes become
+ISO 8601 strings and missing values become null. The records are then rendered with orjson.
+
+Programmatic clients can ask for pages as an Arrow IPC stream instead, which keeps the dtype of
+every column and is read without parsing.
+"""
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+NANOSECONDS_PER_SECOND = 1_000_000_000
+
+
+def _datetime_values(series: Series) -> list:
+    """
+    Converts a datetime column to ISO 8601 strings.
+
+    Parameters:
+    - series (pandas.Series): The datetime column, naive or with a time zone.
+
+    Returns:
+    - list: The datetimes as strings, to the second unless some value has a fraction of a
+        second, in UTC for columns with a time zone, and None for missing values.
+    """
+    timezone = None
+    if series.dt.tz is not None:
+        series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        timezone = "UTC"
+
+    values = series.to_numpy(dtype="datetime64[ns]")
+    missing = numpy.isnat(values)
+    nanoseconds = values[~missing].view("i8")
+    unit = "s" if not (nanoseconds % NANOSECONDS_PER_SECOND).any() else "ns"
+
+    strings = numpy.datetime_as_string(values, unit=unit, timezone=timezone or "naive")
+    return numpy.where(missing, None, strings).tolist()
+
+
+def column_values(series: Series) -> list:
+    """
+    Converts a column to the values it is encoded as in JSON.
+
+    Parameters:
+    - series (pandas.Series): The column.
+
+    Returns:
+    - list: Python numbers and booleans for numeric and boolean columns, ISO 8601 strings for
+        datetimes, strings for complex numbers and timedeltas, which JSON has no type for, and
+        None for missing values.
+    """
+    kind = series.dtype.kind
+    if series.dtype.name == "category":
+        # Missing values have the code -1, which picks the None appended to the categories.
+        categories = column_values(Series(series.cat.categories)) + [None]
+        return numpy.array(categories, dtype=object)[
+            series.cat.codes.to_numpy()
+        ].tolist()
+    if kind == "M":
+        return _datetime_values(series)
+    if kind in "biuf" and isinstance(series.dtype, numpy.dtype):
+        # Floats keep NaN and infinity, which orjson encodes as null.
+        return series.tolist()
+    if kind in "cm":
+        return series.astype(str).where(series.notna(), None).tolist()
+    return series.to_numpy(dtype=object, na_value=None).tolist()
+
+
+def records(dataframe: DataFrame) -> list[dict]:
+    """
+    Converts a page to a list of records, one column at a time.
+
+    Parameters:
+    - dataframe (DataFrame): The typed page.
+
+    Returns:
+    - list[dict]: A dict per record mapping the column names to their JSON values.
+    """
+    names = list(dataframe.columns)
+    columns = [column_values(dataframe[name]) for name in names]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _default(value: object) -> object:
+    """
+    Encodes the values orjson does not handle itself.
+
+    Parameters:
+    - value (object): The value to encode.
+
+    Returns:
+    - object: An ISO 8601 string for dates and times, and the string of the value otherwise.
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(data: object) -> bytes:
+    """
+    Encodes data as JSON with orjson.
+
+    Parameters:
+    - data (object): The data to encode.
+
+    Returns:
+    - bytes: The JSON document, with numpy values encoded natively.
+    """
+    return orjson.dumps(data, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renders responses as JSON with orjson, encoding numpy values natively.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(
+        self,
+        data: object,
+        accepted_media_type: str | None = None,
+        renderer_context: dict | None = None,
+    ) -> bytes:
+        """
+        Renders data as JSON.
+
+        Parameters:
+        - data (object): The data to render.
+        - accepted_media_type (Optional[str]): The media type accepted by the client.
+        - renderer_context (Optional[dict]): The context of the view.
+
+        Returns:
+        - bytes: The JSON document, or nothing when there is no data.
+        """
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+class ArrowRenderer(BaseRenderer):
+    """
+    Renders typed pages as an Arrow IPC stream of record batches.
+
+    Columns keep their dtypes: integers and floats of every width, categories as dictionaries,
+    datetimes as timestamps and nullable types with their nulls. Columns Arrow cannot hold, such
+    as complex numbers, are sent as strings. Anything other than a page, such as an error, is
+    rendered as JSON.
+    """
+
+    media_type = ARROW_STREAM
+    format = "arrow"
+    charset = None
+
+    def render(
+        self,
+        data: object,
+        accepted_media_type: str | None = None,
+        renderer_context: dict | None = None,
+    ) -> bytes:
+        """
+        Renders a page as an Arrow IPC stream.
+
+        Parameters:
+        - data (object): The page to render, as a DataFrame.
+        - accepted_media_type (Optional[str]): The media type accepted by the client.
+        - renderer_context (Optional[dict]): The context of the view.
+
+        Returns:
+        - bytes: The Arrow IPC stream, in batches of `EDGAR_SNAPSHOT_ROW_GROUP_SIZE` records.
+        """
+        if not isinstance(data, DataFrame):
+            response = (renderer_context or {}).get("response")
+            if response is not None:
+                response["Content-Type"] = ORJSONRenderer.media_type
+            return ORJSONRenderer().render(data, accepted_media_type, renderer_context)
+
+        table = pyarrow.Table.from_pandas(
+            DataFrame({name: storable_column(data[name]) for name in data.columns}),
+            preserve_index=False,
+        )
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            for batch in table.to_batches(
+                max_chunksize=settings.EDGAR_SNAPSHOT_ROW_GROUP_SIZE
+            ):
+                writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
@@ -0,0 +1,273 @@
+import atexit
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+import django
+import pandas
+from django.conf import settings
+from django.core.files.storage import Storage
+from django.db import transaction
+from django.db.models import F
+from pandas import DataFrame
+
+from edgar.conversions import FORMAT, convert_column
+from edgar.infer_data_types import SUPPLIED
+from edgar.models import Column, File, validate_data_type
+from edgar.profiles import profile_column
+from edgar.snapshots import read_source_columns, replace_typed_columns
+from edgar.uploads import is_shared
+
+"""
+Changing the types of the columns of a sheet.
+
+Only the columns being retyped are read, from the source columns of the snapshot, and each is
+converted once. Several columns can be retyped at once, reading them together and, for batches
+of at least `EDGAR_PARALLEL_RETYPE_VALUES` values, converting them in parallel over a pool of
+processes kept for the life of the process. The processes are spawned rather than forked, as
+forking a threaded server copies locks other threads may hold, and set Django up on start. The converted columns are written into a copy of the
+snapshot in place of their typed columns, and the copy is swapped in within the same transaction
+as the new types of the columns, their new profiles and the bump of the file's `types_version`.
+Later reads then serve the retyped columns as stored, without converting them again, and a
+failed retype leaves the sheet, and the columns given, as they were.
+
+The copy is only swapped in if the `types_version` of the file is still the one it was read at,
+so of two retypes of the same sheet running at once, the second to finish fails rather than
+dropping the columns the first stored.
+"""
+
+UPDATED_FIELDS = ["data_type", "type_source", "datetime_format", "profile"]
+
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = Lock()
+
+
+class RetypeConflict(Exception):
+    """
+    Raised when the columns of a sheet were retyped by another request while being retyped.
+    """
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Finds the pool of processes retypes are spread over, starting it on first use.
+
+    Parameters:
+    - workers (int): The number of processes of the pool.
+
+    Returns:
+    - ProcessPoolExecutor: The pool, shared by every retype of this process.
+    """
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        return _pools[workers]
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    """
+    Stops the pools of processes started by retypes, as the process exits.
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(cancel_futures=True)
+        _pools.clear()
+
+
+def read_source(file_instance: File, names: list[str]) -> DataFrame:
+    """
+    Reads whole columns of a sheet as parsed from the uploaded file.
+
+    Parameters:
+    - file_instance (File): The sheet.
+    - names (list[str]): The names of the columns.
+
+    Returns:
+    - DataFrame: The columns, from the snapshot when there is one, and from the uploaded file
+        otherwise.
+    """
+    if file_instance.snapshot:
+        return read_source_columns(file_instance, names)
+    if file_instance.file.name.endswith(".csv"):
+        return pandas.read_csv(file_instance.file, usecols=names)[names]
+    return pandas.read_excel(file_instance.file, usecols=names)[names]
+
+
+def retype_column(column_instance: Column, data_type: str) -> Column:
+    """
+    Changes the type of a column, storing the converted column in the sheet's snapshot.
+
+    Parameters:
+    - column_instance (Column): The column, with its file.
+    - data_type (str): The new type of the column.
+
+    Returns:
+    - Column: The column with its new type.
+
+    Raises:
+    - ValueError: If the column cannot be converted to the type, in which case nothing changes.
+    - RetypeConflict: If the sheet was retyped by another request meanwhile.
+    """
+    errors = retype_columns(column_instance.file, {column_instance: data_type})
+    if errors:
+        raise ValueError(errors[column_instance.pk])
+    return column_instance
+
+
+def _convert(column: pandas.Series, data_type: str) -> pandas.Series | str:
+    """
+    Converts a column to a type, reporting failures rather than raising them.
+
+    This is the unit of work of parallel retypes, so it only takes the column and its type.
+
+    Parameters:
+    - column (pandas.Series): The column as parsed from the uploaded file.
+    - data_type (str): The type to convert it to.
+
+    Returns:
+    - pandas.Series | str: The converted column, or the reason the conversion failed.
+    """
+    try:
+        return convert_column(column, data_type, force=True)
+    except Exception as e:
+        return str(e) or f"The column cannot be converted to {data_type}."
+
+
+def retype_columns(
+    file_instance: File, changes: dict[Column, str], workers: int = 1
+) -> dict[int, str]:
+    """
+    Changes the types of columns of a sheet at once.
+
+    The columns are read together, converted one by one or spread over processes, and those
+    that convert are stored in a single copy of the snapshot and a single transaction. Columns
+    that do not convert keep their type. The columns given only take their new types once they
+    are stored.
+
+    Parameters:
+    - file_instance (File): The sheet the columns belong to.
+    - changes (dict[Column, str]): The columns mapped to their new types.
+    - workers (int): The number of processes the conversions are spread over.
+
+    Returns:
+    - dict[int, str]: The ids of the columns that could not be converted, mapped to the reason.
+
+    Raises:
+    - RetypeConflict: If the sheet was retyped by another request meanwhile, in which case
+        nothing changes.
+    """
+    columns = list(changes.keys())
+    source = read_source(file_instance, [column.name for column in columns])
+    arguments = (
+        [source[column.name] for column in columns],
+        [changes[column] for column in columns],
+    )
+    if (
+        workers > 1
+        and len(columns) > 1
+        and source.size >= settings.EDGAR_PARALLEL_RETYPE_VALUES
+    ):
+        results = list(_pool(workers).map(_convert, *arguments))
+    else:
+        results = list(map(_convert, *arguments))
+
+    errors = {}
+    updates = {}
+    retyped = {}
+    for column, result in zip(columns, results):
+        if isinstance(result, str):
+            errors[column.pk] = result
+            continue
+        updates[column] = {
+            "data_type": changes[column],
+            "type_source": SUPPLIED,
+            # The format detected now is reused by every later read of the column.
+            "datetime_format": result.attrs.get(FORMAT, ""),
+            "profile": profile_column(result),
+        }
+        retyped[column.name] = result
+
+    if retyped:
+        save_retyped_columns(file_instance, updates, retyped)
+    return errors
+
+
+def save_retyped_columns(
+    file_instance: File,
+    updates: dict[Column, dict[str, object]],
+    converted: dict[str, pandas.Series],
+) -> None:
+    """
+    Stores retyped columns, along with their converted values, atomically, then sets their new
+    fields on the columns given.
+
+    Parameters:
+    - file_instance (File): The sheet the columns belong to, as the columns were read from.
+    - updates (dict[Column, dict[str, object]]): The columns mapped to their new values of
+        `UPDATED_FIELDS`.
+    - converted (dict[str, pandas.Series]): The columns converted to their new types.
+
+    Raises:
+    - RetypeConflict: If the `types_version` of the sheet changed since it was read.
+    """
+    for fields in updates.values():
+        validate_data_type(fields["data_type"])
+    updated_columns = []
+    for column, fields in updates.items():
+        updated_column = copy.copy(column)
+        for name, value in fields.items():
+            setattr(updated_column, name, value)
+        updated_columns.append(updated_column)
+
+    storage = file_instance.snapshot.storage
+    previous_snapshot = file_instance.snapshot.name
+    snapshot = (
+        replace_typed_columns(file_instance, converted)
+        if file_instance.snapshot
+        else previous_snapshot
+    )
+
+    try:
+        with transaction.atomic():
+            swapped = File.objects.filter(
+                pk=file_instance.pk, types_version=file_instance.types_version
+            ).update(snapshot=snapshot, types_version=F("types_version") + 1)
+            if not swapped:
+                raise RetypeConflict(
+                    "The columns of the sheet were changed meanwhile. Please try again."
+                )
+            Column.objects.bulk_update(updated_columns, UPDATED_FIELDS)
+            if snapshot != previous_snapshot:
+                transaction.on_commit(
+                    lambda: _delete_snapshot(storage, previous_snapshot, file_instance)
+                )
+    except Exception:
+        if snapshot != previous_snapshot:
+            storage.delete(snapshot)
+        raise
+
+    file_instance.snapshot = snapshot
+    file_instance.types_version += 1
+    for column, fields in updates.items():
+        for name, value in fields.items():
+            setattr(column, name, value)
+
+
+def _delete_snapshot(storage: Storage, name: str, file_instance: File) -> None:
+    """
+    Deletes a snapshot a sheet no longer uses, unless another sheet with the same upload
+    shares it.
+
+    Parameters:
+    - storage (Storage): The storage of the snapshots.
+    - name (str): The name of the snapshot.
+    - file_instance (File): The sheet that used it.
+    """
+    if not is_shared("snapshot", name, file_instance):
+        storage.delete(name)
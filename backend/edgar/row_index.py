@@ -0,0 +1,126 @@
+from typing import BinaryIO, Generator
+
+import pandas
+from django.conf import settings
+from pandas import DataFrame
+
+from edgar.models import File
+
+"""
+Sparse byte-offset indexes for paginating CSV files.
+
+The index holds the byte offset of every `stride`-th record of a CSV file, so a page can be read
+by seeking to the nearest preceding checkpoint rather than tokenizing every record before it.
+Records are found by tracking double quotes, so newlines inside quoted fields do not start a
+new record. Blank lines are skipped, matching how `pandas.read_csv` counts records.
+
+Sheets are read from their snapshot, so the index is only built for CSV uploads without one,
+the first time a page of them is read. The stride is stored along with the offsets, so the
+index stays valid if `EDGAR_ROW_INDEX_STRIDE` changes.
+"""
+
+QUOTE = b'"'
+
+
+def _record_starts(handle: BinaryIO) -> Generator[int, None, None]:
+    """
+    Yields the byte offset at which each record of a CSV file starts, including the header.
+
+    Parameters:
+    - handle (BinaryIO): The CSV file opened in binary mode, positioned at its start.
+
+    Yields:
+    - int: The byte offset of the start of each record.
+    """
+    position = handle.tell()
+    record_start = None
+    in_quotes = False
+
+    for line in handle:
+        if record_start is None and not line.strip():
+            position += len(line)
+            continue
+        if record_start is None:
+            record_start = position
+        position += len(line)
+
+        if line.count(QUOTE) % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            yield record_start
+            record_start = None
+
+    if record_start is not None:
+        yield record_start
+
+
+def build_row_offsets(handle: BinaryIO, stride: int) -> list[int]:
+    """
+    Builds the sparse byte-offset index of a CSV file.
+
+    Parameters:
+    - handle (BinaryIO): The CSV file opened in binary mode.
+    - stride (int): The number of records between two checkpoints.
+
+    Returns:
+    - list[int]: The byte offsets of records 0, stride, 2 * stride, ... where record 0 is the
+        first record after the header.
+    """
+    handle.seek(0)
+    offsets = []
+    for index, offset in enumerate(_record_starts(handle), start=-1):
+        if index >= 0 and index % stride == 0:
+            offsets.append(offset)
+    handle.seek(0)
+    return offsets
+
+
+def index_file(file_instance: File, handle: BinaryIO) -> None:
+    """
+    Builds and stores the sparse byte-offset index of a file's CSV upload, unless it has one.
+
+    Parameters:
+    - file_instance (File): The file to index.
+    - handle (BinaryIO): The uploaded CSV file opened in binary mode.
+    """
+    if file_instance.row_index_stride:
+        return
+    file_instance.row_index_stride = settings.EDGAR_ROW_INDEX_STRIDE
+    file_instance.row_offsets = build_row_offsets(
+        handle, file_instance.row_index_stride
+    )
+    file_instance.save(update_fields=["row_offsets", "row_index_stride"])
+
+
+def read_csv_page(
+    handle: BinaryIO,
+    offsets: list[int],
+    stride: int,
+    names: list[str],
+    start_index: int,
+    num_records: int,
+) -> DataFrame:
+    """
+    Reads a page of records from a CSV file using its sparse byte-offset index.
+
+    Parameters:
+    - handle (BinaryIO): The CSV file opened in binary mode.
+    - offsets (list[int]): The index built by `build_row_offsets`.
+    - stride (int): The stride the index was built with.
+    - names (list[str]): The names of the columns.
+    - start_index (int): The index of the first record to read.
+    - num_records (int): The number of records to read.
+
+    Returns:
+    - DataFrame: The requested records.
+    """
+    checkpoint = min(start_index // stride, len(offsets) - 1)
+    handle.seek(offsets[checkpoint])
+
+    return pandas.read_csv(
+        handle,
+        header=None,
+        names=names,
+        skiprows=start_index - checkpoint * stride,
+        nrows=num_records,
+    )
@@ -1,8 +1,16 @@
 import pandas
 from rest_framework import serializers
 from edgar.conversions import SUPPORTED_TYPES
-from edgar.models import File, Column
+from edgar.frame_cache import read_cached_sheet
+from edgar.metadata import COLUMN_CACHE
+from edgar.renderers import records
+from edgar.models import File, Column, Job
 from edgar.infer_data_types import infer_and_convert_data_types
+from edgar.query import query_sheet
+from edgar.row_index import index_file, read_csv_page
+from edgar.snapshots import read_snapshot
+
+NUMBER_OF_MATCHES = "number_of_matches"
 
 
 class ColumnSerializer(serializers.ModelSerializer):
@@ -17,7 +25,10 @@ class ColumnSerializer(serializers.ModelSerializer):
             "file",
             "name",
             "data_type",
+            "type_source",
+            "datetime_format",
         ]
+        read_only_fields = ["datetime_format"]
 
     def validate_data_type(self, value: str) -> str:
         """
@@ -39,6 +50,25 @@ class ColumnSerializer(serializers.ModelSerializer):
         return value
 
 
+def column_metadata(file_instance: File) -> list[dict]:
+    """
+    Serializes the columns of a sheet, through the cache of serialized columns.
+
+    Args:
+        file_instance (File): The sheet.
+
+    Returns:
+        list[dict]: The columns of the sheet as serialized by `ColumnSerializer`. They must not
+        be modified.
+    """
+    key = (file_instance.pk, file_instance.types_version)
+    columns = COLUMN_CACHE.get(key)
+    if columns is None:
+        columns = ColumnSerializer(file_instance.columns.all(), many=True).data
+        COLUMN_CACHE.put(key, columns)
+    return columns
+
+
 class FileSerializer(serializers.ModelSerializer):
     """
     Serializer for the File model.
@@ -54,9 +84,36 @@ class FileSerializer(serializers.ModelSerializer):
             "file_name",
             "number_of_records",
             "uploaded_at",
+            "state",
+            "content_hash",
             "columns",
         ]
-        read_only_fields = ["uploaded_at"]
+        read_only_fields = ["uploaded_at", "state", "content_hash"]
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the status of a Job.
+    """
+
+    number_of_records = serializers.IntegerField(
+        source="file.number_of_records", read_only=True
+    )
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "file",
+            "state",
+            "rows_processed",
+            "number_of_records",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
 
 
 class GetFileSerializer(serializers.ModelSerializer):
@@ -64,7 +121,7 @@ class GetFileSerializer(serializers.ModelSerializer):
     Serializer for the File model used for retrieving data.
     """
 
-    columns = ColumnSerializer(many=True, read_only=True)
+    columns = serializers.SerializerMethodField()
     rows = serializers.ListField(child=serializers.DictField(), read_only=True)
 
     class Meta:
@@ -80,6 +137,18 @@ class GetFileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["uploaded_at"]
 
+    def get_columns(self, instance: File) -> list[dict]:
+        """
+        Serializes the columns of the file, reusing them while their types are unchanged.
+
+        Args:
+            instance (File): The File instance to serialize.
+
+        Returns:
+            list[dict]: The serialized columns.
+        """
+        return column_metadata(instance)
+
     def to_representation(self, instance: File) -> dict[str, any]:
         """
         Custom representation method to include rows data.
@@ -90,38 +159,152 @@ class GetFileSerializer(serializers.ModelSerializer):
         Returns:
             dict[str, Any]: Serialized representation of the File instance.
         """
-        start_index = int(self.context.get("start_index", 0)) + 1
+        data = super().to_representation(instance)
+        page = self.read_page(instance, data.get("columns", []))
+        data["rows"] = records(page)
+        if self.context.get("filters"):
+            data["number_of_matches"] = page.attrs[NUMBER_OF_MATCHES]
+
+        return data
+
+    def read_page(
+        self, instance: File, columns_data: list[dict[str, str]]
+    ) -> pandas.DataFrame:
+        """
+        Reads the requested page of a file, typed as its columns.
+
+        Args:
+            instance (File): The File instance to read.
+            columns_data (list[dict[str, str]]): The columns of the file, each holding its
+                `name`, `data_type` and `datetime_format`.
+
+        Returns:
+            pandas.DataFrame: The records from `start_index` to `start_index + num_records`
+            of the columns in the `columns` context, or of every column. When the context
+            holds `filters` or `sort`, the records are those of the matching records in order,
+            and the number of matching records is kept in its `number_of_matches` attribute.
+        """
+        start_index = int(self.context.get("start_index", 0))
         num_records = int(self.context.get("num_records", None))
+        projection = self.context.get("columns")
+        filters = self.context.get("filters", [])
+        sort = self.context.get("sort", [])
 
-        data = super().to_representation(instance)
-        columns_data = data.get("columns", [])
+        column_types = {col["name"]: col["data_type"] for col in columns_data}
+        column_formats = {col["name"]: col["datetime_format"] for col in columns_data}
+        projected_types = (
+            {name: column_types[name] for name in projection}
+            if projection
+            else column_types
+        )
 
-        if instance.file.name.endswith(".csv"):
-            dataframe = pandas.read_csv(
-                instance.file,
-                nrows=num_records,
-                skiprows=start_index,
-                names=[col["name"] for col in columns_data],
+        if filters or sort:
+            dataframe, number_of_matches = query_sheet(
+                instance,
+                column_types,
+                column_formats,
+                filters,
+                sort,
+                start_index,
+                num_records,
+                list(projected_types.keys()),
+            )
+            dataframe.attrs[NUMBER_OF_MATCHES] = number_of_matches
+            return dataframe
+
+        cached = (
+            read_cached_sheet(instance, column_types, column_formats)
+            if instance.snapshot
+            else None
+        )
+        if cached is not None:
+            dataframe = cached.iloc[start_index : start_index + num_records]
+            dataframe = dataframe[list(projected_types.keys())]
+        elif instance.snapshot:
+            dataframe = read_snapshot(
+                instance, projected_types, start_index, num_records, column_formats
+            )
+        else:
+            dataframe = self.read_source(
+                instance,
+                column_types,
+                start_index,
+                num_records,
+                column_formats,
+                projection,
             )
+
+        return dataframe
+
+    @staticmethod
+    def read_source(
+        instance: File,
+        column_types: dict[str, str],
+        start_index: int,
+        num_records: int,
+        column_formats: dict[str, str] = {},
+        projection: list[str] | None = None,
+    ) -> pandas.DataFrame:
+        """
+        Reads and converts records straight from the uploaded file, for files without a snapshot.
+
+        Args:
+            instance (File): The File instance to read.
+            column_types (dict[str, str]): The column names mapped to their data types.
+            start_index (int): The index of the first record to read.
+            num_records (int): The number of records to read.
+            column_formats (dict[str, str]): The formats stored for the columns, if any.
+            projection (list[str] | None): The columns to convert and return. Defaults to all
+                of them.
+
+        Returns:
+            pandas.DataFrame: The requested records with their columns converted.
+        """
+        if instance.file.name.endswith(".csv"):
+            with instance.file.open("rb") as handle:
+                index_file(instance, handle)
+                if instance.row_offsets:
+                    dataframe = read_csv_page(
+                        handle,
+                        instance.row_offsets,
+                        instance.row_index_stride,
+                        list(column_types.keys()),
+                        start_index,
+                        num_records,
+                    )
+                else:
+                    dataframe = pandas.read_csv(
+                        handle,
+                        nrows=num_records,
+                        skiprows=start_index + 1,
+                        names=list(column_types.keys()),
+                    )
         else:
             dataframe = pandas.read_excel(
                 instance.file,
                 nrows=num_records,
-                skiprows=start_index,
-                names=[col["name"] for col in columns_data],
+                skiprows=start_index + 1,
+                names=list(column_types.keys()),
             )
 
-        dataframe = infer_and_convert_data_types(
-            dataframe,
-            {col["name"]: col["data_type"] for col in columns_data},
+        if projection:
+            dataframe = dataframe[projection]
+            column_types = {name: column_types[name] for name in projection}
+
+        return infer_and_convert_data_types(
+            dataframe, column_types, supplied_formats=column_formats
         )
 
-        dataframe = dataframe.where(dataframe.notnull())
-        # Convert all values to string for ease of serialization the recast is done to prove the functionaility
-        dataframe = dataframe.astype(str)
-        data["rows"] = dataframe.to_dict(orient="records")
 
-        return data
+class ColumnProfileSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the profiles of columns, computed when their file was uploaded.
+    """
+
+    class Meta:
+        model = Column
+        fields = ["id", "name", "data_type", "profile"]
+        read_only_fields = fields
 
 
 class SupportedTypesSerializer(serializers.Serializer):
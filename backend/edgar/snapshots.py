@@ -0,0 +1,681 @@
+import json
+from tempfile import TemporaryFile
+from typing import Generator, Iterable
+
+import numpy
+import pyarrow
+import pyarrow.parquet as parquet
+from django.conf import settings
+from django.core.files import File as DjangoFile
+from pandas import DataFrame, RangeIndex, Series
+from pandas.api.types import infer_dtype
+
+from edgar.conversions import convert_column
+from edgar.models import File
+
+"""
+Typed columnar snapshots of uploaded sheets.
+
+A snapshot is a single Parquet file per `File`, written once at upload time, one chunk of
+records at a time for uploads that are ingested in chunks. It holds two copies of every column:
+
+- the typed column, exactly as produced by type inference, stored under the column name.
+- the source column, as parsed from the uploaded file, stored under `SOURCE_PREFIX + name`.
+
+Pages are served from the typed columns, reading only the row groups that cover the page.
+Source columns are only read when a column has to be converted again, for instance after its
+type has been changed, or when the typed column could not be stored (e.g. complex numbers).
+"""
+
+SOURCE_PREFIX = "source:"
+TYPES_METADATA_KEY = b"edgar.types"
+
+ARROW_COMPATIBLE_OBJECTS = {
+    "string",
+    "empty",
+    "bytes",
+    "integer",
+    "floating",
+    "decimal",
+    "boolean",
+    "datetime",
+    "datetime64",
+    "date",
+    "timedelta",
+    "timedelta64",
+}
+
+
+def _is_storable(series: Series) -> bool:
+    """
+    Checks whether a column can be written to Parquet without losing its type.
+
+    Parameters:
+    - series (pandas.Series): The column to check.
+
+    Returns:
+    - bool: True if the column round trips through Arrow with the same dtype.
+    """
+    if series.dtype.kind == "c":
+        return False
+    if series.dtype.name == "category":
+        return infer_dtype(series.cat.categories) in ARROW_COMPATIBLE_OBJECTS
+    if series.dtype == object:
+        return infer_dtype(series, skipna=True) in ARROW_COMPATIBLE_OBJECTS
+    return True
+
+
+def storable_column(series: Series) -> Series:
+    """
+    Prepares a column for storage in Arrow, falling back to strings for columns Arrow cannot
+    hold, such as mixed columns or complex numbers.
+
+    Parameters:
+    - series (pandas.Series): The column.
+
+    Returns:
+    - pandas.Series: A column that can be written to Parquet or Arrow.
+    """
+    if _is_storable(series):
+        return series
+    return series.where(series.isna(), series.astype(str))
+
+
+def snapshot_frame(typed: DataFrame, source: DataFrame) -> DataFrame:
+    """
+    Builds the frame written to a snapshot from the typed and source frames.
+
+    Typed columns that cannot be stored faithfully are left out and are rebuilt from their
+    source column when read.
+
+    Parameters:
+    - typed (DataFrame): The DataFrame after type inference.
+    - source (DataFrame): The DataFrame as parsed from the uploaded file.
+
+    Returns:
+    - DataFrame: The combined frame of typed and source columns.
+    """
+    columns = {}
+    for name in typed.columns:
+        if _is_storable(typed[name]):
+            columns[name] = typed[name]
+    for name in source.columns:
+        columns[SOURCE_PREFIX + name] = storable_column(source[name])
+    return DataFrame(columns)
+
+
+def save_snapshot(file_instance: File, typed: DataFrame, source: DataFrame) -> None:
+    """
+    Writes a snapshot for a file and attaches it to the `File` record.
+
+    Parameters:
+    - file_instance (File): The file the snapshot belongs to.
+    - typed (DataFrame): The DataFrame after type inference.
+    - source (DataFrame): The DataFrame as parsed from the uploaded file.
+    """
+    save_snapshot_chunks(file_instance, [(typed, source)])
+
+
+def writable_type(field_type: pyarrow.DataType) -> pyarrow.DataType:
+    """
+    Widens the type of a column of the first chunk of a Parquet file to hold any later chunk.
+
+    Parameters:
+    - field_type (pyarrow.DataType): The type of the column in the first chunk.
+
+    Returns:
+    - pyarrow.DataType: Strings for nulls, dictionaries with 32-bit indices, and the type itself
+        otherwise.
+    """
+    if pyarrow.types.is_null(field_type):
+        return pyarrow.string()
+    if pyarrow.types.is_dictionary(field_type):
+        return pyarrow.dictionary(pyarrow.int32(), writable_type(field_type.value_type))
+    return field_type
+
+
+def _snapshot_schema(table: pyarrow.Table, typed: DataFrame) -> pyarrow.Schema:
+    """
+    Builds the schema of a snapshot from the table of its first chunk.
+
+    Columns holding only nulls in the first chunk are stored as strings, so later chunks can
+    hold values in them, and categories are stored with 32-bit indices, so later chunks can hold
+    more of them. The dtypes of the stored typed columns are kept in the metadata.
+
+    Parameters:
+    - table (pyarrow.Table): The table built from the first chunk.
+    - typed (DataFrame): The first chunk after type inference.
+
+    Returns:
+    - pyarrow.Schema: The schema every chunk of the snapshot is written with.
+    """
+    schema = table.schema
+    for index, field in enumerate(schema):
+        schema = schema.set(index, field.with_type(writable_type(field.type)))
+
+    stored_types = {
+        name: typed[name].dtype.name
+        for name in typed.columns
+        if name in table.column_names
+    }
+    return schema.with_metadata(
+        {
+            **(schema.metadata or {}),
+            TYPES_METADATA_KEY: json.dumps(stored_types).encode(),
+        }
+    )
+
+
+def save_snapshot_chunks(
+    file_instance: File, chunks: Iterable[tuple[DataFrame, DataFrame]]
+) -> None:
+    """
+    Writes a snapshot for a file chunk by chunk and attaches it to the `File` record.
+
+    Only one chunk is held in memory at a time. Every chunk must have the same columns and
+    dtypes as the first one.
+
+    Parameters:
+    - file_instance (File): The file the snapshot belongs to.
+    - chunks (Iterable[tuple[DataFrame, DataFrame]]): The chunks of the file, each as a pair of
+        the typed and the source DataFrame.
+    """
+    with TemporaryFile() as handle:
+        writer = None
+        try:
+            for typed, source in chunks:
+                frame = snapshot_frame(typed, source)
+                if writer is None:
+                    table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+                    schema = _snapshot_schema(table, typed)
+                    writer = parquet.ParquetWriter(handle, schema)
+
+                table = pyarrow.Table.from_pandas(
+                    frame[schema.names], schema=schema, preserve_index=False
+                )
+                writer.write_table(
+                    table, row_group_size=settings.EDGAR_SNAPSHOT_ROW_GROUP_SIZE
+                )
+        finally:
+            if writer is not None:
+                writer.close()
+
+        handle.seek(0)
+        file_instance.snapshot.save(
+            f"{file_instance.pk}.parquet", DjangoFile(handle), save=True
+        )
+
+
+def _stored_types(parquet_file: parquet.ParquetFile) -> dict[str, str]:
+    """
+    Reads the dtypes of the typed columns held in a snapshot.
+
+    Parameters:
+    - parquet_file (ParquetFile): The opened snapshot.
+
+    Returns:
+    - dict[str, str]: A mapping of column name to the stored dtype name.
+    """
+    metadata = parquet_file.schema_arrow.metadata or {}
+    return json.loads(metadata.get(TYPES_METADATA_KEY, b"{}"))
+
+
+def _row_groups_for(
+    parquet_file: parquet.ParquetFile, start_index: int, num_records: int
+) -> tuple[list[int], int]:
+    """
+    Finds the row groups that cover a range of records.
+
+    Parameters:
+    - parquet_file (ParquetFile): The opened snapshot.
+    - start_index (int): The index of the first record wanted.
+    - num_records (int): The number of records wanted.
+
+    Returns:
+    - tuple[list[int], int]: The row group indices, and the offset of `start_index` within the
+        first of those row groups.
+    """
+    metadata = parquet_file.metadata
+    stop_index = start_index + num_records
+    row_groups = []
+    offset = 0
+    first_row = 0
+
+    for index in range(metadata.num_row_groups):
+        group_rows = metadata.row_group(index).num_rows
+        last_row = first_row + group_rows
+        if last_row > start_index and first_row < stop_index:
+            if not row_groups:
+                offset = start_index - first_row
+            row_groups.append(index)
+        if last_row >= stop_index:
+            break
+        first_row = last_row
+
+    return row_groups, offset
+
+
+def read_snapshot(
+    file_instance: File,
+    column_types: dict[str, str],
+    start_index: int = 0,
+    num_records: int | None = None,
+    column_formats: dict[str, str] = {},
+) -> DataFrame:
+    """
+    Reads a range of records from a file's snapshot, typed as given by `column_types`.
+
+    Only the row groups covering the range are read. Typed columns are used as stored, while
+    columns whose stored type differs from the requested one are converted from their source
+    column.
+
+    Parameters:
+    - file_instance (File): The file to read.
+    - column_types (dict[str, str]): The columns to read mapped to their data type.
+    - start_index (int): The index of the first record to read.
+    - num_records (Optional[int]): The number of records to read. Defaults to all records.
+    - column_formats (dict[str, str]): The formats stored for the columns whose conversion takes
+        one, so converted columns are parsed with them rather than detecting them again.
+
+    Returns:
+    - DataFrame: The requested records with their columns typed.
+    """
+    with file_instance.snapshot.open("rb") as handle:
+        parquet_file = parquet.ParquetFile(handle)
+        if num_records is None:
+            num_records = parquet_file.metadata.num_rows
+        projection, converted = _projection(parquet_file, column_types)
+
+        row_groups, offset = _row_groups_for(parquet_file, start_index, num_records)
+        table = parquet_file.read_row_groups(row_groups, columns=projection)
+
+    return _typed_frame(
+        table.slice(offset, num_records), column_types, converted, column_formats
+    )
+
+
+def iter_snapshot(
+    file_instance: File,
+    column_types: dict[str, str],
+    column_formats: dict[str, str] = {},
+    row_groups: Iterable[int] | None = None,
+) -> Generator[DataFrame, None, None]:
+    """
+    Reads every record of a file's snapshot one row group at a time, typed as given by
+    `column_types`.
+
+    Parameters:
+    - file_instance (File): The file to read.
+    - column_types (dict[str, str]): The columns to read mapped to their data type.
+    - column_formats (dict[str, str]): The formats stored for the columns whose conversion takes
+        one.
+    - row_groups (Optional[Iterable[int]]): The indices of the row groups to read. Defaults to
+        all of them.
+
+    Yields:
+    - DataFrame: The records of each row group with their columns typed, indexed by their
+        position in the sheet.
+    """
+    with file_instance.snapshot.open("rb") as handle:
+        parquet_file = parquet.ParquetFile(handle)
+        projection, converted = _projection(parquet_file, column_types)
+        starts = _row_group_starts(parquet_file)
+        if row_groups is None:
+            row_groups = range(parquet_file.metadata.num_row_groups)
+
+        for index in row_groups:
+            table = parquet_file.read_row_group(index, columns=projection)
+            dataframe = _typed_frame(table, column_types, converted, column_formats)
+            dataframe.index = RangeIndex(starts[index], starts[index + 1])
+            yield dataframe
+
+
+def read_snapshot_rows(
+    file_instance: File,
+    column_types: dict[str, str],
+    positions: Iterable[int],
+    column_formats: dict[str, str] = {},
+) -> DataFrame:
+    """
+    Reads records of a file's snapshot by their position, typed as given by `column_types`.
+
+    Only the row groups holding the records are read, and only the records are converted.
+
+    Parameters:
+    - file_instance (File): The file to read.
+    - column_types (dict[str, str]): The columns to read mapped to their data type.
+    - positions (Iterable[int]): The positions of the records in the sheet, in the order they
+        are wanted.
+    - column_formats (dict[str, str]): The formats stored for the columns whose conversion takes
+        one.
+
+    Returns:
+    - DataFrame: The records in the order of `positions`, indexed from zero.
+    """
+    positions = numpy.asarray(positions, dtype="int64")
+    with file_instance.snapshot.open("rb") as handle:
+        parquet_file = parquet.ParquetFile(handle)
+        projection, converted = _projection(parquet_file, column_types)
+        starts = _row_group_starts(parquet_file)
+        groups = numpy.searchsorted(starts, positions, side="right") - 1
+        row_groups = numpy.unique(groups)
+        table = parquet_file.read_row_groups(row_groups.tolist(), columns=projection)
+
+    # The position of the first record of each row group read within the records read.
+    sizes = starts[row_groups + 1] - starts[row_groups]
+    read_starts = numpy.cumsum(sizes) - sizes
+    offsets = (
+        positions - starts[groups] + read_starts[numpy.searchsorted(row_groups, groups)]
+    )
+    return _typed_frame(table.take(offsets), column_types, converted, column_formats)
+
+
+def _row_group_starts(parquet_file: parquet.ParquetFile) -> numpy.ndarray:
+    """
+    Finds the position in the sheet of the first record of each row group.
+
+    Parameters:
+    - parquet_file (ParquetFile): The opened snapshot.
+
+    Returns:
+    - numpy.ndarray: The position of the first record of each row group, followed by the
+        number of records.
+    """
+    metadata = parquet_file.metadata
+    sizes = [
+        metadata.row_group(index).num_rows for index in range(metadata.num_row_groups)
+    ]
+    return numpy.concatenate([[0], numpy.cumsum(sizes, dtype="int64")]).astype("int64")
+
+
+def row_group_statistics(
+    file_instance: File, column_types: dict[str, str]
+) -> list[tuple[int, dict[str, tuple]]]:
+    """
+    Reads the statistics Parquet records for each row group of a file's snapshot.
+
+    Only typed columns stored as their requested type are described, since the statistics of
+    the other columns describe values they are not read as.
+
+    Parameters:
+    - file_instance (File): The file to describe.
+    - column_types (dict[str, str]): The columns to describe mapped to their data type.
+
+    Returns:
+    - list[tuple[int, dict[str, tuple]]]: For each row group, its number of records and its
+        columns mapped to their minimum, maximum and number of missing values. The minimum and
+        maximum are None when they were not recorded.
+    """
+    with file_instance.snapshot.open("rb") as handle:
+        parquet_file = parquet.ParquetFile(handle)
+        _, converted = _projection(parquet_file, column_types)
+        metadata = parquet_file.metadata
+        indices = {
+            metadata.schema.column(index).path: index
+            for index in range(metadata.num_columns)
+        }
+
+        statistics = []
+        for index in range(metadata.num_row_groups):
+            row_group = metadata.row_group(index)
+            columns = {}
+            for name in column_types.keys():
+                if name in converted or name not in indices:
+                    continue
+                column_statistics = row_group.column(indices[name]).statistics
+                if column_statistics is None:
+                    continue
+                if column_statistics.has_min_max:
+                    bounds = (column_statistics.min, column_statistics.max)
+                else:
+                    bounds = (None, None)
+                columns[name] = (*bounds, column_statistics.null_count)
+            statistics.append((row_group.num_rows, columns))
+
+    return statistics
+
+
+def converted_columns(file_instance: File, column_types: dict[str, str]) -> list[str]:
+    """
+    Finds the columns of a file's snapshot whose typed column is not stored as requested.
+
+    Parameters:
+    - file_instance (File): The file to read.
+    - column_types (dict[str, str]): The columns to read mapped to their data type.
+
+    Returns:
+    - list[str]: The columns that have to be converted from their source column.
+    """
+    with file_instance.snapshot.open("rb") as handle:
+        _, converted = _projection(parquet.ParquetFile(handle), column_types)
+    return converted
+
+
+def _projection(
+    parquet_file: parquet.ParquetFile, column_types: dict[str, str]
+) -> tuple[list[str], list[str]]:
+    """
+    Finds the stored columns to read for a set of columns and types.
+
+    Parameters:
+    - parquet_file (ParquetFile): The opened snapshot.
+    - column_types (dict[str, str]): The columns to read mapped to their data type.
+
+    Returns:
+    - tuple[list[str], list[str]]: The stored columns to read, and the columns whose stored type
+        differs from the requested one, which are read from their source column.
+    """
+    stored_types = _stored_types(parquet_file)
+    converted = [
+        name
+        for name, data_type in column_types.items()
+        if stored_types.get(name) != data_type
+    ]
+    projection = [
+        SOURCE_PREFIX + name if name in converted else name
+        for name in column_types.keys()
+    ]
+    return projection, converted
+
+
+def _typed_frame(
+    table: pyarrow.Table,
+    column_types: dict[str, str],
+    converted: list[str],
+    column_formats: dict[str, str],
+) -> DataFrame:
+    """
+    Converts records read from a snapshot to a DataFrame typed as given by `column_types`.
+
+    Parameters:
+    - table (pyarrow.Table): The records, as read with the projection of `_projection`.
+    - column_types (dict[str, str]): The columns read mapped to their data type.
+    - converted (list[str]): The columns read from their source column.
+    - column_formats (dict[str, str]): The formats stored for the converted columns, if any.
+
+    Returns:
+    - DataFrame: The records with their columns typed.
+    """
+    dataframe = table.to_pandas()
+    for name, data_type in column_types.items():
+        # Parquet only keeps dictionaries of strings, so other categories are read back plain.
+        if data_type == "category" and name not in converted:
+            dataframe[name] = dataframe[name].astype("category")
+    for name in converted:
+        dataframe[name] = convert_column(
+            dataframe.pop(SOURCE_PREFIX + name),
+            column_types[name],
+            force=True,
+            format=column_formats.get(name, ""),
+        )
+
+    return dataframe[list(column_types.keys())]
+
+
+def typed_size(file_instance: File) -> int:
+    """
+    Estimates the size of the typed columns of a file's snapshot, once read.
+
+    Parameters:
+    - file_instance (File): The file to estimate.
+
+    Returns:
+    - int: The uncompressed size in bytes of the typed columns, as recorded in the footer.
+    """
+    with file_instance.snapshot.open("rb") as handle:
+        metadata = parquet.ParquetFile(handle).metadata
+
+    size = 0
+    for index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(index)
+        for column_index in range(row_group.num_columns):
+            column = row_group.column(column_index)
+            if not column.path_in_schema.startswith(SOURCE_PREFIX):
+                size += column.total_uncompressed_size
+    return size
+
+
+def read_source_column(file_instance: File, name: str) -> Series:
+    """
+    Reads a whole source column from a file's snapshot.
+
+    Parameters:
+    - file_instance (File): The file to read.
+    - name (str): The name of the column.
+
+    Returns:
+    - pandas.Series: The column as parsed from the uploaded file.
+    """
+    return read_source_columns(file_instance, [name])[name]
+
+
+def read_source_columns(file_instance: File, names: list[str]) -> DataFrame:
+    """
+    Reads whole source columns from a file's snapshot.
+
+    Parameters:
+    - file_instance (File): The file to read.
+    - names (list[str]): The names of the columns.
+
+    Returns:
+    - DataFrame: The columns as parsed from the uploaded file.
+    """
+    with file_instance.snapshot.open("rb") as handle:
+        table = parquet.read_table(
+            handle, columns=[SOURCE_PREFIX + name for name in names]
+        )
+
+    return table.to_pandas().set_axis(names, axis=1)
+
+
+def _typed_column(
+    name: str, converted: Series
+) -> tuple[pyarrow.Field, pyarrow.Array, dict]:
+    """
+    Prepares a converted column to be stored as a typed column.
+
+    Parameters:
+    - name (str): The name of the column.
+    - converted (pandas.Series): The converted column.
+
+    Returns:
+    - tuple[pyarrow.Field, pyarrow.Array, dict]: The field of the column, its values, and the
+        pandas metadata the column is read back with.
+    """
+    table = pyarrow.Table.from_pandas(
+        DataFrame({name: converted.reset_index(drop=True)}), preserve_index=False
+    )
+    field = table.schema.field(0)
+    field = field.with_type(writable_type(field.type))
+    values = table.column(0).cast(field.type).combine_chunks()
+    return field, values, table.schema.pandas_metadata["columns"][0]
+
+
+def replace_typed_columns(file_instance: File, converted: dict[str, Series]) -> str:
+    """
+    Writes a copy of a file's snapshot with some of its typed columns replaced.
+
+    The other columns are copied one row group at a time as they are stored, without being
+    converted, so only the replaced columns are held in memory. Converted columns that cannot
+    be stored are left out, and are converted from their source column when read. The copy is
+    written next to the snapshot, which is left untouched, so it can be swapped in atomically
+    with the types of the columns.
+
+    Parameters:
+    - file_instance (File): The file whose snapshot to copy.
+    - converted (dict[str, pandas.Series]): The columns to replace, converted to their new type.
+
+    Returns:
+    - str: The name of the copy in the storage of the snapshots.
+    """
+    replacements = {
+        name: _typed_column(name, column)
+        for name, column in converted.items()
+        if _is_storable(column)
+    }
+
+    with file_instance.snapshot.open("rb") as source, TemporaryFile() as handle:
+        parquet_file = parquet.ParquetFile(source)
+        stored_types = _stored_types(parquet_file)
+        pandas_metadata = parquet_file.schema_arrow.pandas_metadata
+        names = [
+            name
+            for name in parquet_file.schema_arrow.names
+            if name not in converted or name in replacements
+        ]
+        names += [name for name in replacements if name not in names]
+
+        fields, columns_metadata = [], []
+        by_name = {column["name"]: column for column in pandas_metadata["columns"]}
+        for name in names:
+            if name in replacements:
+                field, _, column_metadata = replacements[name]
+                stored_types[name] = converted[name].dtype.name
+            else:
+                field = parquet_file.schema_arrow.field(name)
+                column_metadata = by_name[name]
+            fields.append(field)
+            columns_metadata.append(column_metadata)
+        for name in converted:
+            if name not in replacements:
+                stored_types.pop(name, None)
+
+        schema = pyarrow.schema(
+            fields,
+            metadata={
+                **parquet_file.schema_arrow.metadata,
+                b"pandas": json.dumps(
+                    {**pandas_metadata, "columns": columns_metadata}
+                ).encode(),
+                TYPES_METADATA_KEY: json.dumps(stored_types).encode(),
+            },
+        )
+
+        with parquet.ParquetWriter(handle, schema) as writer:
+            first_row = 0
+            for index in range(parquet_file.metadata.num_row_groups):
+                table = parquet_file.read_row_group(
+                    index, columns=[name for name in names if name not in replacements]
+                )
+                arrays = [
+                    (
+                        replacements[name][1].slice(first_row, table.num_rows)
+                        if name in replacements
+                        else table.column(name)
+                    )
+                    for name in names
+                ]
+                writer.write_table(
+                    pyarrow.Table.from_arrays(arrays, schema=schema),
+                    row_group_size=max(table.num_rows, 1),
+                )
+                first_row += table.num_rows
+
+        handle.seek(0)
+        storage = file_instance.snapshot.storage
+        return storage.save(
+            file_instance.snapshot.field.generate_filename(
+                file_instance, f"{file_instance.pk}.parquet"
+            ),
+            DjangoFile(handle),
+        )
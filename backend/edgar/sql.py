@@ -0,0 +1,211 @@
+from threading import Timer
+
+import pyarrow.dataset
+from django.conf import settings
+from pandas import DataFrame
+
+from edgar.models import File
+from edgar.snapshots import SOURCE_PREFIX, converted_columns
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+"""
+Read-only SQL queries over the snapshots of sheets, run by DuckDB.
+
+DuckDB is an optional dependency: without it, `query_sql` is unavailable and `AVAILABLE` is
+False. A query sees the sheet as a single table, `sheet`, whose columns are typed as given by
+their `Column.data_type`. The snapshot is scanned in place, so only the row groups and columns a
+query needs are read, the scan and aggregations run on `EDGAR_SQL_THREADS` threads, and a query
+that does not fit in `EDGAR_SQL_MEMORY_LIMIT` spills to disk rather than building a DataFrame of
+the sheet. A query still running after `EDGAR_SQL_TIMEOUT` seconds is interrupted.
+
+DuckDB scans snapshots from the local file system, so sheets whose snapshots are kept by a
+storage without local paths cannot be queried.
+
+Typed columns are read as stored. Columns whose stored type differs from their data type are
+cast from their source column by DuckDB, missing where a value does not cast. The view is built
+from a relation over the snapshot rather than from a registered table, so the snapshot as stored,
+with its source columns, cannot be queried by name.
+
+Only a single SELECT statement is run, and access to files other than the snapshot is
+disabled before it runs, so a query cannot change the sheet or read anything else.
+"""
+
+AVAILABLE = duckdb is not None
+TABLE_NAME = "sheet"
+
+
+class QueryTimeout(Exception):
+    """
+    Raised when a SQL query is interrupted for running longer than `EDGAR_SQL_TIMEOUT`.
+    """
+
+
+SQL_TYPES = {
+    "bool": "BOOLEAN",
+    "boolean": "BOOLEAN",
+    "int8": "TINYINT",
+    "int16": "SMALLINT",
+    "int32": "INTEGER",
+    "int64": "BIGINT",
+    "float32": "FLOAT",
+    "float64": "DOUBLE",
+    "timedelta64[ns]": "INTERVAL",
+    "datetime64[ns]": "TIMESTAMP",
+}
+
+
+def sql_type(data_type: str) -> str:
+    """
+    Maps the data type of a column to the DuckDB type it is queried as.
+
+    Parameters:
+    - data_type (str): The data type of the column.
+
+    Returns:
+    - str: The DuckDB type. Categories, objects, strings and complex numbers are queried as
+        text.
+    """
+    return SQL_TYPES.get(data_type.lower(), "VARCHAR")
+
+
+def _identifier(name: str) -> str:
+    """
+    Quotes a column name for use in SQL.
+
+    Parameters:
+    - name (str): The column name.
+
+    Returns:
+    - str: The quoted name.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_expression(
+    name: str, data_type: str, converted: bool, datetime_format: str
+) -> str:
+    """
+    Builds the expression reading a column of a snapshot as its data type.
+
+    Parameters:
+    - name (str): The name of the column.
+    - data_type (str): The data type of the column.
+    - converted (bool): Whether the column is read from its source column.
+    - datetime_format (str): The format stored for the column, if any.
+
+    Returns:
+    - str: The expression, aliased as the column.
+    """
+    target = sql_type(data_type)
+    if not converted:
+        expression = f"CAST({_identifier(name)} AS {target})"
+    else:
+        source = _identifier(SOURCE_PREFIX + name)
+        if target == "TIMESTAMP" and datetime_format:
+            literal = datetime_format.replace("'", "''")
+            expression = f"try_strptime(CAST({source} AS VARCHAR), '{literal}')"
+        else:
+            expression = f"TRY_CAST({source} AS {target})"
+    return f"{expression} AS {_identifier(name)}"
+
+
+def is_queryable(file_instance: File) -> bool:
+    """
+    Checks whether the snapshot of a file can be scanned by DuckDB.
+
+    Parameters:
+    - file_instance (File): The file to query, which must have a snapshot.
+
+    Returns:
+    - bool: Whether the storage of the snapshot keeps it at a local path.
+    """
+    try:
+        file_instance.snapshot.path
+    except NotImplementedError:
+        return False
+    return True
+
+
+def _connect(
+    file_instance: File, columns_data: list[dict]
+) -> "duckdb.DuckDBPyConnection":
+    """
+    Opens an in-memory DuckDB database holding the sheet of a file as the table `sheet`.
+
+    Parameters:
+    - file_instance (File): The file to query, which must have a snapshot.
+    - columns_data (list[dict]): The columns of the file, each holding its `name`,
+        `data_type` and `datetime_format`.
+
+    Returns:
+    - duckdb.DuckDBPyConnection: The connection, with its configuration locked.
+    """
+    column_types = {column["name"]: column["data_type"] for column in columns_data}
+    converted = converted_columns(file_instance, column_types)
+    expressions = ", ".join(
+        _column_expression(
+            column["name"],
+            column["data_type"],
+            column["name"] in converted,
+            column["datetime_format"],
+        )
+        for column in columns_data
+    )
+
+    connection = duckdb.connect()
+    connection.execute("SET TimeZone = 'UTC'")
+    connection.execute(f"SET memory_limit = '{settings.EDGAR_SQL_MEMORY_LIMIT}'")
+    connection.execute(f"SET threads = {int(settings.EDGAR_SQL_THREADS)}")
+    connection.from_arrow(
+        pyarrow.dataset.dataset(file_instance.snapshot.path, format="parquet")
+    ).project(expressions).create_view(TABLE_NAME)
+    connection.execute("SET enable_external_access = false")
+    connection.execute("SET lock_configuration = true")
+    return connection
+
+
+def query_sql(
+    file_instance: File, columns_data: list[dict], query: str
+) -> tuple[DataFrame, bool]:
+    """
+    Runs a read-only SQL query over the sheet of a file.
+
+    Parameters:
+    - file_instance (File): The file to query, which must have a snapshot.
+    - columns_data (list[dict]): The columns of the file, each holding its `name`,
+        `data_type` and `datetime_format`.
+    - query (str): A single SELECT statement, reading the sheet as the table `sheet`.
+
+    Returns:
+    - tuple[DataFrame, bool]: The first `EDGAR_SQL_MAX_ROWS` records of the result, and whether
+        the result held more.
+
+    Raises:
+    - ValueError: If the query is not a single SELECT statement, or DuckDB rejects it.
+    - QueryTimeout: If the query runs longer than `EDGAR_SQL_TIMEOUT` seconds.
+    """
+    connection = _connect(file_instance, columns_data)
+    timer = Timer(settings.EDGAR_SQL_TIMEOUT, connection.interrupt)
+    try:
+        statements = connection.extract_statements(query)
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            raise ValueError("Only a single SELECT statement can be run.")
+
+        timer.start()
+        result = connection.sql(query).limit(settings.EDGAR_SQL_MAX_ROWS + 1).df()
+    except duckdb.InterruptException:
+        raise QueryTimeout(
+            f"The query was interrupted after {settings.EDGAR_SQL_TIMEOUT} seconds."
+        )
+    except duckdb.Error as e:
+        raise ValueError(str(e))
+    finally:
+        timer.cancel()
+        connection.close()
+
+    truncated = len(result) > settings.EDGAR_SQL_MAX_ROWS
+    return result.iloc[: settings.EDGAR_SQL_MAX_ROWS], truncated
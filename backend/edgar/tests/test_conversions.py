@@ -1,7 +1,16 @@
 from django.test import TestCase
 from pandas import Series
 import pandas
-from edgar.conversions import FUNCTION_LOOKUP
+from edgar.conversions import (
+    DISTINCT_BLOCK_SIZE,
+    FORMAT,
+    FUNCTION_LOOKUP,
+    count_distinct,
+    detect_datetime_format,
+    parse_numbers,
+    parse_supported_none_values,
+    supported_none_mask,
+)
 from parameterized import parameterized
 from pandas.testing import assert_series_equal
 import unittest
@@ -44,6 +53,11 @@ invalid_conversion_cases = [
         "complex128",
         Series(["1.5+2j", "text", None]),
     ),
+    ("complex128", Series(["1 + 2j"])),
+    ("complex128", Series(["1+-2j"])),
+    ("complex128", Series(["1+2"])),
+    ("complex128", Series([1.5])),
+    ("boolean", Series(["yes", 1.0])),
     (
         "timedelta64[ns]",
         Series(["1:00:00", "text", None]),
@@ -56,6 +70,10 @@ invalid_conversion_cases = [
         "category",
         Series(["a", "b", "c"]),
     ),
+    ("bool", Series([True, False, None])),
+    ("int8", Series([1, None, 3])),
+    ("Int8", Series([1, None, 128])),
+    ("Float32", Series([0.1, None])),
     (
         "bool",
         Series(["foo", "false", "True", "False", 1, 0]),
@@ -117,6 +135,11 @@ valid_conversion_test_cases = [
             [complex("1.5+2j"), complex("3.5-4j"), complex("5+6j")], dtype="complex128"
         ),
     ),
+    (
+        "complex128",
+        Series([" 1+j", "-.5-2.j", "NA"]),
+        Series([complex(1, 1), complex(-0.5, -2), complex("nan+nanj")]),
+    ),
     (
         "timedelta64[ns]",
         Series(["1 days", "2 days", "3 days"]),
@@ -241,9 +264,24 @@ valid_conversion_test_cases = [
     ),
     ("bool", Series([True, False]), Series([True, False], dtype="bool")),
     (
-        "bool",
+        "boolean",
         Series([True, False, None]),
-        Series([True, False, None], dtype="bool"),
+        Series([True, False, None], dtype="boolean"),
+    ),
+    (
+        "boolean",
+        Series(["yes", "NA", "no"]),
+        Series([True, None, False], dtype="boolean"),
+    ),
+    ("Int8", Series([1, None, -128]), Series([1, None, -128], dtype="Int8")),
+    ("Int16", Series(["300", "n/a"]), Series([300, None], dtype="Int16")),
+    ("Int64", Series([2**62, None]), Series([2**62, None], dtype="Int64")),
+    ("Float32", Series([0.5, None]), Series([0.5, None], dtype="Float32")),
+    ("Float64", Series(["0.1", "null"]), Series([0.1, None], dtype="Float64")),
+    (
+        "string",
+        Series(["foo", "none", None]),
+        Series(["foo", None, None], dtype="string[pyarrow]"),
     ),
     (
         "bool",
@@ -313,5 +351,184 @@ class TestConversionFunctions(TestCase):
         assert_series_equal(result, expected_output)
 
 
+none_value_test_cases = [
+    (
+        Series(["a", "NA", "None", None, "-999", "Not Available"]),
+        Series(["a", None, None, None, None, None]),
+    ),
+    (Series([1, 2, -999]), Series([1, 2, None], dtype="float64")),
+    (Series([1.5, None]), Series([1.5, None], dtype="float64")),
+    (Series([1, "N/A", "2"]), Series([1, None, "2"])),
+    (Series([True, False]), Series([True, False])),
+]
+
+
+class TestSupportedNoneValues(TestCase):
+    """
+    A test suite for parsing the supported None types.
+    """
+
+    @parameterized.expand(none_value_test_cases)
+    def test_parse_supported_none_values(self, series, expected_output):
+        """
+        Tests that supported None types are replaced by None, whatever their capitalization.
+
+        Parameters:
+            series (Series): The input series to be parsed.
+            expected_output (Series): The expected output series after parsing.
+
+        """
+        assert_series_equal(parse_supported_none_values(series), expected_output)
+
+    def test_mask_is_shared(self):
+        """
+        Tests that the mask of a column is computed once and shared between conversions.
+        """
+        series = Series(["1", "null", "3"])
+
+        self.assertIs(supported_none_mask(series), supported_none_mask(series))
+        self.assertIs(
+            parse_supported_none_values(series), parse_supported_none_values(series)
+        )
+
+
+class TestNumericConversions(TestCase):
+    """
+    A test suite for the parse shared by the integer and float conversions.
+    """
+
+    def test_parse_is_shared(self):
+        """
+        Tests that the numeric conversions tried on a column share a single parse of each kind.
+        """
+        series = Series(["1", "null", "300"])
+
+        parsed, values, missing = parse_numbers(series, "float")
+        self.assertIs(parse_numbers(series, "float")[1], values)
+        self.assertEqual(missing.tolist(), [False, True, False])
+        with self.assertRaises(ValueError):
+            FUNCTION_LOOKUP["int16"](series)
+
+    @parameterized.expand(
+        [
+            (Series(["-128", "127"]), "int8"),
+            (Series(["-129", "127"]), "int16"),
+            (Series([1.9, 32768.5]), "int32"),
+            (Series(["2147483648"]), "int64"),
+            (Series(["0.5", "0.25"]), "float32"),
+            (Series(["0.1", "0.25"]), "float64"),
+        ]
+    )
+    def test_narrowest_type(self, series, expected_type):
+        """
+        Tests that the narrowest type holding the range of a column is the first to succeed.
+
+        Parameters:
+            series (Series): The input series to be converted.
+            expected_type (str): The first type the series converts to.
+
+        """
+        types = ["int8", "int16", "int32", "int64", "float32", "float64"]
+        succeeded = []
+        for type_name in types:
+            try:
+                FUNCTION_LOOKUP[type_name](series)
+                succeeded.append(type_name)
+            except ValueError:
+                pass
+
+        self.assertEqual(succeeded[0], expected_type)
+
+    def test_out_of_range_floats(self):
+        """
+        Tests that floats beyond the range of int64 are rejected rather than wrapped around.
+        """
+        with self.assertRaises(ValueError):
+            FUNCTION_LOOKUP["int64"](Series([1e300]), force=True)
+
+
+class TestCountDistinct(TestCase):
+    """
+    A test suite for counting distinct values with an early exit.
+    """
+
+    @parameterized.expand(
+        [
+            (Series(["a", "b", "a", None, None]), 3, 3),
+            (Series([1, 2, 2, 1]), 2, 2),
+            (Series([], dtype="object"), 0, 0),
+        ]
+    )
+    def test_exact_count(self, series, limit, expected):
+        """
+        Tests that the count is exact when it does not pass the limit.
+
+        Parameters:
+            series (Series): The input series to count.
+            limit (int): The number of distinct values beyond which counting stops.
+            expected (int): The number of distinct values.
+
+        """
+        self.assertEqual(count_distinct(series, limit), expected)
+
+    def test_early_exit(self):
+        """
+        Tests that counting stops once the limit is passed, without reading the whole column.
+        """
+        series = Series(range(3 * DISTINCT_BLOCK_SIZE))
+
+        self.assertEqual(count_distinct(series, 10), DISTINCT_BLOCK_SIZE)
+        self.assertEqual(
+            count_distinct(series, DISTINCT_BLOCK_SIZE), DISTINCT_BLOCK_SIZE + 1
+        )
+
+
+class TestDatetimeFormat(TestCase):
+    """
+    A test suite for detecting datetime formats and parsing with them.
+    """
+
+    @parameterized.expand(
+        [
+            (Series(["2024-03-19", "2023-12-01"]), "%Y-%m-%d"),
+            (Series([None, "", "19/03/2024 12:30:45"]), "%d/%m/%Y %H:%M:%S"),
+            (Series(["foo", "2024-03-19"]), None),
+            (Series([1, "2024-03-19"]), None),
+            (Series([1.5, 2.5]), None),
+        ]
+    )
+    def test_detect_datetime_format(self, series, expected_format):
+        """
+        Tests that the format is guessed from the first value that is not missing.
+
+        Parameters:
+            series (Series): The input series to detect the format of.
+            expected_format (str): The format expected to be detected.
+
+        """
+        self.assertEqual(detect_datetime_format(series), expected_format)
+
+    def test_format_is_recorded(self):
+        """
+        Tests that the format a column was parsed with is recorded on the converted column.
+        """
+        result = FUNCTION_LOOKUP["datetime64[ns]"](Series(["03/19/2024", "12/01/2023"]))
+
+        self.assertEqual(result.attrs[FORMAT], "%m/%d/%Y")
+        self.assertEqual(result.dt.month.tolist(), [3, 12])
+
+    def test_given_format_is_strict(self):
+        """
+        Tests that a given format is used instead of detecting one, and that values written in
+        another format are rejected.
+        """
+        series = Series(["01/02/2024", "03/04/2024"])
+        result = FUNCTION_LOOKUP["datetime64[ns]"](series, format="%d/%m/%Y")
+
+        self.assertEqual(result.dt.month.tolist(), [2, 4])
+        with self.assertRaises(ValueError):
+            FUNCTION_LOOKUP["datetime64[ns]"](series, format="%Y-%m-%d")
+
+
 if __name__ == "__main__":
     unittest.main()
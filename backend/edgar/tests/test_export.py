@@ -0,0 +1,97 @@
+import pyarrow
+import pyarrow.parquet
+from io import BytesIO
+from tempfile import mkdtemp
+from pandas import DataFrame
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from edgar.export import CSV, PARQUET, _parquet, export_sheet
+from edgar.ingest import ingest_file
+from edgar.metadata import COLUMN_CACHE
+from edgar.models import READY, File
+from edgar.retype import retype_column
+import unittest
+
+
+@override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_SNAPSHOT_ROW_GROUP_SIZE=2)
+class TestExport(TestCase):
+    """
+    Test cases for the streaming exports of sheets.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up an empty cache of columns, as ids of sheets are reused between tests.
+        """
+        COLUMN_CACHE.clear()
+
+    def ingest(self, content: bytes) -> File:
+        """
+        Ingests a CSV upload into a ready sheet.
+        """
+        file_instance = File.objects.create(
+            file=SimpleUploadedFile("export.csv", content),
+            file_name="export",
+            state=READY,
+        )
+        ingest_file(file_instance)
+        return file_instance
+
+    def export_parquet(self, file_instance: File) -> pyarrow.Table:
+        """
+        Exports a sheet as Parquet and reads the file back.
+        """
+        return pyarrow.parquet.read_table(
+            BytesIO(b"".join(export_sheet(file_instance, PARQUET)))
+        )
+
+    def test_null_in_first_chunk(self) -> None:
+        """
+        Test that columns holding only nulls in the first chunk are written with their types.
+        """
+        file_instance = self.ingest(
+            b"Name,Note,Rank\nAlice,,\nBob,,\nCharlie,late,3\nDavid,,4\n"
+        )
+        retype_column(
+            file_instance.columns.select_related("file").get(name="Rank"), "category"
+        )
+
+        table = self.export_parquet(file_instance)
+
+        for name in ["Note", "Rank"]:
+            self.assertEqual(
+                table.schema.field(name).type,
+                pyarrow.dictionary(pyarrow.int32(), pyarrow.string()),
+            )
+        self.assertEqual(table.column("Note").to_pylist(), [None, None, "late", None])
+        self.assertEqual(table.column("Rank").to_pylist(), [None, None, "3", "4"])
+
+    def test_values_unlike_first_chunk(self) -> None:
+        """
+        Test that objects of another type than those of the first chunk are written rather
+        than cutting the file short.
+        """
+        chunks = [DataFrame({"Code": [1, 2]}), DataFrame({"Code": ["A1", None]})]
+
+        table = pyarrow.parquet.read_table(
+            BytesIO(b"".join(_parquet(chunks, {"Code": "object"})))
+        )
+
+        self.assertEqual(table.column("Code").to_pylist(), ["1", "2", "A1", None])
+
+    def test_empty_sheet(self) -> None:
+        """
+        Test that a sheet without records is exported with its columns.
+        """
+        file_instance = self.ingest(b"Name,Score\n")
+        column_types = dict(file_instance.columns.values_list("name", "data_type"))
+
+        table = self.export_parquet(file_instance)
+
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.column_names, list(column_types))
+        self.assertEqual(b"".join(export_sheet(file_instance, CSV)), b"Name,Score\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import pandas as pd
+from tempfile import mkdtemp
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from edgar import frame_cache
+from edgar.frame_cache import FRAME_CACHE, FrameCache, read_cached_sheet
+from edgar.ingest import ingest_file
+from edgar.models import File
+from edgar.snapshots import typed_size
+import unittest
+
+
+class TestFrameCache(TestCase):
+    """
+    Test cases for the least recently used cache of typed DataFrames.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up frames of a known size, and a cache holding two of them.
+        """
+        self.frames = {key: pd.DataFrame({"a": range(100)}) for key in "xyz"}
+        size = int(self.frames["x"].memory_usage(index=True, deep=True).sum())
+        self.cache = FrameCache(max_bytes=2 * size)
+
+    def test_get(self) -> None:
+        """
+        Test that stored frames are found and that lookups are counted.
+        """
+        self.assertIsNone(self.cache.get("x"))
+        self.cache.put("x", self.frames["x"])
+
+        self.assertIs(self.cache.get("x"), self.frames["x"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used(self) -> None:
+        """
+        Test that the least recently used frame is evicted once the cache is full.
+        """
+        self.cache.put("x", self.frames["x"])
+        self.cache.put("y", self.frames["y"])
+        self.cache.get("x")
+        self.cache.put("z", self.frames["z"])
+
+        self.assertIsNone(self.cache.get("y"))
+        self.assertIsNotNone(self.cache.get("x"))
+        self.assertIsNotNone(self.cache.get("z"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertEqual(self.cache.stats()["bytes"], self.cache.max_bytes)
+
+    def test_rejects_oversized_frame(self) -> None:
+        """
+        Test that a frame larger than the cache is not stored and evicts nothing.
+        """
+        self.cache.put("x", self.frames["x"])
+
+        self.assertFalse(self.cache.put("big", pd.DataFrame({"a": range(1000)})))
+        self.assertIsNotNone(self.cache.get("x"))
+        self.assertEqual(self.cache.stats()["evictions"], 0)
+        self.assertTrue(self.cache.is_oversized("big"))
+        self.assertFalse(self.cache.is_oversized("x"))
+
+
+@override_settings(MEDIA_ROOT=mkdtemp())
+class TestReadCachedSheet(TestCase):
+    """
+    Test cases for reading typed sheets through the frame cache.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up an ingested sheet of strings, which take more memory than their snapshot says.
+        """
+        FRAME_CACHE.clear()
+        rows = "".join(f"name {index},{index}\n" for index in range(1000))
+        self.file: File = File.objects.create(
+            file=SimpleUploadedFile("strings.csv", ("Name,Id\n" + rows).encode()),
+            file_name="strings",
+        )
+        ingest_file(self.file)
+        self.column_types = dict(self.file.columns.values_list("name", "data_type"))
+
+    def test_oversized_sheet_is_read_once(self) -> None:
+        """
+        Test that a sheet whose estimated size fits the cache but whose frame does not is only
+        read whole once.
+        """
+        with override_settings(EDGAR_FRAME_CACHE_BYTES=typed_size(self.file)):
+            with mock.patch(
+                "edgar.frame_cache.read_snapshot", wraps=frame_cache.read_snapshot
+            ) as read_snapshot:
+                first = read_cached_sheet(self.file, self.column_types)
+                second = read_cached_sheet(self.file, self.column_types)
+
+        self.assertEqual(len(first), 1000)
+        self.assertIsNone(second)
+        self.assertEqual(read_snapshot.call_count, 1)
+        self.assertEqual(FRAME_CACHE.stats()["frames"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,12 @@
 import pandas as pd
-from edgar.infer_data_types import infer_and_convert_data_types
+from edgar.infer_data_types import (
+    FULL_COLUMN,
+    SAMPLE,
+    SUPPLIED,
+    TYPE_SOURCES,
+    infer_and_convert_data_types,
+    sample_column,
+)
 from django.test import TestCase
 from typing import Dict
 import unittest
@@ -84,6 +91,76 @@ class TestInferAndConvertDataTypes(TestCase):
         self.assertEqual(result.dtypes["int16"], "int16")
         self.assertEqual(result.dtypes["category"], "category")
 
+        self.assertEqual(result.attrs[TYPE_SOURCES]["boolean"], SUPPLIED)
+
+    def test_sampled_automatic_convert(self) -> None:
+        """
+        Test that types proposed from a sample match the types inferred from whole columns.
+        """
+        expected = infer_and_convert_data_types(self.dataframe.copy()).dtypes
+        result: pd.DataFrame = infer_and_convert_data_types(
+            self.dataframe, sample_size=3
+        )
+
+        self.assertTrue((result.dtypes == expected).all())
+        self.assertEqual(
+            result.attrs[TYPE_SOURCES],
+            {
+                "int8": SAMPLE,
+                "boolean": SAMPLE,
+                "int16": SAMPLE,
+                "category": FULL_COLUMN,
+            },
+        )
+
+    def test_sampled_verification_fallback(self) -> None:
+        """
+        Test that a type proposed from a sample falls back when the whole column rejects it.
+        """
+        dataframe = pd.DataFrame({"int16": [1, 2, 300, 4]})
+        self.assertEqual(sample_column(dataframe["int16"], 2).tolist(), [1, 4])
+
+        result: pd.DataFrame = infer_and_convert_data_types(dataframe, sample_size=2)
+
+        self.assertEqual(result.dtypes["int16"], "int16")
+        self.assertEqual(result.attrs[TYPE_SOURCES]["int16"], SAMPLE)
+
+    def test_nullable_automatic_convert(self) -> None:
+        """
+        Test that columns with missing values are inferred as the narrow nullable types.
+        """
+        dataframe = pd.DataFrame(
+            {
+                "Int16": [1, None, 300, 4],
+                "boolean": ["yes", "no", "none", "no"],
+                "Float32": [0.5, 1.25, None, 2.5],
+                "int8": [1, 2, 3, 4],
+            }
+        )
+        result: pd.DataFrame = infer_and_convert_data_types(dataframe)
+
+        for column_name in dataframe.columns:
+            self.assertEqual(result.dtypes[column_name], column_name)
+        self.assertTrue(result["Int16"].isna().tolist()[1])
+
+    def test_parallel_automatic_convert(self) -> None:
+        """
+        Test that types inferred over several processes match, in column order.
+        """
+        expected = infer_and_convert_data_types(self.dataframe.copy())
+        result: pd.DataFrame = infer_and_convert_data_types(
+            self.dataframe, {"boolean": "int8"}, workers=2
+        )
+
+        self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertEqual(result.dtypes["boolean"], "int8")
+        for column_name in ["int8", "int16", "category"]:
+            self.assertEqual(result.dtypes[column_name], expected.dtypes[column_name])
+            self.assertEqual(
+                result[column_name].tolist(), expected[column_name].tolist()
+            )
+        self.assertEqual(result.attrs[TYPE_SOURCES]["int16"], FULL_COLUMN)
+
 
 if __name__ == "__main__":
     unittest.main()
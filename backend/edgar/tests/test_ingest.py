@@ -0,0 +1,189 @@
+from io import BytesIO
+from tempfile import mkdtemp
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+import numpy as np
+import pandas
+from pandas.testing import assert_frame_equal
+from parameterized import parameterized
+from edgar.infer_data_types import infer_and_convert_data_types
+from edgar.ingest import (
+    convert_csv,
+    create_columns,
+    ingest_file,
+    scan_csv,
+    widen_dtype,
+)
+from edgar.models import Column, File
+from edgar.snapshots import read_snapshot, save_snapshot_chunks
+import unittest
+
+CSV = (
+    b"int8,int16,float,object,category,nullable\n"
+    b"1,1,1,1,a,1\n"
+    b"2,2,2,2,b,2\n"
+    b"3,3,3,3,a,3\n"
+    b"4,4,4,4,a,4\n"
+    b"5,300,1e20,foo,b,5\n"
+    b"6,6,6,6,a,\n"
+)
+
+
+class TestIngest(TestCase):
+    """
+    Test cases for the chunked ingestion of CSV files.
+    """
+
+    def test_scan_csv(self) -> None:
+        """
+        Test that the types merged over chunks widen to hold every chunk.
+        """
+        columns, number_of_records = scan_csv(BytesIO(CSV), 2)
+
+        self.assertEqual(number_of_records, 6)
+        self.assertEqual(
+            {name: column.data_type for name, column in columns.items()},
+            {
+                "int8": "int8",
+                "int16": "int16",
+                "float": "float64",
+                "object": "object",
+                "category": "category",
+                "nullable": "Int8",
+            },
+        )
+
+    def test_scan_csv_matches_whole_file(self) -> None:
+        """
+        Test that the types merged over chunks match the types inferred from the whole file.
+        """
+        expected = infer_and_convert_data_types(pandas.read_csv(BytesIO(CSV)))
+        columns, _ = scan_csv(BytesIO(CSV), 4)
+
+        for name, column in columns.items():
+            self.assertEqual(column.data_type, expected.dtypes[name].name)
+
+    def test_scan_csv_matches_whole_file_categories(self) -> None:
+        """
+        Test that columns with more distinct values than a chunk holds are categories as in the
+        whole file, including those whose first chunks hold only distinct values.
+        """
+        records = 3000
+        content = pandas.DataFrame(
+            {
+                "widen": np.arange(records) % 1200,
+                "late": np.where(np.arange(records) < 1000, np.arange(records), 7),
+                "unique": np.arange(records),
+            }
+        ).to_csv(index=False)
+        expected = infer_and_convert_data_types(
+            pandas.read_csv(BytesIO(content.encode()))
+        )
+        columns, _ = scan_csv(BytesIO(content.encode()), 500)
+
+        self.assertEqual(expected.dtypes["widen"].name, "category")
+        self.assertEqual(expected.dtypes["late"].name, "category")
+        for name, column in columns.items():
+            self.assertEqual(column.data_type, expected.dtypes[name].name)
+
+    def test_scan_csv_datetime_format(self) -> None:
+        """
+        Test that the datetime format detected in the first chunk must hold for every chunk.
+        """
+        csv = (
+            b"same,mixed\n"
+            b"19/03/2024,19/03/2024\n"
+            b"20/03/2024,20/03/2024\n"
+            b"21/03/2024,2024-03-21\n"
+        )
+        columns, _ = scan_csv(BytesIO(csv), 2)
+
+        self.assertEqual(columns["same"].data_type, "datetime64[ns]")
+        self.assertEqual(columns["same"].datetime_format, "%d/%m/%Y")
+        self.assertEqual(columns["mixed"].data_type, "object")
+
+    @parameterized.expand(
+        [
+            ("int64", "int64", "int64"),
+            ("int64", "float64", "float64"),
+            ("bool", "int64", "object"),
+            ("float64", "object", "object"),
+        ]
+    )
+    def test_widen_dtype(self, current: str, dtype: str, expected: str) -> None:
+        """
+        Test that the dtypes chunks are parsed as widen to hold both.
+        """
+        self.assertEqual(widen_dtype(np.dtype(current), np.dtype(dtype)), expected)
+
+    @override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_SNAPSHOT_ROW_GROUP_SIZE=2)
+    def test_convert_csv(self) -> None:
+        """
+        Test that a snapshot written chunk by chunk reads back with the merged types.
+        """
+        handle = BytesIO(CSV)
+        columns, number_of_records = scan_csv(handle, 4)
+        column_types = {name: column.data_type for name, column in columns.items()}
+        file_instance = File.objects.create(
+            file="example.csv", file_name="example", number_of_records=6
+        )
+
+        save_snapshot_chunks(file_instance, convert_csv(handle, columns, 4))
+        result = read_snapshot(file_instance, column_types, 3, 2)
+
+        self.assertEqual(result.dtypes.astype(str).to_dict(), column_types)
+        self.assertEqual(result["int16"].tolist(), [4, 300])
+        self.assertEqual(result["object"].tolist(), ["4", "foo"])
+        self.assertEqual(result["nullable"].tolist(), [4, 5])
+
+    @override_settings(
+        MEDIA_ROOT=mkdtemp(),
+        EDGAR_STREAMING_INGESTION_THRESHOLD=0,
+        EDGAR_INGESTION_CHUNK_SIZE=2,
+    )
+    def test_streamed_profiles(self) -> None:
+        """
+        Test that the columns of a streamed upload are profiled over every chunk.
+        """
+        file_instance = File.objects.create(
+            file=SimpleUploadedFile("profiled.csv", CSV), file_name="profiled"
+        )
+
+        ingest_file(file_instance)
+        profiles = dict(file_instance.columns.values_list("name", "profile"))
+
+        self.assertEqual(profiles["int16"]["max"], 300)
+        self.assertEqual(profiles["nullable"]["nulls"], 1)
+        self.assertEqual(profiles["float"]["mean"], (1 + 2 + 3 + 4 + 1e20 + 6) / 6)
+        self.assertEqual(
+            profiles["category"]["top"],
+            [{"value": "a", "count": 4}, {"value": "b", "count": 2}],
+        )
+
+    def test_create_columns(self) -> None:
+        """
+        Test that columns are inserted with one query however many there are, and validated.
+        """
+        file_instance = File.objects.create(file="example.csv", file_name="example")
+        columns = [
+            Column(file=file_instance, name=f"column {index}", data_type="int8")
+            for index in range(100)
+        ]
+
+        # The savepoint of the transaction, the insert and the release of the savepoint.
+        with self.assertNumQueries(3):
+            create_columns(columns)
+        self.assertEqual(file_instance.columns.count(), 100)
+
+        with self.assertRaises(ValidationError):
+            create_columns([Column(file=file_instance, name="bad", data_type="text")])
+        with self.assertRaises(IntegrityError):
+            create_columns(
+                [Column(file=file_instance, name="column 0", data_type="int8")]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+from datetime import timedelta
+from tempfile import mkdtemp
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from edgar.jobs import STALE_JOB_ERROR, claim_job, run_job
+from edgar.models import FAILED, PROCESSING, QUEUED, READY, RUNNING, Column, File, Job
+import unittest
+
+
+@override_settings(
+    MEDIA_ROOT=mkdtemp(), EDGAR_JOB_LEASE_TIMEOUT=60, EDGAR_JOB_MAX_ATTEMPTS=2
+)
+class TestJobs(TestCase):
+    """
+    Test cases for the leases of jobs claimed by workers.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a queued upload.
+        """
+        self.file: File = File.objects.create(
+            file=SimpleUploadedFile("queued.csv", b"Name,Score\nAlice,90\nBob,29\n"),
+            file_name="queued",
+            state=PROCESSING,
+        )
+        self.job: Job = Job.objects.create(file=self.file)
+
+    def _stop_responding(self) -> None:
+        """
+        Claims the job, as a worker that is then killed before it finishes.
+        """
+        job = claim_job()
+        Column.objects.get_or_create(
+            file=self.file, name="Name", defaults={"data_type": "object"}
+        )
+        Job.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(seconds=61)
+        )
+
+    def test_claim(self) -> None:
+        """
+        Test that claiming a job starts its lease and counts the attempt.
+        """
+        job = claim_job()
+
+        self.assertEqual((job.pk, job.state, job.attempts), (self.job.pk, RUNNING, 1))
+        self.assertIsNotNone(job.heartbeat_at)
+        self.assertIsNone(claim_job())
+
+    def test_live_job_is_not_reclaimed(self) -> None:
+        """
+        Test that a running job whose worker still beats is left to it.
+        """
+        claim_job()
+        Job.objects.filter(pk=self.job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(seconds=30)
+        )
+
+        self.assertIsNone(claim_job())
+        self.assertEqual(Job.objects.get(pk=self.job.pk).state, RUNNING)
+
+    def test_stale_job_is_claimed_again(self) -> None:
+        """
+        Test that the job of a worker that stopped responding is claimed again, and processed
+        from scratch.
+        """
+        self._stop_responding()
+
+        job = claim_job()
+        run_job(job)
+
+        self.assertEqual((job.pk, job.attempts), (self.job.pk, 2))
+        self.file.refresh_from_db()
+        self.assertEqual(self.file.state, READY)
+        self.assertEqual(
+            list(self.file.columns.values_list("name", flat=True)), ["Name", "Score"]
+        )
+
+    def test_stale_job_fails_after_max_attempts(self) -> None:
+        """
+        Test that a job whose workers stopped responding too many times fails, with its file.
+        """
+        self._stop_responding()
+        Job.objects.filter(pk=self.job.pk).update(state=QUEUED)
+        self._stop_responding()
+
+        self.assertIsNone(claim_job())
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual((job.state, job.error), (FAILED, STALE_JOB_ERROR))
+        self.assertEqual(File.objects.get(pk=self.file.pk).state, FAILED)
+        self.assertFalse(Column.objects.filter(file=self.file).exists())
+
+    def test_reclaimed_job_keeps_outcome_of_new_worker(self) -> None:
+        """
+        Test that a worker finishing a job that was claimed again since does not record its
+        outcome over the new worker's.
+        """
+        stale = claim_job()
+        Job.objects.filter(pk=self.job.pk).update(
+            state=QUEUED, heartbeat_at=timezone.now()
+        )
+        claim_job()
+
+        run_job(stale)
+
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual((job.state, job.rows_processed), (RUNNING, 0))
+        self.file.refresh_from_db()
+        self.assertEqual(self.file.state, PROCESSING)
+        self.assertFalse(self.file.snapshot)
+        self.assertFalse(stale.file.snapshot.storage.exists(stale.file.snapshot.name))
+
+    @override_settings(
+        EDGAR_STREAMING_INGESTION_THRESHOLD=0, EDGAR_INGESTION_CHUNK_SIZE=1
+    )
+    def test_failed_job_discards_snapshot(self) -> None:
+        """
+        Test that a job failing after its snapshot was written deletes it with the columns.
+        """
+        job = claim_job()
+
+        with mock.patch(
+            "edgar.ingest.Column.objects.bulk_update", side_effect=RuntimeError("down")
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                run_job(job)
+
+        snapshot = job.file.snapshot
+        self.assertTrue(snapshot.name)
+        self.assertFalse(snapshot.storage.exists(snapshot.name))
+        self.file.refresh_from_db()
+        self.assertEqual((self.file.state, self.file.snapshot.name), (FAILED, ""))
+        self.assertFalse(Column.objects.filter(file=self.file).exists())
+        self.assertEqual(Job.objects.get(pk=self.job.pk).error, "down")
+
+
+if __name__ == "__main__":
+    unittest.main()
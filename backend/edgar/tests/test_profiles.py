@@ -0,0 +1,127 @@
+import numpy as np
+import pandas
+from django.test import TestCase, override_settings
+from parameterized import parameterized
+from edgar.profiles import DISTINCT_SKETCH_SIZE, ColumnProfiler, profile_column
+import unittest
+
+
+class TestProfiles(TestCase):
+    """
+    Test cases for the profiles of typed columns.
+    """
+
+    def test_numeric_profile(self) -> None:
+        """
+        Test that numbers are profiled with their range, moments, quantiles and histogram.
+        """
+        profile = profile_column(pandas.Series([1, 2, 3, None, 5], dtype="Int8"))
+
+        self.assertEqual(
+            {key: profile[key] for key in ["count", "nulls", "distinct", "min", "max"]},
+            {"count": 5, "nulls": 1, "distinct": 4, "min": 1, "max": 5},
+        )
+        self.assertEqual(profile["mean"], 2.75)
+        self.assertAlmostEqual(profile["std"], np.std([1, 2, 3, 5], ddof=1))
+        self.assertEqual(profile["quantiles"]["0.5"], 2.5)
+        self.assertEqual(sum(profile["histogram"]["counts"]), 4)
+        self.assertEqual(
+            len(profile["histogram"]["edges"]), len(profile["histogram"]["counts"]) + 1
+        )
+        self.assertIsNone(profile["top"])
+
+    def test_datetime_profile(self) -> None:
+        """
+        Test that datetimes are profiled with their range and quantiles, encoded as in pages.
+        """
+        profile = profile_column(
+            pandas.Series(pandas.to_datetime(["2024-01-01", "2024-01-03", None]))
+        )
+
+        self.assertEqual(profile["min"], "2024-01-01T00:00:00")
+        self.assertEqual(profile["max"], "2024-01-03T00:00:00")
+        self.assertEqual(profile["quantiles"]["0.5"], "2024-01-02T00:00:00")
+        self.assertIsNone(profile["mean"])
+
+    def test_single_value(self) -> None:
+        """
+        Test that a column holding a single value has a single histogram bin.
+        """
+        profile = profile_column(pandas.Series(pandas.to_datetime(["2024-03-19"])))
+
+        self.assertEqual(
+            profile["histogram"],
+            {"edges": ["2024-03-19T00:00:00"] * 2, "counts": [1]},
+        )
+        self.assertIsNone(profile["std"])
+
+    @parameterized.expand(
+        [
+            (pandas.Series(["a", "b", "a", None], dtype="category"), "a", 2),
+            (pandas.Series([True, False, True]), True, 2),
+            (pandas.Series(["x", 1, "x"], dtype=object), "x", 2),
+        ]
+    )
+    def test_top_values(self, column: pandas.Series, value: object, count: int) -> None:
+        """
+        Test that other columns are profiled with their most frequent values.
+        """
+        profile = profile_column(column)
+
+        self.assertEqual(profile["top"][0], {"value": value, "count": count})
+        self.assertIsNone(profile["min"])
+
+    @override_settings(EDGAR_PROFILE_SAMPLE_SIZE=100_000)
+    def test_chunks_match_whole_column(self) -> None:
+        """
+        Test that a column profiled chunk by chunk has the profile of the whole column.
+        """
+        column = pandas.Series(np.random.default_rng(0).normal(size=1000))
+        profiler = ColumnProfiler(column.dtype)
+        for chunk in np.array_split(column, 7):
+            profiler.update(chunk)
+
+        chunked = profiler.profile()
+        whole = profile_column(column)
+
+        self.assertAlmostEqual(chunked.pop("mean"), whole.pop("mean"))
+        self.assertAlmostEqual(chunked.pop("std"), whole.pop("std"))
+        self.assertEqual(chunked, whole)
+
+    @override_settings(EDGAR_PROFILE_SAMPLE_SIZE=8, EDGAR_PROFILE_TOP_K=3)
+    def test_chunked_top_values(self) -> None:
+        """
+        Test that the most frequent values are counted across chunks, including values that
+        cannot be ordered, while the least frequent are dropped.
+        """
+        column = pandas.Series(
+            ["x", 1, "y"] * 5 + [f"id {index}" for index in range(20)] + ["x", 1],
+            dtype=object,
+        )
+        profiler = ColumnProfiler(column.dtype)
+        for chunk in np.array_split(column, 6):
+            profiler.update(chunk)
+
+        self.assertEqual(
+            profiler.profile()["top"],
+            [
+                {"value": "x", "count": 6},
+                {"value": 1, "count": 6},
+                {"value": "y", "count": 5},
+            ],
+        )
+        self.assertLessEqual(len(profiler.frequencies), 8)
+
+    def test_distinct_estimate(self) -> None:
+        """
+        Test that the distinct values of large columns are estimated closely.
+        """
+        profile = profile_column(pandas.Series(np.arange(20 * DISTINCT_SKETCH_SIZE)))
+
+        self.assertAlmostEqual(
+            profile["distinct"] / (20 * DISTINCT_SKETCH_SIZE), 1, delta=0.1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+from tempfile import mkdtemp
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from parameterized import parameterized
+from edgar.frame_cache import FRAME_CACHE
+from edgar.ingest import ingest_file
+from edgar import query, snapshots
+from edgar.models import File
+from edgar.query import (
+    QUERY_CACHE,
+    Filter,
+    matching_row_groups,
+    parse_filters,
+    parse_sort,
+    query_sheet,
+)
+import unittest
+
+
+@override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_SNAPSHOT_ROW_GROUP_SIZE=2)
+class TestQuery(TestCase):
+    """
+    Test cases for filtering and sorting typed sheets.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up an ingested sheet with a snapshot spread over three row groups.
+        """
+        FRAME_CACHE.clear()
+        QUERY_CACHE.clear()
+        self.file: File = File.objects.create(
+            file=SimpleUploadedFile(
+                "query.csv",
+                b"Name,Score,Joined,Grade\nAlice,90,2024-03-19,A\nBob,29,2023-12-01,B\n"
+                b"Charlie,93,2022-05-13,A\nDavid,,2021-01-30,B\nEve,61,2020-07-04,A\n"
+                b"Frank,75,2019-11-11,C\n",
+            ),
+            file_name="query",
+        )
+        ingest_file(self.file)
+        self.column_types = dict(self.file.columns.values_list("name", "data_type"))
+
+    @parameterized.expand(
+        [
+            ("Score:gt:80", ["Alice", "Charlie"]),
+            ("Score:le:61", ["Bob", "Eve"]),
+            ("Score:ne:90", ["Bob", "Charlie", "Eve", "Frank"]),
+            ("Score:isnull", ["David"]),
+            ("Joined:lt:2021-01-01", ["Eve", "Frank"]),
+            ("Joined:eq:2022-05-13", ["Charlie"]),
+            ("Grade:eq:A", ["Alice", "Charlie", "Eve"]),
+            ("Name:ge:E", ["Eve", "Frank"]),
+        ]
+    )
+    def test_filter(self, expression: str, expected: list[str]) -> None:
+        """
+        Test that filters compare the typed values of their column.
+        """
+        filters = parse_filters([expression], self.column_types)
+
+        result, _ = query_sheet(self.file, self.column_types, {}, filters, [])
+
+        self.assertEqual(result["Name"].tolist(), expected)
+
+    @parameterized.expand(
+        [
+            ("Missing:eq:1",),
+            ("Score:like:1",),
+            ("Score:gt:high",),
+            ("Joined:gt:someday",),
+            ("Grade:lt:B",),
+        ]
+    )
+    def test_invalid_filter(self, expression: str) -> None:
+        """
+        Test that unknown columns and operators, and values that do not convert, are rejected.
+        """
+        with self.assertRaises(ValueError):
+            parse_filters([expression], self.column_types)
+
+    def test_column_name_holding_separator(self) -> None:
+        """
+        Test that the longest column name an expression starts with is the one filtered on.
+        """
+        filters = parse_filters(["a:b:eq:1"], {"a": "object", "a:b": "int64"})
+
+        self.assertEqual(filters, [Filter("a:b", "eq", 1.0)])
+
+    def test_sort(self) -> None:
+        """
+        Test that records sort by several columns, with missing values last.
+        """
+        sort = parse_sort(["Grade", "-Score"], self.column_types)
+
+        result, _ = query_sheet(self.file, self.column_types, {}, [], sort)
+
+        self.assertEqual(
+            result["Name"].tolist(),
+            ["Charlie", "Alice", "Eve", "Bob", "David", "Frank"],
+        )
+
+    def test_filter_and_sort(self) -> None:
+        """
+        Test that matching records are sorted, and keep their column types.
+        """
+        filters = parse_filters(["Score:notnull"], self.column_types)
+        sort = parse_sort(["Joined"], self.column_types)
+
+        result, _ = query_sheet(self.file, self.column_types, {}, filters, sort)
+
+        self.assertEqual(
+            result["Name"].tolist(), ["Frank", "Eve", "Charlie", "Bob", "Alice"]
+        )
+        self.assertEqual(
+            result.dtypes.astype(str).to_dict(),
+            self.column_types,
+        )
+
+    @parameterized.expand(
+        [
+            ("Score:gt:91", [1]),
+            ("Score:isnull", [1]),
+            ("Joined:ge:2023-01-01", [0]),
+            ("Name:eq:Eve", [2]),
+            ("Score:gt:100", []),
+        ]
+    )
+    def test_matching_row_groups(self, expression: str, expected: list[int]) -> None:
+        """
+        Test that row groups whose statistics rule out every match are skipped.
+        """
+        filters = parse_filters([expression], self.column_types)
+
+        self.assertEqual(
+            matching_row_groups(self.file, self.column_types, filters), expected
+        )
+
+    @override_settings(EDGAR_FRAME_CACHE_BYTES=0)
+    def test_large_integers(self) -> None:
+        """
+        Test that integers beyond 2**53 are compared exactly, by filters and row group
+        statistics alike.
+        """
+        file_instance = File.objects.create(
+            file=SimpleUploadedFile(
+                "ids.csv",
+                b"id\n9007199254740991\n9007199254740992\n9007199254740993\n"
+                b"9007199254740994\n",
+            ),
+            file_name="ids",
+        )
+        ingest_file(file_instance)
+        column_types = {"id": "int64"}
+        filters = parse_filters(["id:eq:9007199254740993"], column_types)
+
+        result, _ = query_sheet(file_instance, column_types, {}, filters, [])
+
+        self.assertEqual(result["id"].tolist(), [9007199254740993])
+        self.assertEqual(matching_row_groups(file_instance, column_types, filters), [1])
+        self.assertEqual(
+            parse_filters(["id:lt:2.5"], column_types), [Filter("id", "lt", 2.5)]
+        )
+
+    @override_settings(EDGAR_FRAME_CACHE_BYTES=0)
+    def test_skips_row_groups(self) -> None:
+        """
+        Test that sheets too large for the frame cache only read the row groups that may match.
+        """
+        filters = parse_filters(["Score:gt:91"], self.column_types)
+
+        with mock.patch(
+            "edgar.snapshots._typed_frame", wraps=snapshots._typed_frame
+        ) as typed_frame:
+            result, _ = query_sheet(self.file, self.column_types, {}, filters, [])
+
+        # The compared column of the row group that may match, then the matching record.
+        self.assertEqual(
+            [
+                (call.args[0].column_names, call.args[0].num_rows)
+                for call in typed_frame.call_args_list
+            ],
+            [(["Score"], 2), (["Name", "Score", "Joined", "Grade"], 1)],
+        )
+        self.assertEqual(result["Name"].tolist(), ["Charlie"])
+
+    @override_settings(EDGAR_FRAME_CACHE_BYTES=0)
+    def test_page(self) -> None:
+        """
+        Test that a page of the matching records is read of the projected columns, and that
+        later pages are read without querying the sheet again.
+        """
+        filters = parse_filters(["Score:notnull"], self.column_types)
+        sort = parse_sort(["Name"], self.column_types)
+
+        with mock.patch(
+            "edgar.query.matching_keys", wraps=query.matching_keys
+        ) as matching_keys:
+            pages = [
+                query_sheet(
+                    self.file, self.column_types, {}, filters, sort, start, 2, ["Name"]
+                )
+                for start in [0, 2, 4]
+            ]
+
+        self.assertEqual(matching_keys.call_count, 1)
+        self.assertEqual(
+            [(page["Name"].tolist(), matches) for page, matches in pages],
+            [(["Alice", "Bob"], 5), (["Charlie", "Eve"], 5), (["Frank"], 5)],
+        )
+        self.assertEqual(list(pages[0][0].columns), ["Name"])
+
+    @parameterized.expand([("Score",), ("-Score",), ("Joined",), ("-Joined",)])
+    def test_partial_sort(self, expression: str) -> None:
+        """
+        Test that the first records sorted by a single column are found without sorting every
+        matching record, in the order a full sort gives them.
+        """
+        sort = parse_sort([expression], self.column_types)
+        expected, _ = query_sheet(self.file, self.column_types, {}, [], sort)
+        QUERY_CACHE.clear()
+
+        with mock.patch("edgar.query.PARTIAL_SORT_FRACTION", 1.0), mock.patch(
+            "edgar.query._sort"
+        ) as sort_keys:
+            result, _ = query_sheet(self.file, self.column_types, {}, [], sort, 1, 4)
+
+        sort_keys.assert_not_called()
+        self.assertEqual(result["Name"].tolist(), expected["Name"].tolist()[1:5])
+
+    def test_query_without_snapshot(self) -> None:
+        """
+        Test that sheets without a snapshot are queried from their uploaded file.
+        """
+        self.file.snapshot = None
+        filters = parse_filters(["Grade:eq:B"], self.column_types)
+
+        result, _ = query_sheet(
+            self.file, self.column_types, {}, filters, [], 1, 1, ["Name", "Grade"]
+        )
+
+        self.assertEqual(result.to_dict("records"), [{"Name": "David", "Grade": "B"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
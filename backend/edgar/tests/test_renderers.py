@@ -0,0 +1,97 @@
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow
+import pyarrow.ipc
+from django.test import TestCase
+from parameterized import parameterized
+from edgar.renderers import ArrowRenderer, ORJSONRenderer, column_values, records
+import unittest
+
+
+class TestRenderers(TestCase):
+    """
+    Test cases for the JSON encoding of typed pages.
+    """
+
+    @parameterized.expand(
+        [
+            (pd.Series([1, -2], dtype="int8"), [1, -2]),
+            (pd.Series([1.5, np.nan]), [1.5, None]),
+            (pd.Series([True, False]), [True, False]),
+            (pd.Series([1, None], dtype="Int16"), [1, None]),
+            (pd.Series([True, None], dtype="boolean"), [True, None]),
+            (pd.Series(["a", None], dtype="string[pyarrow]"), ["a", None]),
+            (pd.Series(["a", "b", None], dtype="category"), ["a", "b", None]),
+            (pd.Series([3, 1, None]).astype("category"), [3.0, 1.0, None]),
+            (pd.Series([1 + 2j]), ["(1+2j)"]),
+            (pd.Series(pd.to_timedelta(["1 day", None])), ["1 days", None]),
+            (
+                pd.Series(pd.to_datetime(["2024-03-19 10:00", None])),
+                ["2024-03-19T10:00:00", None],
+            ),
+            (
+                pd.Series(pd.to_datetime(["2024-03-19 10:00:00.25"])),
+                ["2024-03-19T10:00:00.250000000"],
+            ),
+            (
+                pd.Series(pd.to_datetime(["2024-03-19 10:00"]).tz_localize("CET")),
+                ["2024-03-19T09:00:00Z"],
+            ),
+            (pd.Series(["a", 1, None], dtype=object), ["a", 1, None]),
+        ]
+    )
+    def test_column_values(self, series: pd.Series, expected: list) -> None:
+        """
+        Test that columns are encoded natively, with missing values as None.
+        """
+        values = column_values(series)
+
+        self.assertEqual(orjson.loads(ORJSONRenderer().render(values)), expected)
+
+    def test_records(self) -> None:
+        """
+        Test that a page is turned into one record per row.
+        """
+        dataframe = pd.DataFrame({"Name": ["Alice", "Bob"], "Score": [90, 29]})
+
+        self.assertEqual(
+            records(dataframe),
+            [{"Name": "Alice", "Score": 90}, {"Name": "Bob", "Score": 29}],
+        )
+
+    def test_render(self) -> None:
+        """
+        Test that values orjson cannot encode itself fall back to ISO dates and strings.
+        """
+        data = {"at": pd.Timestamp("2024-03-19 10:00"), "value": np.int8(3)}
+
+        self.assertEqual(
+            orjson.loads(ORJSONRenderer().render(data)),
+            {"at": "2024-03-19T10:00:00", "value": 3},
+        )
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_render_arrow(self) -> None:
+        """
+        Test that pages keep their dtypes in Arrow, and that complex numbers are sent as strings.
+        """
+        dataframe = pd.DataFrame(
+            {
+                "small": pd.Series([1, None], dtype="Int16"),
+                "wide": pd.Series([1.5, 2.5], dtype="float32"),
+                "complex": pd.Series([1 + 2j, 3j]),
+            }
+        )
+
+        table = pyarrow.ipc.open_stream(ArrowRenderer().render(dataframe)).read_all()
+
+        self.assertEqual(
+            table.schema.types, [pyarrow.int16(), pyarrow.float32(), pyarrow.string()]
+        )
+        self.assertEqual(table.column("small").to_pylist(), [1, None])
+        self.assertEqual(table.column("complex").to_pylist(), ["(1+2j)", "3j"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+from tempfile import mkdtemp
+from unittest import mock
+import pandas
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from edgar.infer_data_types import SUPPLIED
+from edgar.ingest import ingest_file
+from edgar.models import File
+from edgar import retype
+from edgar.retype import RetypeConflict, retype_column, retype_columns
+from edgar.snapshots import read_snapshot
+import unittest
+
+
+@override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_SNAPSHOT_ROW_GROUP_SIZE=2)
+class TestRetype(TestCase):
+    """
+    Test cases for changing the types of the columns of a sheet.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up an ingested sheet with a snapshot spread over several row groups.
+        """
+        self.file: File = File.objects.create(
+            file=SimpleUploadedFile(
+                "retype.csv",
+                b"Name,Score,Joined\nAlice,90,19/03/2024\nBob,29,01/12/2023\n"
+                b"Charlie,93,13/05/2022\n",
+            ),
+            file_name="retype",
+        )
+        ingest_file(self.file)
+
+    def column_types(self) -> dict[str, str]:
+        """
+        Reads the types of the columns of the sheet.
+        """
+        return dict(self.file.columns.values_list("name", "data_type"))
+
+    def test_retype_column(self) -> None:
+        """
+        Test that a retyped column is stored converted, so it is read without converting it.
+        """
+        column = self.file.columns.select_related("file").get(name="Score")
+        snapshot = self.file.snapshot.name
+
+        retype_column(column, "float64")
+        self.file.refresh_from_db()
+
+        self.assertEqual(self.file.types_version, 1)
+        self.assertNotEqual(self.file.snapshot.name, snapshot)
+        with mock.patch("edgar.snapshots.convert_column") as convert_column:
+            result = read_snapshot(self.file, self.column_types(), 1, 2)
+        convert_column.assert_not_called()
+        self.assertEqual(result["Score"].tolist(), [29.0, 93.0])
+        self.assertEqual(result.dtypes["Score"], "float64")
+
+    def test_retype_datetime_column(self) -> None:
+        """
+        Test that a column retyped to a datetime stores the format it was parsed with.
+        """
+        column = self.file.columns.select_related("file").get(name="Joined")
+        retype_column(column, "object")
+        retype_column(column, "datetime64[ns]")
+
+        self.assertEqual(column.datetime_format, "%d/%m/%Y")
+        self.assertEqual(
+            read_snapshot(self.file, self.column_types(), 2, 1)["Joined"].tolist(),
+            [pandas.Timestamp("2022-05-13")],
+        )
+
+    def test_failed_retype(self) -> None:
+        """
+        Test that a column that cannot be converted leaves the sheet as it was.
+        """
+        column = self.file.columns.select_related("file").get(name="Name")
+        snapshot = self.file.snapshot.name
+
+        with self.assertRaises(ValueError):
+            retype_column(column, "int8")
+        self.file.refresh_from_db()
+
+        self.assertEqual(self.file.types_version, 0)
+        self.assertEqual(self.file.snapshot.name, snapshot)
+        self.assertEqual(self.column_types()["Name"], "object")
+
+    def test_failed_save(self) -> None:
+        """
+        Test that a retype whose save fails leaves the column given as it was.
+        """
+        column = self.file.columns.select_related("file").get(name="Score")
+
+        with mock.patch(
+            "edgar.retype.Column.objects.bulk_update", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                retype_column(column, "float64")
+        self.file.refresh_from_db()
+
+        self.assertEqual(column.data_type, "int8")
+        self.assertNotEqual(column.type_source, SUPPLIED)
+        self.assertEqual(self.file.types_version, 0)
+        self.assertEqual(self.column_types()["Score"], "int8")
+
+    def test_concurrent_retype(self) -> None:
+        """
+        Test that a retype of a sheet retyped meanwhile fails and leaves the sheet as the other
+        retype stored it.
+        """
+        first = self.file.columns.select_related("file").get(name="Score")
+        second = self.file.columns.select_related("file").get(name="Name")
+
+        retype_column(first, "float64")
+        self.file.refresh_from_db()
+        snapshot = self.file.snapshot.name
+        with self.assertRaises(RetypeConflict):
+            retype_column(second, "category")
+        self.file.refresh_from_db()
+
+        self.assertEqual(second.data_type, "object")
+        self.assertEqual(self.file.types_version, 1)
+        self.assertEqual(self.file.snapshot.name, snapshot)
+        self.assertEqual(
+            self.column_types(),
+            {
+                "Name": "object",
+                "Score": "float64",
+                "Joined": "datetime64[ns]",
+            },
+        )
+
+    @override_settings(EDGAR_PARALLEL_RETYPE_VALUES=0)
+    def test_retype_columns_in_parallel(self) -> None:
+        """
+        Test that columns converted in separate processes are stored in a single snapshot copy,
+        and that a column that cannot be converted is reported without stopping the others.
+        """
+        columns = {
+            column.name: column for column in self.file.columns.select_related("file")
+        }
+
+        errors = retype_columns(
+            self.file,
+            {
+                columns["Score"]: "float32",
+                columns["Joined"]: "object",
+                columns["Name"]: "float64",
+            },
+            workers=2,
+        )
+        self.file.refresh_from_db()
+
+        self.assertEqual(list(errors.keys()), [columns["Name"].pk])
+        self.assertEqual(self.file.types_version, 1)
+        self.assertEqual(
+            self.column_types(),
+            {"Name": "object", "Score": "float32", "Joined": "object"},
+        )
+        result = read_snapshot(self.file, self.column_types())
+        self.assertEqual(result["Joined"].tolist()[0], "19/03/2024")
+
+        pool = retype._pools[2]
+        retype_columns(
+            self.file, {columns["Score"]: "float64", columns["Joined"]: "object"}, 2
+        )
+        self.assertIs(retype._pools[2], pool)
+        # Forking a threaded server could copy locks held by its other threads.
+        self.assertEqual(pool._mp_context.get_start_method(), "spawn")
+
+        retype._shutdown_pools()
+        self.assertEqual(retype._pools, {})
+
+    def test_small_batches_are_not_parallel(self) -> None:
+        """
+        Test that columns of batches below the threshold are converted in this process.
+        """
+        columns = list(self.file.columns.select_related("file"))
+
+        with mock.patch("edgar.retype._pool") as pool:
+            retype_columns(
+                self.file, {column: "object" for column in columns}, workers=2
+            )
+
+        pool.assert_not_called()
+        self.assertEqual(set(self.column_types().values()), {"object"})
+
+
+if __name__ == "__main__":
+    unittest.main()
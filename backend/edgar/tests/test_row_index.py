@@ -0,0 +1,73 @@
+from io import BytesIO
+from tempfile import mkdtemp
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+import pandas
+from pandas.testing import assert_frame_equal
+from parameterized import parameterized
+from edgar.models import File
+from edgar.row_index import build_row_offsets, read_csv_page
+from edgar.serializers import GetFileSerializer
+import unittest
+
+ROWS = [f'{index},"line\nbreak {index}","quoted ""{index}"""' for index in range(23)]
+CSV = ("a,b,c\n\n" + "\n".join(ROWS) + "\n").encode()
+
+
+class TestRowIndex(TestCase):
+    """
+    Test cases for the sparse byte-offset index of CSV files.
+    """
+
+    def test_build_row_offsets(self) -> None:
+        """
+        Test that checkpoints land on records, skipping quoted newlines and blank lines.
+        """
+        handle = BytesIO(CSV)
+        offsets = build_row_offsets(handle, 10)
+
+        self.assertEqual(len(offsets), 3)
+        for index, offset in zip([0, 10, 20], offsets):
+            self.assertTrue(CSV[offset:].startswith(f'{index},"line'.encode()))
+
+    @parameterized.expand([(0, 5), (3, 4), (9, 2), (10, 10), (21, 5)])
+    def test_read_csv_page(self, start_index: int, num_records: int) -> None:
+        """
+        Test that pages read through the index match pages read from the whole file.
+        """
+        handle = BytesIO(CSV)
+        offsets = build_row_offsets(handle, 4)
+        expected = pandas.read_csv(BytesIO(CSV)).iloc[
+            start_index : start_index + num_records
+        ]
+
+        result = read_csv_page(
+            handle, offsets, 4, ["a", "b", "c"], start_index, num_records
+        )
+
+        assert_frame_equal(result, expected.reset_index(drop=True))
+
+    @override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_ROW_INDEX_STRIDE=4)
+    def test_index_built_on_read(self) -> None:
+        """
+        Test that files without a snapshot are indexed when first read, with the stride the
+        index was built with stored, so pages stay right when the setting changes.
+        """
+        file = File.objects.create(
+            file=SimpleUploadedFile("rows.csv", CSV), file_name="rows"
+        )
+        column_types = {"a": "int64", "b": "object", "c": "object"}
+        expected = pandas.read_csv(BytesIO(CSV)).iloc[9:14].reset_index(drop=True)
+
+        result = GetFileSerializer.read_source(file, column_types, 9, 5)
+        file.refresh_from_db()
+
+        self.assertEqual((file.row_index_stride, len(file.row_offsets)), (4, 6))
+        with override_settings(EDGAR_ROW_INDEX_STRIDE=10):
+            reread = GetFileSerializer.read_source(file, column_types, 9, 5)
+        assert_frame_equal(result, expected)
+        assert_frame_equal(reread, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from tempfile import mkdtemp
+from django.test import TestCase, override_settings
+import pandas
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from edgar.models import File
+from edgar.infer_data_types import infer_and_convert_data_types
+import pyarrow.parquet as parquet
+from edgar.snapshots import (
+    TYPES_METADATA_KEY,
+    read_snapshot,
+    read_source_column,
+    replace_typed_columns,
+    save_snapshot,
+)
+import unittest
+
+
+@override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_SNAPSHOT_ROW_GROUP_SIZE=2)
+class TestSnapshots(TestCase):
+    """
+    Test cases for writing and reading typed snapshots.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a file with a snapshot spread over several row groups.
+        """
+        self.source: DataFrame = DataFrame(
+            {
+                "int8": [12, 1, 2, 34, 12],
+                "complex": ["1+2j", "3-4j", "5+1j", "2-2j", "0+1j"],
+                "object": ["foo", "bar", "baz", "qux", "quux"],
+            }
+        )
+        self.typed: DataFrame = infer_and_convert_data_types(self.source.copy())
+        self.column_types: dict[str, str] = {
+            name: dtype.name for name, dtype in self.typed.dtypes.items()
+        }
+        self.file: File = File.objects.create(
+            file="example.csv", file_name="example", number_of_records=5
+        )
+        save_snapshot(self.file, self.typed, self.source)
+
+    def test_read_all_records(self) -> None:
+        """
+        Test that a snapshot reads back with the inferred types.
+        """
+        result: DataFrame = read_snapshot(self.file, self.column_types)
+
+        assert_frame_equal(result, self.typed)
+
+    def test_read_page_across_row_groups(self) -> None:
+        """
+        Test that a page spanning row groups returns the right records.
+        """
+        result: DataFrame = read_snapshot(self.file, self.column_types, 1, 3)
+
+        self.assertEqual(result["int8"].tolist(), [1, 2, 34])
+        self.assertEqual(result.dtypes["int8"], "int8")
+        self.assertEqual(result.dtypes["complex"], "complex128")
+
+    def test_read_changed_type(self) -> None:
+        """
+        Test that a column whose type changed is converted from its source column.
+        """
+        column_types: dict[str, str] = {**self.column_types, "int8": "float64"}
+        result: DataFrame = read_snapshot(self.file, column_types, 3, 2)
+
+        self.assertEqual(result.dtypes["int8"], "float64")
+        self.assertEqual(result["int8"].tolist(), [34.0, 12.0])
+
+    def test_read_source_column(self) -> None:
+        """
+        Test that the source column is stored as parsed.
+        """
+        result = read_source_column(self.file, "complex")
+
+        self.assertEqual(result.name, "complex")
+        self.assertEqual(result.tolist(), self.source["complex"].tolist())
+
+    def test_replace_typed_columns(self) -> None:
+        """
+        Test that replaced typed columns are stored with their new types, keeping the row
+        groups and the other columns, and that columns which cannot be stored are left out.
+        """
+        converted = {
+            "int8": pandas.Series([12, 1, None, 34, 12], dtype="Int16"),
+            "object": self.typed["object"].astype("category"),
+            "complex": self.typed["complex"],
+        }
+        self.file.snapshot = replace_typed_columns(self.file, converted)
+        column_types = {name: series.dtype.name for name, series in converted.items()}
+
+        with self.file.snapshot.open("rb") as handle:
+            parquet_file = parquet.ParquetFile(handle)
+            stored_types = parquet_file.schema_arrow.metadata[TYPES_METADATA_KEY]
+            self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+            self.assertNotIn("complex", parquet_file.schema_arrow.names)
+        self.assertEqual(stored_types, b'{"int8": "Int16", "object": "category"}')
+
+        result: DataFrame = read_snapshot(self.file, column_types, 1, 3)
+
+        self.assertEqual(result.dtypes.astype(str).to_dict(), column_types)
+        self.assertEqual(result["int8"].tolist(), [1, pandas.NA, 34])
+        self.assertEqual(result["object"].tolist(), ["bar", "baz", "qux"])
+        self.assertEqual(result["complex"].tolist(), [3 - 4j, 5 + 1j, 2 - 2j])
+
+
+if __name__ == "__main__":
+    unittest.main()
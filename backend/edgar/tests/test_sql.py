@@ -0,0 +1,157 @@
+from tempfile import mkdtemp
+from unittest import mock
+import pandas
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from parameterized import parameterized
+from edgar.ingest import ingest_file
+from edgar.models import File
+from edgar.retype import retype_column
+from edgar.serializers import column_metadata
+from edgar.sql import AVAILABLE, QueryTimeout, is_queryable, query_sql, sql_type
+import unittest
+
+
+class TestSqlType(TestCase):
+    """
+    Test cases for mapping the data types of columns to DuckDB types.
+    """
+
+    @parameterized.expand(
+        [
+            ("int8", "TINYINT"),
+            ("Int64", "BIGINT"),
+            ("Float32", "FLOAT"),
+            ("boolean", "BOOLEAN"),
+            ("datetime64[ns]", "TIMESTAMP"),
+            ("timedelta64[ns]", "INTERVAL"),
+            ("category", "VARCHAR"),
+            ("complex128", "VARCHAR"),
+        ]
+    )
+    def test_sql_type(self, data_type: str, expected: str) -> None:
+        """
+        Test that every data type maps to the DuckDB type it is queried as.
+        """
+        self.assertEqual(sql_type(data_type), expected)
+
+
+@unittest.skipUnless(AVAILABLE, "duckdb is not installed")
+@override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_SNAPSHOT_ROW_GROUP_SIZE=2)
+class TestQuerySql(TestCase):
+    """
+    Test cases for SQL queries over the snapshots of sheets.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up an ingested sheet with a snapshot spread over several row groups.
+        """
+        self.file: File = File.objects.create(
+            file=SimpleUploadedFile(
+                "sql.csv",
+                b"Name,Score,Joined,Grade\nAlice,90,2024-03-19,A\nBob,29,2023-12-01,B\n"
+                b"Charlie,93,2022-05-13,A\nDavid,,2021-01-30,B\nEve,61,2020-07-04,A\n",
+            ),
+            file_name="sql",
+        )
+        ingest_file(self.file)
+
+    def query(self, query: str) -> tuple[pandas.DataFrame, bool]:
+        """
+        Runs a query over the sheet.
+        """
+        return query_sql(self.file, column_metadata(self.file), query)
+
+    def test_aggregate(self) -> None:
+        """
+        Test that group-bys and aggregations run over the typed columns.
+        """
+        result, truncated = self.query(
+            "SELECT Grade, count(*) AS n, avg(Score) AS mean, max(Joined) AS last "
+            "FROM sheet GROUP BY Grade ORDER BY Grade"
+        )
+
+        self.assertFalse(truncated)
+        self.assertEqual(result["Grade"].tolist(), ["A", "B"])
+        self.assertEqual(result["n"].tolist(), [3, 2])
+        self.assertEqual(result["mean"].tolist(), [(90 + 93 + 61) / 3, 29.0])
+        self.assertEqual(
+            result["last"].tolist(),
+            [pandas.Timestamp("2024-03-19"), pandas.Timestamp("2023-12-01")],
+        )
+
+    def test_retyped_column(self) -> None:
+        """
+        Test that columns are queried as their current type.
+        """
+        retype_column(
+            self.file.columns.select_related("file").get(name="Score"), "object"
+        )
+        self.file.refresh_from_db()
+
+        result, _ = self.query("SELECT max(Score) AS top FROM sheet")
+
+        self.assertEqual(result["top"].tolist(), ["93.0"])
+
+    @override_settings(EDGAR_SQL_MAX_ROWS=2)
+    def test_truncated(self) -> None:
+        """
+        Test that results are cut to the maximum number of records.
+        """
+        result, truncated = self.query("SELECT Name FROM sheet ORDER BY Name DESC")
+
+        self.assertTrue(truncated)
+        self.assertEqual(result["Name"].tolist(), ["Eve", "David"])
+
+    @override_settings(EDGAR_SQL_TIMEOUT=0.1, EDGAR_SQL_THREADS=1)
+    def test_timeout(self) -> None:
+        """
+        Test that queries running longer than the timeout are interrupted.
+        """
+        with self.assertRaises(QueryTimeout):
+            self.query(
+                "SELECT count(*) FROM sheet, range(100000000) a, range(100000000) b"
+            )
+
+    @override_settings(EDGAR_SQL_THREADS=1)
+    def test_threads(self) -> None:
+        """
+        Test that queries run on the configured number of threads.
+        """
+        result, _ = self.query("SELECT current_setting('threads') AS threads")
+
+        self.assertEqual(result["threads"].tolist(), [1])
+
+    def test_is_queryable(self) -> None:
+        """
+        Test that snapshots kept by storages without local paths cannot be queried.
+        """
+        self.assertTrue(is_queryable(self.file))
+        with mock.patch.object(
+            FileSystemStorage, "path", side_effect=NotImplementedError
+        ):
+            self.assertFalse(is_queryable(self.file))
+
+    @parameterized.expand(
+        [
+            ("CREATE TABLE copy AS SELECT * FROM sheet",),
+            ("SELECT 1; SELECT 2",),
+            ("SELECT * FROM read_csv('/etc/passwd')",),
+            ("SET enable_external_access = true",),
+            ("SELECT Missing FROM sheet",),
+            ("SELECT * FROM snapshot",),
+            ('SELECT "source:Score" FROM sheet',),
+        ]
+    )
+    def test_rejected(self, query: str) -> None:
+        """
+        Test that statements other than a single SELECT over the sheet are rejected.
+        """
+        with self.assertRaises(ValueError):
+            self.query(query)
+
+
+if __name__ == "__main__":
+    unittest.main()
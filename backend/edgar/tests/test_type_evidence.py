@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from django.test import TestCase
+from parameterized import parameterized
+from edgar.conversions import CHECK_LOOKUP
+from edgar.type_evidence import TypeEvidence
+import unittest
+
+
+class TestTypeEvidence(TestCase):
+    """
+    Test cases for the evidence gathered for type inference, and the checks that use it.
+    """
+
+    @parameterized.expand(
+        [
+            ([1, 2, 3], "integer", 0, 1, 3),
+            ([1, 2, -999], "float", 1, 1.0, 2.0),
+            ([1.5, np.nan, -20.0], "float", 1, -20.0, 1.5),
+            (["12", " 300 "], "string", 0, 12, 300),
+            (["foo", None], "string", 1, None, None),
+            ([None, "n/a"], "empty", 2, None, None),
+            ([True, False], "bool", 0, None, None),
+            ([1, "foo"], "mixed", 0, None, None),
+        ]
+    )
+    def test_from_series(
+        self, values: list, kind: str, null_count: int, minimum, maximum
+    ) -> None:
+        """
+        Test that columns are classified, and their nulls and range recorded.
+        """
+        evidence = TypeEvidence.from_series(pd.Series(values))
+
+        self.assertEqual(evidence.kind, kind)
+        self.assertEqual(evidence.null_count, null_count)
+        self.assertEqual(evidence.minimum, minimum)
+        self.assertEqual(evidence.maximum, maximum)
+
+    def test_string_tokens(self) -> None:
+        """
+        Test that strings are matched against the tokens each type accepts.
+        """
+        evidence = TypeEvidence.from_series(pd.Series(["1", "0", "None"]))
+        self.assertTrue(evidence.bool_tokens)
+        self.assertTrue(evidence.integer_tokens)
+        self.assertTrue(evidence.float_tokens)
+
+        evidence = TypeEvidence.from_series(pd.Series(["1.5", "1e3", "inf"]))
+        self.assertFalse(evidence.integer_tokens)
+        self.assertTrue(evidence.float_tokens)
+
+        evidence = TypeEvidence.from_series(pd.Series(["1+2j", "3 - 4j"]))
+        self.assertFalse(evidence.float_tokens)
+        self.assertTrue(evidence.complex_tokens)
+
+    @parameterized.expand(
+        [
+            ([12, 1, 127], "int8", True),
+            ([12, 1, 128], "int8", False),
+            ([12, 1, 128], "int16", True),
+            (["40000", "1"], "int16", False),
+            ([1.9, -128.7], "int8", True),
+            ([1, -999], "int64", False),
+            (["foo", "bar"], "int64", False),
+            ([0, 1, 1], "bool", True),
+            ([0, 2], "bool", False),
+            (["yes", "no"], "bool", True),
+            ([1.5, np.nan], "float64", False),
+            (["1.5", "2"], "float32", True),
+            (["1+2j"], "complex128", True),
+            (["foo"], "complex128", False),
+        ]
+    )
+    def test_checks(self, values: list, type_name: str, expected: bool) -> None:
+        """
+        Test that the registered checks only rule out conversions that cannot succeed.
+        """
+        evidence = TypeEvidence.from_series(pd.Series(values))
+
+        self.assertEqual(CHECK_LOOKUP[type_name](evidence), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
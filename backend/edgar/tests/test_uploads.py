@@ -0,0 +1,85 @@
+import hashlib
+from tempfile import mkdtemp
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from edgar.ingest import ingest_file
+from edgar.models import READY, File
+from edgar.retype import retype_column
+from edgar.uploads import content_hash, copy_sheet, find_duplicate
+import unittest
+
+CSV = b"Name,Score\nAlice,90\nBob,29\n"
+
+
+@override_settings(MEDIA_ROOT=mkdtemp())
+class TestUploads(TestCase):
+    """
+    Test cases for the deduplication of uploads by their content.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up an ingested sheet, with the hash of its content.
+        """
+        self.digest = hashlib.sha256(CSV).hexdigest()
+        self.file: File = File.objects.create(
+            file=SimpleUploadedFile("first.csv", CSV),
+            file_name="first",
+            content_hash=self.digest,
+            state=READY,
+        )
+        ingest_file(self.file)
+
+    def test_content_hash(self) -> None:
+        """
+        Test that files received by other upload handlers are hashed from their content.
+        """
+        self.assertEqual(
+            content_hash(SimpleUploadedFile("other.csv", CSV)), self.digest
+        )
+
+    def test_copy_sheet(self) -> None:
+        """
+        Test that a copy shares the stored upload and snapshot, and has the same columns.
+        """
+        copy = copy_sheet(find_duplicate(self.digest), "second.csv")
+
+        self.assertNotEqual(copy.pk, self.file.pk)
+        self.assertEqual(copy.file.name, self.file.file.name)
+        self.assertEqual(copy.snapshot.name, self.file.snapshot.name)
+        self.assertEqual(copy.number_of_records, 2)
+        self.assertEqual(
+            list(copy.columns.values_list("name", "data_type", "profile")),
+            list(self.file.columns.values_list("name", "data_type", "profile")),
+        )
+
+    def test_retyped_sheets_are_not_reused(self) -> None:
+        """
+        Test that sheets whose columns were retyped are not reused for new uploads.
+        """
+        self.assertIsNone(find_duplicate(hashlib.sha256(b"other").hexdigest()))
+
+        retype_column(
+            self.file.columns.select_related("file").get(name="Score"), "float64"
+        )
+
+        self.assertIsNone(find_duplicate(self.digest))
+
+    def test_shared_snapshot_is_kept(self) -> None:
+        """
+        Test that retyping a copy keeps the snapshot it shared with the original sheet.
+        """
+        copy = copy_sheet(self.file, "second.csv")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            retype_column(
+                copy.columns.select_related("file").get(name="Score"), "object"
+            )
+        copy.refresh_from_db()
+
+        self.assertNotEqual(copy.snapshot.name, self.file.snapshot.name)
+        self.assertTrue(self.file.snapshot.storage.exists(self.file.snapshot.name))
+
+
+if __name__ == "__main__":
+    unittest.main()
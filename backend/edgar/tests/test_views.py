@@ -1,15 +1,31 @@
-from django.test import TestCase, Client
+from tempfile import mkdtemp
+import pyarrow
+import pyarrow.ipc
+import pyarrow.parquet
+import orjson
+from io import BytesIO
+from unittest import mock, skipUnless
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
 from django.utils import timezone
 from django.urls import reverse
 from rest_framework import status
 from pathlib import Path
 from parameterized import parameterized
 from edgar.conversions import SUPPORTED_TYPES
-from edgar.models import File, Column
+from edgar.frame_cache import FRAME_CACHE
+from edgar.query import QUERY_CACHE
+from edgar.metadata import COLUMN_CACHE
+from edgar.jobs import work
+from edgar.models import READY, File, Column
+from edgar.ingest import ingest_file
+from edgar.retype import RetypeConflict
+from edgar.sql import AVAILABLE as SQL_AVAILABLE
 
 TEST_FILE_DIRECTORY = Path(__file__).resolve().parent / "test_files"
 
 
+@override_settings(EDGAR_BACKGROUND_INGESTION=False)
 class TestViews(TestCase):
     """
     A test suite for the Views
@@ -20,11 +36,15 @@ class TestViews(TestCase):
         Set up necessary objects for tests.
         """
         self.client: Client = Client()
+        FRAME_CACHE.clear()
+        QUERY_CACHE.clear()
+        COLUMN_CACHE.clear()
         file_instance: File = File.objects.create(
             file=str(TEST_FILE_DIRECTORY) + "/test_data.csv",
             file_name="test_data",
             number_of_records=3,
             uploaded_at=timezone.now(),
+            state=READY,
         )
         Column.objects.create(file=file_instance, name="Foo", data_type="int8")
         Column.objects.create(file=file_instance, name="Bar", data_type="object")
@@ -53,6 +73,645 @@ class TestViews(TestCase):
         response = self.client.get(reverse("sheet-get", kwargs={"sheet_id": "1"}))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    @override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_SNAPSHOT_ROW_GROUP_SIZE=2)
+    def test_get_sheet_page(self) -> None:
+        """
+        This test function uploads a sheet and requests a page of it, verifying that the page
+        is served with the inferred types applied.
+
+        """
+        upload = SimpleUploadedFile(
+            "page.csv", b"Name,Score\nAlice,90\nBob,29\nCharlie,93\nDavid,80\nEve,-12\n"
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+
+        response = self.client.get(
+            reverse("sheet-get", kwargs={"sheet_id": sheet["id"]}),
+            {"start_index": 1, "num_records": 3},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["rows"],
+            [
+                {"Name": "Bob", "Score": 29},
+                {"Name": "Charlie", "Score": 93},
+                {"Name": "David", "Score": 80},
+            ],
+        )
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_post_sheet_not_served_while_processing(self) -> None:
+        """
+        This test function uploads a sheet to be processed within the request, verifying that
+        it is not served before its columns are stored.
+
+        """
+        responses = []
+
+        def ingest(file_instance: File, sample_size: int) -> None:
+            sheet_url = reverse("sheet-get", kwargs={"sheet_id": file_instance.pk})
+            responses.append(self.client.get(sheet_url))
+            ingest_file(file_instance, sample_size)
+
+        with mock.patch("edgar.views.ingest_file", side_effect=ingest):
+            response = self.client.post(
+                reverse("sheet-post"),
+                {"file": SimpleUploadedFile("sync.csv", b"Name\nAlice\n")},
+            )
+
+        self.assertEqual(responses[0].status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.json()["state"], "ready")
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_post_sheet_duplicate(self) -> None:
+        """
+        This test function uploads the same content twice, verifying that the second upload
+        reuses the stored upload, snapshot and columns of the first without processing it.
+
+        """
+        content = b"Name,Score\nAlice,90\nBob,29\n"
+        first = self.client.post(
+            reverse("sheet-post"), {"file": SimpleUploadedFile("first.csv", content)}
+        ).json()
+
+        with mock.patch("edgar.views.ingest_file") as ingest_file:
+            response = self.client.post(
+                reverse("sheet-post"),
+                {"file": SimpleUploadedFile("second.csv", content)},
+            )
+        second = response.json()
+
+        ingest_file.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(second["id"], first["id"])
+        self.assertEqual(
+            (second["file"], second["file_name"], second["content_hash"]),
+            (first["file"], "second.csv", first["content_hash"]),
+        )
+        self.assertEqual(
+            [column["data_type"] for column in second["columns"]],
+            [column["data_type"] for column in first["columns"]],
+        )
+        response = self.client.get(
+            reverse("sheet-get", kwargs={"sheet_id": second["id"]})
+        )
+        self.assertEqual(
+            response.json()["rows"],
+            [{"Name": "Alice", "Score": 90}, {"Name": "Bob", "Score": 29}],
+        )
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_post_sheet_sampled_inference(self) -> None:
+        """
+        This test function uploads a sheet with sampled inference on, verifying that the columns
+        record where their type came from.
+
+        """
+        upload = SimpleUploadedFile(
+            "sampled.csv", b"Grade,Score\nA,90\nA,29\nB,93\nA,80\n"
+        )
+        response = self.client.post(
+            reverse("sheet-post"),
+            {"file": upload, "sampled_inference": "true", "sample_size": 2},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            {
+                column["name"]: column["type_source"]
+                for column in response.json()["columns"]
+            },
+            {"Grade": "full", "Score": "sample"},
+        )
+
+    @override_settings(
+        MEDIA_ROOT=mkdtemp(),
+        EDGAR_STREAMING_INGESTION_THRESHOLD=0,
+        EDGAR_INGESTION_CHUNK_SIZE=2,
+    )
+    def test_post_sheet_streaming(self) -> None:
+        """
+        This test function uploads a sheet that is ingested chunk by chunk, verifying that its
+        types widen over the chunks and that it is served like any other sheet.
+
+        """
+        upload = SimpleUploadedFile(
+            "streamed.csv", b"Name,Score\nAlice,90\nBob,29\nCharlie,930\nDavid,80\n"
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+
+        self.assertEqual(sheet["number_of_records"], 4)
+        self.assertEqual(
+            {column["name"]: column["data_type"] for column in sheet["columns"]},
+            {"Name": "object", "Score": "int16"},
+        )
+
+        response = self.client.get(
+            reverse("sheet-get", kwargs={"sheet_id": sheet["id"]}),
+            {"start_index": 2, "num_records": 2},
+        )
+        self.assertEqual(
+            response.json()["rows"],
+            [{"Name": "Charlie", "Score": 930}, {"Name": "David", "Score": 80}],
+        )
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_datetime_format_is_stored(self) -> None:
+        """
+        This test function uploads a sheet with dates, verifying that the detected format is
+        stored with the column, cleared when it is retyped and detected again when it is retyped
+        back to a datetime.
+
+        """
+        upload = SimpleUploadedFile(
+            "dates.csv",
+            b"Name,Joined\nAlice,19/03/2024 10:00\nBob,01/12/2023 08:30\n"
+            b"Charlie,13/05/2022 12:00\nDavid,28/02/2021 18:45\n",
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+        joined = next(
+            column for column in sheet["columns"] if column["name"] == "Joined"
+        )
+
+        self.assertEqual(joined["data_type"], "datetime64[ns]")
+        self.assertEqual(joined["datetime_format"], "%d/%m/%Y %H:%M")
+
+        for data_type, datetime_format in [
+            ("object", ""),
+            ("datetime64[ns]", "%d/%m/%Y %H:%M"),
+        ]:
+            response = self.client.put(
+                reverse("column-update", kwargs={"column_id": joined["id"]}),
+                {"data_type": data_type},
+                content_type="application/json",
+            )
+            self.assertEqual(response.json()["datetime_format"], datetime_format)
+
+        response = self.client.get(
+            reverse("sheet-get", kwargs={"sheet_id": sheet["id"]}),
+            {"start_index": 1, "num_records": 1},
+        )
+        self.assertEqual(
+            response.json()["rows"], [{"Name": "Bob", "Joined": "2023-12-01T08:30:00"}]
+        )
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_get_sheet_cached(self) -> None:
+        """
+        This test function pages through a sheet, verifying that later pages are served from
+        the cache of typed sheets and that changing the type of a column invalidates it.
+
+        """
+        upload = SimpleUploadedFile("cached.csv", b"Name,Score\nAlice,90\nBob,29\n")
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+        url = reverse("sheet-get", kwargs={"sheet_id": sheet["id"]})
+
+        for start_index in [0, 1, 0]:
+            self.client.get(url, {"start_index": start_index, "num_records": 1})
+        stats = self.client.get(reverse("cache-stats")).json()
+        self.assertEqual((stats["hits"], stats["misses"], stats["frames"]), (2, 1, 1))
+
+        score = next(column for column in sheet["columns"] if column["name"] == "Score")
+        self.client.put(
+            reverse("column-update", kwargs={"column_id": score["id"]}),
+            {"data_type": "float64"},
+            content_type="application/json",
+        )
+        response = self.client.get(url, {"start_index": 1, "num_records": 1})
+
+        self.assertEqual(response.json()["rows"], [{"Name": "Bob", "Score": 29.0}])
+        self.assertEqual(self.client.get(reverse("cache-stats")).json()["misses"], 2)
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_get_sheet_columns(self) -> None:
+        """
+        This test function requests a subset of the columns of a sheet, verifying that only
+        those are returned and that unknown columns are rejected.
+
+        """
+        upload = SimpleUploadedFile(
+            "columns.csv", b"Name,Score,Passed\nAlice,90,yes\nBob,29,no\n"
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+        url = reverse("sheet-get", kwargs={"sheet_id": sheet["id"]})
+
+        response = self.client.get(url, {"columns": ["Passed", "Score"]})
+        self.assertEqual(
+            response.json()["rows"],
+            [{"Passed": True, "Score": 90}, {"Passed": False, "Score": 29}],
+        )
+
+        response = self.client.get(url, {"columns": ["Name", "Age"]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_get_sheet_filtered(self) -> None:
+        """
+        This test function filters and sorts a sheet, verifying that pages are taken from the
+        matching records in order and that invalid filters and sorts are rejected.
+
+        """
+        upload = SimpleUploadedFile(
+            "filtered.csv",
+            b"Name,Score\nAlice,90\nBob,29\nCharlie,93\nDavid,\nEve,61\n",
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+        url = reverse("sheet-get", kwargs={"sheet_id": sheet["id"]})
+
+        response = self.client.get(
+            url,
+            {
+                "filter": ["Score:gt:50"],
+                "sort": ["-Score"],
+                "start_index": 1,
+                "num_records": 2,
+            },
+        )
+        self.assertEqual(response.json()["number_of_matches"], 3)
+        self.assertEqual(
+            response.json()["rows"],
+            [{"Name": "Alice", "Score": 90}, {"Name": "Eve", "Score": 61}],
+        )
+
+        for params in [{"filter": "Score:gt:high"}, {"sort": "Age"}]:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_get_sheet_arrow(self) -> None:
+        """
+        This test function requests a page as an Arrow IPC stream, verifying that the columns
+        keep their inferred types, and that errors are still sent as JSON.
+
+        """
+        upload = SimpleUploadedFile(
+            "arrow.csv",
+            b"Name,Score,Joined\nAlice,90,2024-03-19\nBob,,2023-12-01\n"
+            b"Alice,-12,2022-05-13\nAlice,7,2021-02-28\n",
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+        url = reverse("sheet-get", kwargs={"sheet_id": sheet["id"]})
+
+        response = self.client.get(
+            url,
+            {"start_index": 1, "num_records": 2},
+            HTTP_ACCEPT="application/vnd.apache.arrow.stream",
+        )
+        table = pyarrow.ipc.open_stream(response.content).read_all()
+
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.apache.arrow.stream"
+        )
+        self.assertEqual(
+            table.schema.types,
+            [
+                pyarrow.dictionary(pyarrow.int8(), pyarrow.string()),
+                pyarrow.int8(),
+                pyarrow.timestamp("ns"),
+            ],
+        )
+        self.assertEqual(table.column("Score").to_pylist(), [None, -12])
+
+        response = self.client.get(
+            url,
+            {"columns": ["Age"]},
+            HTTP_ACCEPT="application/vnd.apache.arrow.stream",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn("error", response.json())
+
+    @skipUnless(SQL_AVAILABLE, "duckdb is not installed")
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_query_sheet_sql(self) -> None:
+        """
+        This test function runs a SQL query over a sheet, verifying that the result is encoded
+        like sheet pages and that invalid queries are rejected.
+
+        """
+        upload = SimpleUploadedFile(
+            "sql.csv", b"Name,Score\nAlice,90\nBob,29\nAlice,93\n"
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+        url = reverse("sheet-sql", kwargs={"sheet_id": sheet["id"]})
+
+        response = self.client.post(
+            url,
+            {
+                "query": "SELECT Name, sum(Score) AS total FROM sheet GROUP BY Name"
+                " ORDER BY Name"
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(
+            response.json(),
+            {
+                "columns": ["Name", "total"],
+                "rows": [{"Name": "Alice", "total": 183}, {"Name": "Bob", "total": 29}],
+                "truncated": False,
+            },
+        )
+
+        for query in ["DROP VIEW sheet", "SELECT Age FROM sheet", ""]:
+            response = self.client.post(
+                url, {"query": query}, content_type="application/json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_sheet_sql_unavailable(self) -> None:
+        """
+        This test function verifies that SQL queries respond with 501 Not Implemented when
+        DuckDB is not installed.
+
+        """
+        with mock.patch("edgar.views.SQL_AVAILABLE", False):
+            response = self.client.post(
+                reverse("sheet-sql", kwargs={"sheet_id": 1}),
+                {"query": "SELECT 1"},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    @skipUnless(SQL_AVAILABLE, "duckdb is not installed")
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_query_sheet_sql_remote_storage(self) -> None:
+        """
+        This test function verifies that SQL queries respond with 501 Not Implemented when the
+        snapshot of the sheet is not stored on the local file system.
+
+        """
+        upload = SimpleUploadedFile("remote.csv", b"Name\nAlice\n")
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+
+        with mock.patch("edgar.views.is_queryable", return_value=False):
+            response = self.client.post(
+                reverse("sheet-sql", kwargs={"sheet_id": sheet["id"]}),
+                {"query": "SELECT * FROM sheet"},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_get_sheet_stats(self) -> None:
+        """
+        This test function requests the profiles of the columns of a sheet, verifying that they
+        are computed at upload and recomputed when a column is retyped.
+
+        """
+        upload = SimpleUploadedFile(
+            "stats.csv", b"Name,Score\nAlice,90\nBob,29\nAlice,\nDavid,80\n"
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+        url = reverse("sheet-stats", kwargs={"sheet_id": sheet["id"]})
+
+        profiles = {
+            column["name"]: column["profile"]
+            for column in self.client.get(url).json()["columns"]
+        }
+        self.assertEqual(
+            profiles["Name"]["top"],
+            [
+                {"value": "Alice", "count": 2},
+                {"value": "Bob", "count": 1},
+                {"value": "David", "count": 1},
+            ],
+        )
+        self.assertEqual(
+            (profiles["Score"]["nulls"], profiles["Score"]["min"]), (1, 29.0)
+        )
+
+        score = next(column for column in sheet["columns"] if column["name"] == "Score")
+        self.client.put(
+            reverse("column-update", kwargs={"column_id": score["id"]}),
+            {"data_type": "object"},
+            content_type="application/json",
+        )
+        profiles = {
+            column["name"]: column["profile"]
+            for column in self.client.get(url).json()["columns"]
+        }
+        self.assertIsNone(profiles["Score"]["min"])
+        self.assertEqual(len(profiles["Score"]["top"]), 3)
+
+    @override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_SNAPSHOT_ROW_GROUP_SIZE=2)
+    def test_get_sheet_export(self) -> None:
+        """
+        This test function exports a sheet spanning several row groups in every format,
+        verifying that every record is streamed with the types of the columns applied.
+
+        """
+        upload = SimpleUploadedFile(
+            "export.csv",
+            b"Name,Score\nAlice,90\nBob,\nCharlie,93\nDavid,80\nEve,-12\n",
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+
+        def export(export_format: str) -> bytes:
+            response = self.client.get(
+                reverse(
+                    "sheet-export",
+                    kwargs={"sheet_id": sheet["id"], "export_format": export_format},
+                )
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.streaming)
+            return b"".join(response.streaming_content)
+
+        self.assertEqual(
+            export("csv"),
+            b"Name,Score\nAlice,90\nBob,\nCharlie,93\nDavid,80\nEve,-12\n",
+        )
+        lines = export("ndjson").splitlines()
+        self.assertEqual(
+            [orjson.loads(line) for line in lines[:2]],
+            [{"Name": "Alice", "Score": 90}, {"Name": "Bob", "Score": None}],
+        )
+        self.assertEqual(len(lines), 5)
+        table = pyarrow.parquet.read_table(BytesIO(export("parquet")))
+        self.assertEqual(table.schema.field("Score").type, pyarrow.int8())
+        self.assertEqual(table.column("Score").to_pylist(), [90, None, 93, 80, -12])
+
+        response = self.client.get(
+            reverse(
+                "sheet-export",
+                kwargs={"sheet_id": sheet["id"], "export_format": "xml"},
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_query_counts(self) -> None:
+        """
+        This test function verifies the number of queries each endpoint reading or retyping a
+        sheet runs, so they do not grow with the number of columns.
+
+        """
+        upload = SimpleUploadedFile(
+            "queries.csv", b"Name,Score,Passed,Joined\nAlice,90,yes,2024-03-19\n"
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+        sheet_url = reverse("sheet-get", kwargs={"sheet_id": sheet["id"]})
+        column_url = reverse(
+            "column-update", kwargs={"column_id": sheet["columns"][1]["id"]}
+        )
+
+        # The file, then its columns until they are cached.
+        with self.assertNumQueries(2):
+            self.client.get(sheet_url)
+        with self.assertNumQueries(1):
+            self.client.get(sheet_url, {"columns": ["Name"]})
+        with self.assertNumQueries(1):
+            self.client.get(
+                sheet_url, HTTP_ACCEPT="application/vnd.apache.arrow.stream"
+            )
+
+        # The column with its file, the uniqueness validation, then within a savepoint the
+        # swap of the snapshot along with the version bump and the update of the column.
+        with self.assertNumQueries(6):
+            self.client.put(
+                column_url, {"data_type": "float64"}, content_type="application/json"
+            )
+        # The column with its file and the uniqueness validation, when the conversion fails.
+        with self.assertNumQueries(2):
+            self.client.put(
+                column_url, {"data_type": "bool"}, content_type="application/json"
+            )
+
+        # The columns are read again once their types change.
+        with self.assertNumQueries(2):
+            self.client.get(sheet_url)
+        with self.assertNumQueries(1):
+            b"".join(
+                self.client.get(
+                    reverse(
+                        "sheet-export",
+                        kwargs={"sheet_id": sheet["id"], "export_format": "csv"},
+                    )
+                ).streaming_content
+            )
+
+    @override_settings(MEDIA_ROOT=mkdtemp())
+    def test_update_column_types(self) -> None:
+        """
+        This test function retypes several columns of a sheet at once, verifying that the
+        columns that convert are updated together and that every other one reports why not.
+
+        """
+        upload = SimpleUploadedFile(
+            "batch.csv", b"Name,Score,Rank\nAlice,90,1\nBob,29,2\n"
+        )
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+        ids = {column["name"]: str(column["id"]) for column in sheet["columns"]}
+
+        response = self.client.put(
+            reverse("sheet-columns-update", kwargs={"sheet_id": sheet["id"]}),
+            {
+                ids["Score"]: "float64",
+                ids["Rank"]: "category",
+                ids["Name"]: "int8",
+                "999": "int8",
+            },
+            content_type="application/json",
+        )
+        results = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(results[ids["Score"]]["updated"])
+        self.assertEqual(results[ids["Rank"]]["column"]["data_type"], "category")
+        self.assertFalse(results[ids["Name"]]["updated"])
+        self.assertEqual(results[ids["Name"]]["column"]["data_type"], "object")
+        self.assertIn("error", results["999"])
+        self.assertEqual(File.objects.get(pk=sheet["id"]).types_version, 1)
+
+        rows = self.client.get(
+            reverse("sheet-get", kwargs={"sheet_id": sheet["id"]})
+        ).json()["rows"]
+        self.assertEqual(rows[1], {"Name": "Bob", "Score": 29.0, "Rank": 2})
+
+        response = self.client.put(
+            reverse("sheet-columns-update", kwargs={"sheet_id": sheet["id"]}),
+            ["float64"],
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with mock.patch(
+            "edgar.retype.save_retyped_columns",
+            side_effect=RetypeConflict("The columns of the sheet were changed."),
+        ):
+            response = self.client.put(
+                reverse("sheet-columns-update", kwargs={"sheet_id": sheet["id"]}),
+                {ids["Score"]: "float32"},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    @parameterized.expand([({"sampled_inference": "maybe"},), ({"sample_size": 0},)])
+    def test_post_sheet_invalid_sampling(self, parameters: dict) -> None:
+        """
+        This test function verifies that invalid sampled inference parameters are rejected.
+
+        """
+        upload = SimpleUploadedFile("sampled.csv", b"Name\nAlice\n")
+        response = self.client.post(
+            reverse("sheet-post"),
+            {"file": upload, "sampled_inference": "true", **parameters},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_BACKGROUND_INGESTION=True)
+    def test_post_sheet_background(self) -> None:
+        """
+        This test function uploads a sheet to be processed in the background, verifying that it
+        is accepted right away, and served once a worker has processed it.
+
+        """
+        upload = SimpleUploadedFile(
+            "queued.csv", b"Name,Score\nAlice,90\nBob,29\nCharlie,93\n"
+        )
+        response = self.client.post(reverse("sheet-post"), {"file": upload})
+        sheet = response.json()
+        sheet_url = reverse("sheet-get", kwargs={"sheet_id": sheet["id"]})
+        job_url = reverse("job-get", kwargs={"job_id": sheet["job"]})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(sheet["state"], "processing")
+        self.assertEqual(self.client.get(job_url).json()["state"], "queued")
+        self.assertEqual(
+            self.client.get(sheet_url).status_code, status.HTTP_409_CONFLICT
+        )
+
+        work(poll_interval=0, burst=True)
+
+        job = self.client.get(job_url).json()
+        self.assertEqual(job["state"], "done")
+        self.assertEqual(job["rows_processed"], 3)
+        self.assertEqual(job["number_of_records"], 3)
+        response = self.client.get(sheet_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["rows"]), 3)
+
+    @override_settings(MEDIA_ROOT=mkdtemp(), EDGAR_BACKGROUND_INGESTION=True)
+    def test_post_sheet_background_failure(self) -> None:
+        """
+        This test function uploads a file that cannot be parsed, verifying that its job reports
+        the error.
+
+        """
+        upload = SimpleUploadedFile("broken.xlsx", b"not a spreadsheet")
+        sheet = self.client.post(reverse("sheet-post"), {"file": upload}).json()
+
+        work(poll_interval=0, burst=True)
+
+        job = self.client.get(reverse("job-get", kwargs={"job_id": sheet["job"]}))
+        self.assertEqual(job.json()["state"], "failed")
+        self.assertTrue(job.json()["error"])
+        self.assertEqual(File.objects.get(pk=sheet["id"]).state, "failed")
+
     def test_get_supported_types(self) -> None:
         """
         This test function simulates requesting supported data types using the supported-data-types view
@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+
+import numpy
+import pandas
+import pyarrow
+import pyarrow.compute
+from pandas import Series
+from pandas.api.types import infer_dtype
+
+from edgar.conversions import (
+    BOOL_VARIABLE_MAP,
+    COMPLEX_PATTERN,
+    parse_supported_none_values,
+    supported_none_mask,
+)
+
+"""
+Evidence about the values of a column, gathered in a single pass for type inference.
+
+The evidence classifies a column by the kind of values it holds (booleans, integers, floats,
+strings, ...) and records the statistics the registered type checks need, such as the range of
+numeric values or whether every string looks like an integer. A type check uses the evidence to
+rule out a conversion without attempting it, so inference only runs the conversions that can
+succeed.
+"""
+
+SPACE = r"[\s\p{Z}]*"
+DIGITS = r"[\p{Nd}_]+"
+INTEGER_PATTERN = rf"^{SPACE}[-+]?{DIGITS}{SPACE}$"
+FLOAT_PATTERN = (
+    rf"^{SPACE}[-+]?"
+    rf"((({DIGITS})?\.?{DIGITS}|{DIGITS}\.)([eE][-+]?{DIGITS})?|inf|infinity|nan)"
+    rf"{SPACE}$"
+)
+COMPLEX_TOKEN_PATTERN = COMPLEX_PATTERN.pattern.replace(r"\d", r"\p{Nd}").replace(
+    r"\s", r"[\s\p{Z}]"
+)
+
+KINDS = {
+    "b": "bool",
+    "i": "integer",
+    "u": "integer",
+    "f": "float",
+    "c": "complex",
+    "m": "timedelta",
+    "M": "datetime",
+}
+
+
+@dataclass
+class TypeEvidence:
+    """
+    Evidence about the values of a column, after the supported None types have been parsed.
+
+    Attributes:
+    - length (int): The number of values in the column.
+    - null_count (int): The number of values that are one of the supported None types.
+    - kind (str): The kind of the non-null values. One of "bool", "integer", "float", "complex",
+        "timedelta", "datetime", "string", "empty" (only nulls) or "mixed".
+    - minimum (Optional[float]): The smallest numeric value, when known.
+    - maximum (Optional[float]): The largest numeric value, when known.
+    - bool_tokens (bool): Whether every string value is a boolean token.
+    - integer_tokens (bool): Whether every string value looks like an integer.
+    - float_tokens (bool): Whether every string value looks like a float.
+    - complex_tokens (bool): Whether every string value looks like a complex number.
+    """
+
+    length: int
+    null_count: int
+    kind: str
+    minimum: float | None = None
+    maximum: float | None = None
+    bool_tokens: bool = False
+    integer_tokens: bool = False
+    float_tokens: bool = False
+    complex_tokens: bool = False
+
+    @classmethod
+    def from_series(cls, series: Series) -> "TypeEvidence":
+        """
+        Gathers the evidence for a column.
+
+        Parameters:
+        - series (pandas.Series): The column to gather evidence for.
+
+        Returns:
+        - TypeEvidence: The evidence about the column.
+        """
+        parsed = parse_supported_none_values(series)
+        evidence = cls(
+            length=len(series),
+            null_count=int(supported_none_mask(series).sum()),
+            kind=KINDS.get(parsed.dtype.kind, "mixed"),
+        )
+
+        if evidence.kind in ("integer", "float"):
+            values = parsed.to_numpy()
+            values = (
+                values[~numpy.isnan(values)] if evidence.kind == "float" else values
+            )
+            if len(values):
+                evidence.minimum = values.min()
+                evidence.maximum = values.max()
+        elif evidence.kind == "mixed":
+            inferred = infer_dtype(parsed, skipna=True)
+            if inferred == "empty":
+                evidence.kind = "empty"
+            elif inferred == "string":
+                evidence.kind = "string"
+                evidence._gather_string_evidence(parsed)
+
+        return evidence
+
+    def _gather_string_evidence(self, parsed: Series) -> None:
+        """
+        Classifies the string values of a column against the patterns each type accepts.
+
+        Parameters:
+        - parsed (pandas.Series): The column of strings, with None types parsed.
+        """
+        strings = pyarrow.array(
+            parsed, type=pyarrow.string(), from_pandas=True
+        ).drop_null()
+        lowered = pyarrow.compute.utf8_lower(strings)
+
+        def all_match(matches: pyarrow.Array) -> bool:
+            return pyarrow.compute.all(matches).as_py()
+
+        self.bool_tokens = all_match(
+            pyarrow.compute.is_in(
+                lowered, value_set=pyarrow.array(list(BOOL_VARIABLE_MAP.keys()))
+            )
+        )
+        self.integer_tokens = all_match(
+            pyarrow.compute.match_substring_regex(strings, INTEGER_PATTERN)
+        )
+        self.float_tokens = self.integer_tokens or all_match(
+            pyarrow.compute.match_substring_regex(lowered, FLOAT_PATTERN)
+        )
+        self.complex_tokens = all_match(
+            pyarrow.compute.match_substring_regex(strings, COMPLEX_TOKEN_PATTERN)
+        )
+
+        if self.integer_tokens:
+            numbers = pandas.to_numeric(parsed, errors="coerce")
+            if numbers.dtype.kind == "i":
+                self.minimum = numbers.min()
+                self.maximum = numbers.max()
+
+    def fits(self, minimum: float, maximum: float) -> bool:
+        """
+        Checks whether the numeric values of the column lie within a range.
+
+        Values are truncated toward zero first, as they are when cast to an integer type. A column
+        whose range is unknown is assumed to fit.
+
+        Parameters:
+        - minimum (float): The lower bound of the range.
+        - maximum (float): The upper bound of the range.
+
+        Returns:
+        - bool: False if some value is known to lie outside of the range.
+        """
+        if self.minimum is None or self.maximum is None:
+            return True
+        return (
+            numpy.trunc(self.minimum) >= minimum
+            and numpy.trunc(self.maximum) <= maximum
+        )
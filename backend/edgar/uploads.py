@@ -0,0 +1,164 @@
+import hashlib
+
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+from django.db import transaction
+
+from edgar.infer_data_types import SUPPLIED
+from edgar.ingest import create_columns
+from edgar.models import READY, Column, File
+
+"""
+Deduplication of uploads by their content.
+
+Uploads are hashed with SHA-256 while they are received, by the upload handlers set in
+`FILE_UPLOAD_HANDLERS`, so the hash costs no extra read. When a sheet with the same content has
+already been processed, the new sheet reuses the stored upload, the snapshot and the inferred
+columns of that sheet by reference: nothing is parsed, inferred or written but the rows of the
+new `File` and its columns.
+
+Only sheets whose columns all have inferred types are reused, so a repeated upload gets the types
+inference would give it, whatever the types of earlier copies were changed to. Stored uploads
+and snapshots can be shared between sheets, so they are only deleted once no sheet refers to
+them.
+"""
+
+
+class _ContentHashMixin:
+    """
+    Hashes the uploads an upload handler stores, setting `content_hash` on the uploaded files.
+    """
+
+    def new_file(self, *args, **kwargs) -> None:
+        # Set first, as the memory handler stops the handlers after it by raising.
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes | None:
+        if self.stores_upload():
+            self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size: int) -> UploadedFile | None:
+        file_object = super().file_complete(file_size)
+        if file_object is not None:
+            file_object.content_hash = self.hasher.hexdigest()
+        return file_object
+
+    def stores_upload(self) -> bool:
+        return True
+
+
+class HashingMemoryFileUploadHandler(_ContentHashMixin, MemoryFileUploadHandler):
+    """
+    Keeps small uploads in memory, hashing them as they are received.
+    """
+
+    def stores_upload(self) -> bool:
+        # Uploads too large for memory are passed on to the next handler, which hashes them.
+        return self.activated
+
+
+class HashingTemporaryFileUploadHandler(_ContentHashMixin, TemporaryFileUploadHandler):
+    """
+    Streams uploads to a temporary file, hashing them as they are received.
+    """
+
+
+def content_hash(file_object: UploadedFile) -> str:
+    """
+    Finds the SHA-256 hash of the content of an uploaded file.
+
+    Parameters:
+    - file_object (UploadedFile): The uploaded file.
+
+    Returns:
+    - str: The hexadecimal hash, as computed while the file was received, or read from the
+        file for files received by other upload handlers.
+    """
+    digest = getattr(file_object, "content_hash", None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in file_object.chunks():
+            hasher.update(chunk)
+        file_object.seek(0)
+        digest = hasher.hexdigest()
+    return digest
+
+
+def find_duplicate(digest: str) -> File | None:
+    """
+    Finds a processed sheet with the same content as an upload.
+
+    Parameters:
+    - digest (str): The hash of the content of the upload.
+
+    Returns:
+    - Optional[File]: The latest ready sheet with that content, a snapshot and only inferred
+        column types, if any.
+    """
+    return (
+        File.objects.filter(content_hash=digest, state=READY)
+        .exclude(snapshot="")
+        .exclude(columns__type_source=SUPPLIED)
+        .order_by("-pk")
+        .first()
+    )
+
+
+def copy_sheet(source: File, file_name: str) -> File:
+    """
+    Creates a sheet sharing the stored upload, snapshot and inferred columns of another.
+
+    Parameters:
+    - source (File): The processed sheet with the same content.
+    - file_name (str): The name the new sheet was uploaded as.
+
+    Returns:
+    - File: The new sheet, ready to be read.
+    """
+    with transaction.atomic():
+        file_instance = File.objects.create(
+            file=source.file.name,
+            snapshot=source.snapshot.name,
+            content_hash=source.content_hash,
+            row_offsets=source.row_offsets,
+            row_index_stride=source.row_index_stride,
+            file_name=file_name,
+            number_of_records=source.number_of_records,
+            state=READY,
+        )
+        create_columns(
+            [
+                Column(
+                    file=file_instance,
+                    name=column.name,
+                    data_type=column.data_type,
+                    type_source=column.type_source,
+                    datetime_format=column.datetime_format,
+                    profile=column.profile,
+                )
+                for column in source.columns.order_by("pk")
+            ]
+        )
+    return file_instance
+
+
+def is_shared(field_name: str, name: str, file_instance: File) -> bool:
+    """
+    Checks whether a stored file is referred to by sheets other than a given one.
+
+    Parameters:
+    - field_name (str): `file` for stored uploads, or `snapshot` for snapshots.
+    - name (str): The name of the stored file.
+    - file_instance (File): The sheet to leave out.
+
+    Returns:
+    - bool: Whether another sheet refers to the stored file.
+    """
+    return (
+        File.objects.filter(**{field_name: name}).exclude(pk=file_instance.pk).exists()
+    )
@@ -1,15 +1,40 @@
 from django.urls import path
-from edgar.views import post_sheet, get_sheet, get_supported_types, update_column_type
+from edgar.views import (
+    post_sheet,
+    get_sheet,
+    get_sheet_export,
+    query_sheet_sql,
+    get_sheet_stats,
+    get_job,
+    get_cache_stats,
+    get_supported_types,
+    update_column_type,
+    update_column_types,
+)
 
 
 urlpatterns = [
     path("sheets/", post_sheet, name="sheet-post"),
     path("sheets/<int:sheet_id>/", get_sheet, name="sheet-get"),
+    path(
+        "sheets/<int:sheet_id>/export/<str:export_format>/",
+        get_sheet_export,
+        name="sheet-export",
+    ),
+    path("sheets/<int:sheet_id>/sql/", query_sheet_sql, name="sheet-sql"),
+    path("sheets/<int:sheet_id>/stats/", get_sheet_stats, name="sheet-stats"),
+    path(
+        "sheets/<int:sheet_id>/columns/",
+        update_column_types,
+        name="sheet-columns-update",
+    ),
+    path("jobs/<int:job_id>/", get_job, name="job-get"),
     path(
         "columns/<int:column_id>",
         update_column_type,
         name="column-update",
     ),
+    path("cache/", get_cache_stats, name="cache-stats"),
     path(
         "supported-types/",
         get_supported_types,
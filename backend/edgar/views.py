@@ -1,20 +1,66 @@
 import pandas
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.exceptions import ValidationError as SerializerValidationError
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.request import HttpRequest
 from rest_framework.response import Response
 
-from edgar.models import File, Column
+from edgar.models import PROCESSING, READY, File, Column, Job
 from edgar.serializers import (
     FileSerializer,
     ColumnSerializer,
+    ColumnProfileSerializer,
     GetFileSerializer,
+    JobSerializer,
     SupportedTypesSerializer,
+    column_metadata,
 )
-from edgar.conversions import SUPPORTED_TYPES, FUNCTION_LOOKUP
-from edgar.infer_data_types import infer_and_convert_data_types
+from edgar.conversions import (
+    BOOL_VARIABLE_MAP,
+    SUPPORTED_TYPES,
+)
+from edgar.frame_cache import FRAME_CACHE
+from edgar.export import CONTENT_TYPES, export_sheet
+from edgar.ingest import ingest_file
+from edgar.query import parse_filters, parse_sort
+from edgar.renderers import ArrowRenderer, ORJSONRenderer, records
+from edgar.retype import RetypeConflict, retype_column, retype_columns
+from edgar.sql import AVAILABLE as SQL_AVAILABLE, QueryTimeout, is_queryable, query_sql
+from edgar.uploads import content_hash, copy_sheet, find_duplicate
+
+
+def _inference_sample_size(request: HttpRequest) -> int | None:
+    """
+    Reads the sampled inference parameters of an upload, falling back to the settings.
+
+    Args:
+        request (HttpRequest): The HTTP request object, optionally holding `sampled_inference`
+        and `sample_size`.
+
+    Returns:
+        int | None: The sample size to infer types from, or None to infer them from whole columns.
+
+    Raises:
+        ValueError: If a parameter is not a boolean or a positive integer respectively.
+    """
+    sampled_inference = request.data.get(
+        "sampled_inference", settings.EDGAR_SAMPLED_INFERENCE
+    )
+    sampled_inference = BOOL_VARIABLE_MAP.get(str(sampled_inference).lower())
+    if sampled_inference is None:
+        raise ValueError("sampled_inference must be a boolean.")
+    if not sampled_inference:
+        return None
+
+    sample_size = request.data.get("sample_size", settings.EDGAR_INFERENCE_SAMPLE_SIZE)
+    if not str(sample_size).isdigit() or int(sample_size) < 1:
+        raise ValueError("sample_size must be a positive integer.")
+    return int(sample_size)
 
 
 @api_view(["POST"])
@@ -23,12 +69,18 @@ def post_sheet(request: HttpRequest) -> Response:
     POST endpoint for uploading a spreadsheet file and processing its data.
 
     Args:
-        request (HttpRequest): The HTTP request object containing the uploaded file.
+        request (HttpRequest): The HTTP request object containing the uploaded file, and
+        optionally the `sampled_inference` and `sample_size` parameters.
 
     Returns:
-        Response: A Response object containing the serialized data of the uploaded file,
-        along with its associated columns, if successful. Returns an error response with
-        appropriate status codes in case of failure.
+        Response: When a sheet with the same content was already processed, a 201 response
+        holding the serialized data of a new sheet sharing its stored upload, snapshot and
+        columns. Otherwise, with `EDGAR_BACKGROUND_INGESTION` on, a 202 response holding the
+        serialized data of the stored file, still processing, along with the id of the job
+        processing it. Otherwise the file is processed right away, and a Response object
+        contains the serialized data of the uploaded file, along with its associated columns,
+        if successful. Returns an error response with appropriate status codes in case of
+        failure.
 
     Raises:
         pd.errors.ParserError: If there's an error parsing the uploaded file.
@@ -42,66 +94,143 @@ def post_sheet(request: HttpRequest) -> Response:
         )
 
     try:
-        dataframe = (
-            pandas.read_csv(file_object)
-            if file_object.name.endswith(".csv")
-            else pandas.read_excel(file_object)
-        )
+        sample_size = _inference_sample_size(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    file_serializer = FileSerializer(
+        data={
+            "file": file_object,
+            "file_name": file_object.name,
+            "number_of_records": 0,
+        }
+    )
+
+    if not file_serializer.is_valid():
+        return Response(file_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        dataframe = infer_and_convert_data_types(dataframe)
+    digest = content_hash(file_object)
+    duplicate = find_duplicate(digest)
+    if duplicate is not None:
+        file_instance = copy_sheet(duplicate, file_object.name)
+        return Response(
+            FileSerializer(file_instance).data, status=status.HTTP_201_CREATED
+        )
 
-        file_serializer = FileSerializer(
-            data={
-                "file": file_object,
-                "file_name": file_object.name,
-                "number_of_records": len(dataframe),
-            }
+    if settings.EDGAR_BACKGROUND_INGESTION:
+        file_instance = file_serializer.save(state=PROCESSING, content_hash=digest)
+        job = Job.objects.create(file=file_instance, sample_size=sample_size)
+        return Response(
+            {**FileSerializer(file_instance).data, "job": job.id},
+            status=status.HTTP_202_ACCEPTED,
         )
 
-        if file_serializer.is_valid():
-            file_instance = file_serializer.save()
-        else:
-            return Response(file_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        for column_name, data_type in dataframe.dtypes.items():
-            column_serializer = ColumnSerializer(
-                data={
-                    "file": file_instance.id,
-                    "name": column_name,
-                    "data_type": data_type.name,
-                }
-            )
-            if column_serializer.is_valid():
-                column_serializer.save()
-            else:
-                return Response(
-                    column_serializer.errors, status=status.HTTP_400_BAD_REQUEST
-                )
+    file_instance = file_serializer.save(content_hash=digest)
 
-        return Response(file_serializer.data, status=status.HTTP_201_CREATED)
+    try:
+        ingest_file(file_instance, sample_size)
+        file_instance.state = READY
+        file_instance.save(update_fields=["state"])
 
-    except pandas.errors.ParserError as e:
+        return Response(
+            FileSerializer(file_instance).data, status=status.HTTP_201_CREATED
+        )
+
+    except (pandas.errors.ParserError, DjangoValidationError) as e:
+        _discard_file(file_instance)
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     except UnicodeDecodeError as e:
+        _discard_file(file_instance)
         return Response({"error": str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
     except Exception as e:
+        _discard_file(file_instance)
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def not_ready_response(
+    file_instance: File, require_snapshot: bool = False
+) -> Response | None:
+    """
+    Builds the response of views reading a sheet that cannot be read yet.
+
+    Args:
+        file_instance (File): The requested sheet.
+        require_snapshot (bool): Whether the view reads the snapshot of the sheet, so a sheet
+            without one cannot be read either.
+
+    Returns:
+        Response | None: A 409 response holding the state of the sheet, or None if the sheet
+        is ready.
+    """
+    if file_instance.state == READY and (
+        file_instance.snapshot or not require_snapshot
+    ):
+        return None
+    if file_instance.state == READY:
+        error = "The sheet has no snapshot."
+    else:
+        error = f"The sheet is not ready: it is {file_instance.state}."
+    return Response(
+        {"error": error, "state": file_instance.state},
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
+def _discard_file(file_instance: File) -> None:
+    """
+    Deletes a file that failed processing, along with everything stored for it.
+
+    Args:
+        file_instance (File): The file to delete.
+    """
+    file_instance.file.delete(save=False)
+    if file_instance.snapshot:
+        file_instance.snapshot.delete(save=False)
+    file_instance.delete()
+
+
 @api_view(["GET"])
+def get_job(request: HttpRequest, job_id: int) -> Response:
+    """
+    Retrieve the status of the background job processing an uploaded file.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        job_id (int): The Id of the job.
+
+    Returns:
+        Response: A Response object containing the state of the job, the number of records
+        processed so far and the error it failed with, if any.
+
+    Raises:
+        Http404: If the job does not exist.
+    """
+    job_instance = get_object_or_404(Job.objects.select_related("file"), pk=job_id)
+
+    return Response(JobSerializer(job_instance).data)
+
+
+@api_view(["GET"])
+@renderer_classes([ORJSONRenderer, ArrowRenderer, BrowsableAPIRenderer])
 def get_sheet(request: HttpRequest, sheet_id: str) -> Response:
     """
     Retrieve details of a specific spreadsheet file.
 
     Args:
-        request (HttpRequest): The HTTP request object.
-        sheet_id (str): The unique identifier of the spreadsheet file.
+        request (HttpRequest): The HTTP request object, optionally holding `start_index`,
+        `num_records` and `columns`, repeated for each column to return. It may also hold
+        `filter`, as `column:operator:value`, and `sort`, as a column name with a leading `-`
+        for descending order, each repeated as needed.
 
     Returns:
         Response: A Response object containing serialized data of the requested
-        spreadsheet file.
+        spreadsheet file, with its values encoded natively in JSON. When filtered, the page is
+        taken from the matching records and `number_of_matches` counts them. When the request
+        accepts `application/vnd.apache.arrow.stream`, the page alone as an Arrow IPC stream
+        instead. Returns a 400 response if a requested column does not exist, or a filter or
+        sort is invalid.
 
     Raises:
         Http404: If the requested file with the specified sheet_id does not exist
@@ -110,18 +239,95 @@ def get_sheet(request: HttpRequest, sheet_id: str) -> Response:
 
     file_instance = get_object_or_404(File, id=sheet_id)
 
+    not_ready = not_ready_response(file_instance)
+    if not_ready is not None:
+        return not_ready
+
     start_index = request.query_params.get("start_index", 0)
     num_records = request.query_params.get(
         "num_records", file_instance.number_of_records
     )
 
+    columns_data = column_metadata(file_instance)
+    projection = request.query_params.getlist("columns")
+    unknown = set(projection) - {column["name"] for column in columns_data}
+    if unknown:
+        return Response(
+            {"error": f"The sheet has no columns named {sorted(unknown)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    column_types = {column["name"]: column["data_type"] for column in columns_data}
+    try:
+        filters = parse_filters(request.query_params.getlist("filter"), column_types)
+        sort = parse_sort(request.query_params.getlist("sort"), column_types)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     serializer = GetFileSerializer(
-        file_instance, context={"start_index": start_index, "num_records": num_records}
+        file_instance,
+        context={
+            "start_index": start_index,
+            "num_records": num_records,
+            "columns": projection,
+            "filters": filters,
+            "sort": sort,
+        },
     )
 
+    if isinstance(request.accepted_renderer, ArrowRenderer):
+        return Response(serializer.read_page(file_instance, columns_data))
+
     return Response(serializer.data)
 
 
+@api_view(["GET"])
+def get_sheet_export(
+    request: HttpRequest, sheet_id: str, export_format: str
+) -> Response | StreamingHttpResponse:
+    """
+    Stream every record of a spreadsheet file, typed as its columns.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        sheet_id (str): The unique identifier of the spreadsheet file.
+        export_format (str): `csv`, `ndjson` or `parquet`.
+
+    Returns:
+        StreamingHttpResponse: The sheet as an attachment in the requested format, streamed one
+        chunk of records at a time. Returns a 400 response for unsupported formats and a 409
+        response for sheets that are not ready.
+
+    Raises:
+        Http404: If the requested file with the specified sheet_id does not exist
+        in the database.
+    """
+    file_instance = get_object_or_404(File, id=sheet_id)
+
+    if export_format not in CONTENT_TYPES:
+        return Response(
+            {
+                "error": f"{export_format} is not a supported export format. "
+                f"Please select from {list(CONTENT_TYPES.keys())}"
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    not_ready = not_ready_response(file_instance)
+    if not_ready is not None:
+        return not_ready
+
+    response = StreamingHttpResponse(
+        export_sheet(file_instance, export_format),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    file_name = file_instance.file_name.rsplit(".", 1)[0]
+    response["Content-Disposition"] = (
+        f'attachment; filename="{file_name}.{export_format}"'
+    )
+    return response
+
+
 @api_view(["GET"])
 def get_supported_types(request: HttpRequest) -> Response:
     """
@@ -146,6 +352,53 @@ def get_supported_types(request: HttpRequest) -> Response:
         )
 
 
+@api_view(["GET"])
+def get_sheet_stats(request: HttpRequest, sheet_id: str) -> Response:
+    """
+    Retrieve the profiles of the columns of a spreadsheet file.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        sheet_id (str): The unique identifier of the spreadsheet file.
+
+    Returns:
+        Response: A Response object containing each column of the sheet with its profile, as
+        computed when the sheet was uploaded or the column last retyped. Returns a 409 response
+        for sheets that are not ready.
+
+    Raises:
+        Http404: If the requested file with the specified sheet_id does not exist
+        in the database.
+    """
+    file_instance = get_object_or_404(File, id=sheet_id)
+
+    not_ready = not_ready_response(file_instance)
+    if not_ready is not None:
+        return not_ready
+
+    serializer = ColumnProfileSerializer(
+        file_instance.columns.order_by("pk"), many=True
+    )
+    return Response(
+        {"id": file_instance.id, "columns": serializer.data}, status=status.HTTP_200_OK
+    )
+
+
+@api_view(["GET"])
+def get_cache_stats(request: HttpRequest) -> Response:
+    """
+    Reports the hits, misses and evictions of the cache of typed sheets pages are served from.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        Response: A Response object containing the counters of the cache, along with the number
+        of sheets it holds and their size in bytes.
+    """
+    return Response(FRAME_CACHE.stats())
+
+
 @api_view(["PUT"])
 def update_column_type(request: HttpRequest, column_id: int) -> Response:
     """
@@ -161,14 +414,17 @@ def update_column_type(request: HttpRequest, column_id: int) -> Response:
     Raises:
         SerializerValidationError: If there's an error during serializer validation.
         ValueError: If the provided column type is invalid or if there's an error during conversion.
+        RetypeConflict: If the sheet was retyped by another request meanwhile, in which case a
+        409 response is returned.
         Exception: If an unexpected error occurs during the update process.
 
     """
     try:
 
         new_type = request.data.get("data_type", None)
-        column_instance = get_object_or_404(Column, pk=column_id)
-        file_instance = get_object_or_404(File, pk=column_instance.file.id)
+        column_instance = get_object_or_404(
+            Column.objects.select_related("file"), pk=column_id
+        )
 
         serializer = ColumnSerializer(
             instance=column_instance, data={"data_type": new_type}, partial=True
@@ -176,20 +432,7 @@ def update_column_type(request: HttpRequest, column_id: int) -> Response:
 
         serializer.is_valid(raise_exception=True)
 
-        conversion_function = FUNCTION_LOOKUP[new_type]
-
-        if file_instance.file.name.endswith(".csv"):
-            dataframe = pandas.read_csv(
-                file_instance.file, usecols=[column_instance.name]
-            )
-        else:
-            dataframe = pandas.read_excel(
-                file_instance.file, usecols=[column_instance.name]
-            )
-
-        conversion_function(dataframe[column_instance.name], force=True)
-
-        serializer.save()
+        retype_column(column_instance, serializer.validated_data["data_type"])
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -201,11 +444,17 @@ def update_column_type(request: HttpRequest, column_id: int) -> Response:
 
     except ValueError as e:
 
-        column_instance = get_object_or_404(Column, pk=column_id)
+        # The column is only modified once converted, so it still holds its previous type.
         column = ColumnSerializer(instance=column_instance)
 
         return Response(column.data, status=status.HTTP_200_OK)
 
+    except RetypeConflict as e:
+        return Response(
+            {"error": str(e), "column_type": column_instance.data_type},
+            status=status.HTTP_409_CONFLICT,
+        )
+
     except Exception as e:
         return Response(
             {
@@ -214,3 +463,148 @@ def update_column_type(request: HttpRequest, column_id: int) -> Response:
             },
             status=status.HTTP_400_BAD_REQUEST,
         )
+
+
+@api_view(["PUT"])
+def update_column_types(request: HttpRequest, sheet_id: str) -> Response:
+    """
+    Update the data types of several columns of a spreadsheet file at once.
+
+    Args:
+        request (HttpRequest): The HTTP request object, whose body maps column ids to their new
+        data types.
+        sheet_id (str): The unique identifier of the spreadsheet file.
+
+    Returns:
+        Response: A Response object mapping each column id of the request to whether it was
+        `updated`, the serialized column and, for columns that were not, the `error`. Returns a
+        400 response if the body is not a mapping, and a 409 response for sheets that are not
+        ready or that were retyped by another request meanwhile.
+
+    Raises:
+        Http404: If the requested file with the specified sheet_id does not exist
+        in the database.
+    """
+    file_instance = get_object_or_404(File, id=sheet_id)
+
+    not_ready = not_ready_response(file_instance)
+    if not_ready is not None:
+        return not_ready
+
+    if not isinstance(request.data, dict) or not request.data:
+        return Response(
+            {"error": "Expected a mapping of column ids to data types."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    columns = {
+        str(column.pk): column
+        for column in file_instance.columns.filter(
+            pk__in=[key for key in request.data.keys() if str(key).isdigit()]
+        )
+    }
+    errors = {}
+    changes = {}
+    for column_id, data_type in request.data.items():
+        column = columns.get(str(column_id))
+        if column is None:
+            errors[str(column_id)] = f"The sheet has no column with id {column_id}."
+        elif data_type not in SUPPORTED_TYPES:
+            errors[str(column_id)] = (
+                f"{data_type} is not a supported data type. "
+                f"Please select from {SUPPORTED_TYPES}"
+            )
+        else:
+            changes[column] = data_type
+
+    if changes:
+        try:
+            retype_errors = retype_columns(
+                file_instance, changes, workers=settings.EDGAR_INFERENCE_WORKERS
+            )
+        except RetypeConflict as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        for column_id, error in retype_errors.items():
+            errors[str(column_id)] = error
+
+    results = {}
+    for column_id in request.data.keys():
+        column_id = str(column_id)
+        result = {"updated": column_id not in errors}
+        if column_id in columns:
+            result["column"] = ColumnSerializer(columns[column_id]).data
+        if column_id in errors:
+            result["error"] = errors[column_id]
+        results[column_id] = result
+
+    return Response(results, status=status.HTTP_200_OK)
+
+
+@api_view(["POST"])
+@renderer_classes([ORJSONRenderer, ArrowRenderer, BrowsableAPIRenderer])
+def query_sheet_sql(request: HttpRequest, sheet_id: str) -> Response:
+    """
+    Run a read-only SQL query over a spreadsheet file, with DuckDB.
+
+    Args:
+        request (HttpRequest): The HTTP request object, whose body holds the `query`: a single
+        SELECT statement reading the sheet as the table `sheet`.
+        sheet_id (str): The unique identifier of the spreadsheet file.
+
+    Returns:
+        Response: A Response object holding the `columns` of the result, its `rows`, and whether
+        it was `truncated` to `EDGAR_SQL_MAX_ROWS` records. When the request accepts
+        `application/vnd.apache.arrow.stream`, the result alone as an Arrow IPC stream instead.
+        Returns a 400 response for invalid queries, a 408 response for queries running longer
+        than `EDGAR_SQL_TIMEOUT` seconds, a 409 response for sheets that are not ready and a 501
+        response when DuckDB is not installed or the snapshot is not stored on the local file
+        system.
+
+    Raises:
+        Http404: If the requested file with the specified sheet_id does not exist
+        in the database.
+    """
+    if not SQL_AVAILABLE:
+        return Response(
+            {"error": "SQL queries need the optional duckdb package to be installed."},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+
+    file_instance = get_object_or_404(File, id=sheet_id)
+
+    not_ready = not_ready_response(file_instance, require_snapshot=True)
+    if not_ready is not None:
+        return not_ready
+
+    if not is_queryable(file_instance):
+        return Response(
+            {"error": "SQL queries need snapshots stored on the local file system."},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+
+    query = request.data.get("query") if isinstance(request.data, dict) else None
+    if not isinstance(query, str) or not query.strip():
+        return Response(
+            {"error": "Expected a SQL query."}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        result, truncated = query_sql(
+            file_instance, column_metadata(file_instance), query
+        )
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except QueryTimeout as e:
+        return Response({"error": str(e)}, status=status.HTTP_408_REQUEST_TIMEOUT)
+
+    if isinstance(request.accepted_renderer, ArrowRenderer):
+        return Response(result)
+
+    return Response(
+        {
+            "columns": list(result.columns),
+            "rows": records(result),
+            "truncated": truncated,
+        },
+        status=status.HTTP_200_OK,
+    )
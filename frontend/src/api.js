@@ -7,15 +7,28 @@ async function makeRequest (...args) {
   return data
 }
 
+const JOB_POLL_INTERVAL = 1000
+
+async function waitForJob (jobId) {
+  while (true) {
+    const job = await makeRequest(`${ENDPOINT}/jobs/${jobId}/`)
+    if (job.state === 'done') return job
+    if (job.state === 'failed') throw new Error(job.error)
+    await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL))
+  }
+}
+
 export async function createFile ({ file }) {
   const body = new FormData()
   body.append('file', file)
 
   try {
-    return await makeRequest(`${ENDPOINT}/sheets/`, {
+    const data = await makeRequest(`${ENDPOINT}/sheets/`, {
       body,
       method: 'POST'
     })
+    if (data.job !== undefined) await waitForJob(data.job)
+    return data
   } catch (error) {
     alert(`An error occurred: ${error.message}`)
     return undefined
@@ -1,16 +1,24 @@
 export const typeMap = {
   bool: 'Boolean',
+  boolean: 'Boolean (nullable)',
   category: 'Category',
   int8: 'Int8',
+  Int8: 'Int8 (nullable)',
   int16: 'Int16',
+  Int16: 'Int16 (nullable)',
   int32: 'Int32',
+  Int32: 'Int32 (nullable)',
   int64: 'Int64',
+  Int64: 'Int64 (nullable)',
   float32: 'Float32',
+  Float32: 'Float32 (nullable)',
   float64: 'Float64',
+  Float64: 'Float64 (nullable)',
   complex128: 'Complex',
   'timedelta64[ns]': 'Time Interval',
   'datetime64[ns]': 'Date',
-  object: 'Text'
+  object: 'Text',
+  string: 'Text (Arrow)'
 }
 
 export function isFileValid (file) {